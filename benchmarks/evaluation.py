@@ -0,0 +1,25 @@
+"""
+Benchmarks for evaluating Functions at arbitrary points
+"""
+import numpy as np
+from shenfun import Function
+from .transforms import get_space, sizes
+
+
+class FunctionEval:
+    params = (['F', 'C:GC', 'L:LG'], sizes)
+    param_names = ('family', 'N')
+
+    def setup(self, family, N):
+        self.T = get_space(family, N)
+        self.u_hat = Function(self.T)
+        self.u_hat[:] = np.random.random(self.u_hat.shape)
+        rng = np.random.default_rng(1)
+        domains = [base.domain for base in self.T.bases]
+        self.x = np.array([rng.uniform(float(a), float(b), 1000) for a, b in domains])
+
+    def teardown(self, family, N):
+        self.T.destroy()
+
+    def time_eval(self, family, N):
+        self.u_hat.eval(self.x)
@@ -0,0 +1,44 @@
+"""
+Benchmarks for assembling linear and bilinear forms
+"""
+import numpy as np
+from shenfun import TestFunction, TrialFunction, Array, Function, inner, \
+    div, grad
+from .transforms import get_space, sizes
+
+
+class LinearForm:
+    params = (['C:GC', 'L:LG'], sizes)
+    param_names = ('family', 'N')
+
+    def setup(self, family, N):
+        self.T = get_space(family, N)
+        self.v = TestFunction(self.T)
+        self.f = Array(self.T)
+        self.f[:] = np.random.random(self.f.shape)
+        self.f_hat = Function(self.T)
+
+    def teardown(self, family, N):
+        self.T.destroy()
+
+    def time_inner(self, family, N):
+        inner(self.v, self.f, output_array=self.f_hat)
+
+
+class BilinearForm:
+    params = (['C:GC', 'L:LG'], sizes)
+    param_names = ('family', 'N')
+
+    def setup(self, family, N):
+        self.T = get_space(family, N)
+        self.u = TrialFunction(self.T)
+        self.v = TestFunction(self.T)
+
+    def teardown(self, family, N):
+        self.T.destroy()
+
+    def time_mass(self, family, N):
+        inner(self.v, self.u)
+
+    def time_laplace(self, family, N):
+        inner(self.v, div(grad(self.u)))
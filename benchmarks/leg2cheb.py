@@ -0,0 +1,35 @@
+"""
+Benchmarks for the fast Legendre to Chebyshev transforms
+"""
+import numpy as np
+from shenfun.legendre.dlt import FMMLeg2Cheb, Leg2chebHaleTownsend
+from .transforms import sizes
+
+
+class FMMLeg2ChebTransform:
+    params = (sizes,)
+    param_names = ('N',)
+
+    def setup(self, N):
+        self.u = np.random.random(N)
+        self.l2c = FMMLeg2Cheb(self.u)
+
+    def time_plan(self, N):
+        FMMLeg2Cheb(self.u)
+
+    def time_transform(self, N):
+        self.l2c(self.u)
+
+
+class HaleTownsendLeg2Cheb:
+    params = (sizes,)
+    param_names = ('N',)
+
+    def setup(self, N):
+        if N < 128:
+            raise NotImplementedError
+        self.u = np.random.random(N)
+        self.l2c = Leg2chebHaleTownsend(self.u.copy(), Nmin=0)
+
+    def time_transform(self, N):
+        self.l2c(self.u)
@@ -0,0 +1,174 @@
+"""
+Run the shenfun benchmarks and store the results as JSON
+
+The benchmarks follow the conventions of `asv <https://asv.readthedocs.io>`_,
+and may be run with asv using the ``asv.conf.json`` file in the root folder.
+This script runs the same benchmarks without asv. For example::
+
+    python benchmarks/run.py -o results.json
+    python benchmarks/run.py -b Transforms --quick
+    python benchmarks/run.py -o new.json --compare results.json
+
+With ``--compare`` the script exits with a nonzero code if any benchmark is
+slower than in the reference results by more than the given factor.
+"""
+import os
+import sys
+import re
+import json
+import time
+import timeit
+import inspect
+import argparse
+import platform
+import itertools
+import importlib
+import subprocess
+
+modules = ('transforms', 'forms', 'solvers', 'evaluation', 'leg2cheb')
+
+def get_benchmarks(pattern=None):
+    """Return list of (name, class, method name) for all benchmarks
+
+    Parameters
+    ----------
+    pattern : str, optional
+        Regular expression. Only benchmarks with matching name are returned
+    """
+    benchmarks = []
+    for mod in modules:
+        module = importlib.import_module('benchmarks.'+mod)
+        for clsname, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            for method in sorted(vars(cls)):
+                if not method.startswith('time_'):
+                    continue
+                name = '.'.join((mod, clsname, method))
+                if pattern is None or re.search(pattern, name):
+                    benchmarks.append((name, cls, method))
+    return benchmarks
+
+def run_benchmark(cls, method, params, repeat=5):
+    """Return best time (s) of one call to `method` for given `params`,
+    or None if the benchmark is not implemented for `params`"""
+    bench = cls()
+    try:
+        if hasattr(bench, 'setup'):
+            bench.setup(*params)
+    except NotImplementedError:
+        return None
+    try:
+        fun = getattr(bench, method)
+        timer = timeit.Timer(lambda: fun(*params))
+        number = timer.autorange()[0]
+        return min(timer.repeat(repeat=repeat, number=number))/number
+    finally:
+        if hasattr(bench, 'teardown'):
+            bench.teardown(*params)
+
+def get_metadata():
+    import numpy
+    import shenfun
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                         stderr=subprocess.DEVNULL,
+                                         cwd=os.path.dirname(__file__))
+        commit = commit.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'shenfun': shenfun.__version__,
+            'numpy': numpy.__version__,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'node': platform.node(),
+            'commit': commit,
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+def run(pattern=None, quick=False, repeat=5, verbose=True):
+    """Run benchmarks and return results as dictionary
+
+    Parameters
+    ----------
+    pattern : str, optional
+        Regular expression used to select benchmarks
+    quick : bool, optional
+        Run only the first possible combination of parameters, once
+    repeat : int, optional
+        Number of repeats. The best time is stored
+    verbose : bool, optional
+        Print results while running
+    """
+    results = {}
+    for name, cls, method in get_benchmarks(pattern):
+        params = getattr(cls, 'params', ())
+        if params and not isinstance(params[0], (list, tuple)):
+            params = (params,)
+        param_names = list(getattr(cls, 'param_names', ()))
+        timings = {}
+        for p in itertools.product(*params):
+            t = run_benchmark(cls, method, p, 1 if quick else repeat)
+            key = ', '.join(str(pi) for pi in p)
+            timings[key] = t
+            if verbose:
+                tt = 'n/a' if t is None else '%.3e s' % t
+                print(f'{name}({key}): {tt}', flush=True)
+            if quick and t is not None:
+                break
+        results[name] = {'param_names': param_names, 'timings': timings}
+    return {'metadata': get_metadata(), 'results': results}
+
+def compare(new, old, factor=1.5):
+    """Return list of regressions of `new` results with respect to `old`
+
+    Parameters
+    ----------
+    new, old : dict
+        Results as returned by :func:`run`
+    factor : number, optional
+        A benchmark is regressed if slower than `factor` times the old timing
+    """
+    regressions = []
+    for name, res in new['results'].items():
+        if name not in old['results']:
+            continue
+        oldtimings = old['results'][name]['timings']
+        for key, t in res['timings'].items():
+            t0 = oldtimings.get(key)
+            if t is None or t0 is None:
+                continue
+            if t > factor*t0:
+                regressions.append((name, key, t0, t))
+    return regressions
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Run shenfun benchmarks')
+    parser.add_argument('-b', '--bench', default=None,
+                        help='Regular expression selecting benchmarks')
+    parser.add_argument('-o', '--output', default=None,
+                        help='Store results in this JSON file')
+    parser.add_argument('--compare', default=None,
+                        help='Compare with results in this JSON file')
+    parser.add_argument('--factor', type=float, default=1.5,
+                        help='Slowdown factor reported as a regression')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--quick', action='store_true',
+                        help='Run only the first possible parameter combination, once')
+    args = parser.parse_args(args)
+    results = run(args.bench, args.quick, args.repeat)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            old = json.load(f)
+        regressions = compare(results, old, args.factor)
+        for name, key, t0, t in regressions:
+            print(f'Regression {name}({key}): {t0:.3e} s -> {t:.3e} s')
+        return int(len(regressions) > 0)
+    return 0
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    sys.exit(main())
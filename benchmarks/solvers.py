@@ -0,0 +1,68 @@
+"""
+Benchmarks for linear solvers
+"""
+import numpy as np
+from shenfun import TestFunction, TrialFunction, Function, FunctionSpace, \
+    TensorProductSpace, VectorSpace, CompositeSpace, inner, div, grad, la, \
+    comm
+from .transforms import get_space, sizes
+
+
+class SolverGeneric1ND:
+    params = (['C:GC', 'L:LG'], sizes)
+    param_names = ('family', 'N')
+
+    def setup(self, family, N):
+        self.T = get_space(family, N, M=64, bc=(0, 0))
+        u = TrialFunction(self.T)
+        v = TestFunction(self.T)
+        self.mats = inner(v, div(grad(u)) - u)
+        self.sol = la.SolverGeneric1ND(self.mats)
+        self.f_hat = Function(self.T)
+        self.f_hat[:] = np.random.random(self.f_hat.shape)
+        self.u_hat = Function(self.T)
+
+    def teardown(self, family, N):
+        self.T.destroy()
+
+    def time_assemble(self, family, N):
+        la.SolverGeneric1ND(self.mats)
+
+    def time_solve(self, family, N):
+        self.sol(self.f_hat, self.u_hat)
+
+
+class BlockMatrixSolver:
+    # Mixed formulation of the Poisson equation
+    params = (['chebyshev', 'legendre'], sizes)
+    param_names = ('family', 'N')
+
+    def setup(self, family, N):
+        if N > 1024:
+            raise NotImplementedError
+        K0 = FunctionSpace(16, 'F', dtype='d')
+        SD = FunctionSpace(N, family, bc=(0, 0))
+        ST = FunctionSpace(N, family)
+        self.TD = TensorProductSpace(comm, (K0, SD), axes=(1, 0))
+        self.TT = TensorProductSpace(comm, (K0, ST), axes=(1, 0))
+        Q = CompositeSpace([VectorSpace(self.TT), self.TD])
+        g, u = TrialFunction(Q)
+        p, q = TestFunction(Q)
+        A00 = inner(p, g)
+        if family == 'legendre':
+            A01 = inner(div(p), u)
+        else:
+            A01 = inner(p, -grad(u))
+        A10 = inner(q, div(g))
+        self.sol = la.BlockMatrixSolver(A00+A01+A10)
+        self.b = Function(Q)
+        self.b[-1] = np.random.random(self.b[-1].shape)
+        self.u = Function(Q)
+        self.sol(self.b, self.u) # Factorize
+
+    def teardown(self, family, N):
+        self.TD.destroy()
+        self.TT.destroy()
+
+    def time_solve(self, family, N):
+        self.sol(self.b, self.u)
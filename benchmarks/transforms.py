@@ -0,0 +1,46 @@
+"""
+Benchmarks for forward and backward transforms of TensorProductSpaces
+"""
+import numpy as np
+from shenfun import FunctionSpace, TensorProductSpace, Array, Function, comm
+
+families = ['F', 'C:GC', 'C:GL', 'L:LG', 'L:GL', 'U:GU', 'U:GC', 'Q:QG',
+            'J:JG', 'La:LG', 'H:HG']
+
+sizes = [32, 128, 512, 1024, 4096]
+
+# Families using Vandermonde type transforms are too slow for large N
+vandermonde = ('Q', 'J', 'La', 'H')
+
+def get_space(family, N, M=16, bc=None):
+    """Return TensorProductSpace of shape (N, M), where the first axis is
+    using `family`, given as 'family:quad', and the second is Fourier"""
+    family, quad = family.split(':') if ':' in family else (family, None)
+    if family in vandermonde and N > 1024:
+        raise NotImplementedError
+    if family == 'F':
+        B = FunctionSpace(N, 'F', dtype='D')
+    else:
+        B = FunctionSpace(N, family, quad=quad, bc=bc)
+    return TensorProductSpace(comm, (B, FunctionSpace(M, 'F', dtype='d')))
+
+
+class Transforms:
+    params = (families, sizes)
+    param_names = ('family', 'N')
+
+    def setup(self, family, N):
+        self.T = get_space(family, N)
+        self.u = Array(self.T)
+        self.u[:] = np.random.random(self.u.shape)
+        self.u_hat = Function(self.T)
+        self.u_hat = self.T.forward(self.u, self.u_hat)
+
+    def teardown(self, family, N):
+        self.T.destroy()
+
+    def time_forward(self, family, N):
+        self.T.forward(self.u, self.u_hat)
+
+    def time_backward(self, family, N):
+        self.T.backward(self.u_hat, self.u)
@@ -23,9 +23,8 @@ v = TestFunction(T)
 U = Array(TV)
 U_hat = Function(TV)
 P_hat = Function(T)
-curl_hat = Function(TV)
-W = Array(TV)
-curl_ = Array(TV)
+U_hat_ = Function(TV)
+W = NonlinearTerm(rotational(U_hat_), TV) # Nonlinear term u x curl(u)
 A = inner(grad(u), grad(v))
 A = get_simplified_tpmatrices(A)[0]
 
@@ -33,12 +32,9 @@ def LinearRHS(self, u, **params):
     return nu*div(grad(u))
 
 def NonlinearRHS(self, U, U_hat, dU, **params):
-    global TV, curl_hat, curl_, P_hat, W
-    curl_hat = project(curl(U_hat), TV, output_array=curl_hat)
-    curl_ = TV.backward(curl_hat, curl_)
-    U = U_hat.backward(U)
-    W[:] = np.cross(U, curl_, axis=0)     # Nonlinear term in physical space
-    dU = project(W, TV, output_array=dU)             # dU = W.forward(dU)
+    global TV, P_hat, W
+    U_hat_[:] = U_hat
+    dU = W(dU)
     P_hat = A.solve(inner(div(dU), v), P_hat)
     dU += inner(grad(P_hat), TestFunction(TV))
     return dU
@@ -34,9 +34,14 @@ class build_ext_subclass(build_ext):
                     if has_flag(self.compiler, c):
                         extra_compile_args.append(c)
 
+        openmp = has_flag(self.compiler, '-fopenmp')
         for e in self.extensions:
             e.extra_compile_args += extra_compile_args
             e.include_dirs.extend([get_include()])
+            if e.name == "shenfun.optimization.cython.la" and openmp:
+                # Threaded banded solvers
+                e.extra_compile_args.append('-fopenmp')
+                e.extra_link_args.append('-fopenmp')
         build_ext.build_extensions(self)
 
 def get_extensions():
@@ -54,7 +59,7 @@ def get_extensions():
                          sources=[os.path.join(cwd, "shenfun", "legendre", "fastgl", "fastgl_wrap.pyx")]))
     [e.extra_link_args.extend(["-std=c++11"]) for e in ext]
     #[e.extra_link_args.extend(["-std=c++11", "-fopenmp"]) for e in ext]
-    for s in ("Cheb", "convolve", "outer", "applymask", "cross"):
+    for s in ("Cheb", "convolve", "outer", "applymask", "cross", "diff", "nufft"):
         ext.append(Extension("shenfun.optimization.cython.{0}".format(s),
                              libraries=['m'],
                              sources=[os.path.join(cdir, '{0}.pyx'.format(s))]))
@@ -348,6 +348,10 @@ class Orthogonal(JacobiBase):
             return output_array
         return input_array
 
+    def diff_recursion_weights(self):
+        n = np.arange(self.N)
+        return n.astype(float), np.where(n == 0, 1., 2.)
+
     def get_orthogonal(self, **kwargs):
         d = dict(quad=self.quad,
                  domain=self.domain,
@@ -387,18 +391,20 @@ class Orthogonal(JacobiBase):
                  fftw.flag_dict[opts['overwrite_input']])
         threads = opts['threads']
 
-        U = fftw.aligned(shape, dtype=float)
-
-        xfftn_fwd = plan_fwd(U, axes=(axis,), threads=threads, flags=flags)
-        V = xfftn_fwd.output_array
+        self.release_work_arrays()
+        iscomplex = np.issubdtype(dtype, np.complexfloating)
+        rdtype = np.dtype(dtype).char.lower()  # float32 or float64
+        U = self.get_work_array(shape, rdtype, 'U', scratch=iscomplex)
+        V = self.get_work_array(shape, rdtype, 'V', scratch=iscomplex)
+        xfftn_fwd = plan_fwd(U, axes=(axis,), threads=threads, flags=flags, output_array=V)
         xfftn_bck = plan_bck(V, axes=(axis,), threads=threads, flags=flags, output_array=U)
         V.fill(0)
         U.fill(0)
 
-        if np.dtype(dtype) is np.dtype('complex'):
+        if iscomplex:
             # dct only works on real data, so need to wrap it
-            U = fftw.aligned(shape, dtype=complex)
-            V = fftw.aligned(shape, dtype=complex)
+            U = self.get_work_array(shape, dtype, 'U')
+            V = self.get_work_array(shape, dtype, 'V')
             U.fill(0)
             V.fill(0)
             xfftn_fwd = DCTWrap(xfftn_fwd, U, V)
@@ -11,8 +11,29 @@ config = {
     {
         'mode': 'cython',
         'verbose': False,
+        # Threads used for independent 1D systems in banded solvers
+        'threads': 1,
+        # Evaluation of sympy expressions on meshes. The backend is
+        # 'numpy', 'numexpr' or 'numba', and maxitems is the number of
+        # compiled expressions cached
+        'lambdify':
+        {
+            'backend': 'numpy',
+            'maxitems': 256
+        }
     },
     'basisvectors': 'normal',
+    'coordinates':
+    {
+        # On-disk cache of the symbolic computations of Coordinates. Stored
+        # expressions are parsed back as Sympy expressions only, but the
+        # path should still not be writable by others
+        'cache':
+        {
+            'enabled': False,
+            'path': '~/.shenfun/cache/coordinates'
+        }
+    },
     'transforms':
     {
         'kind':
@@ -25,6 +46,21 @@ config = {
             'hermite': 'vandermonde',
             'laguerre': 'vandermonde',
             'jacobi': 'recursive'
+        },
+        # Smallest N for which kind 'auto' uses the fast transform. Set
+        # kind 'legendre' above to 'auto' to use it by default
+        'auto':
+        {
+            'legendre': 512
+        },
+        # Transform all components of a CompositeSpace together
+        'batched': False,
+        # Experimental nonuniform FFT used by eval(method=3), with requested
+        # accuracy tol. Disabled, since it is not yet faster than method 1
+        'nufft':
+        {
+            'enabled': False,
+            'tol': 1e-12
         }
     },
     'matrix':
@@ -35,13 +71,26 @@ config = {
             'permc_spec': 'COLAMD',
             'solve': 'csc',
             'diags': 'csc',
-            'matvec': 'csr'
+            'matvec': 'packed'
         },
         'block':
         {
             'assemble': 'csc',
             'use_scipy': True,
             'permc_spec': 'COLAMD',
+        },
+        'cache':
+        {
+            # On-disk cache of assembled (not implemented) SpectralMatrix
+            'enabled': False,
+            'path': '~/.shenfun/cache/matrices',
+            'maxbytes': 2**30,
+            'maxitems': 10000
+        },
+        'forms':
+        {
+            # Number of bilinear forms memoized by inner. Zero to disable
+            'maxitems': 128
         }
     },
     'bases':
@@ -50,6 +99,17 @@ config = {
         {
             'mode': 'numpy',
             #'mode': 'mpmath',
+        },
+        'legendre':
+        {
+            # On-disk cache of the matrices used by the FMM transforms, and
+            # the number of matrix sets kept in memory
+            'fmm_cache':
+            {
+                'enabled': False,
+                'path': '~/.shenfun/cache/fmm',
+                'maxitems': 64
+            }
         }
     },
     'fftw':
@@ -88,6 +148,23 @@ config = {
         {
             'threads': 1,
             'planner_effort': 'FFTW_MEASURE'
+        },
+        'wisdom':
+        {
+            # Import/export FFTW wisdom when planning a TensorProductSpace
+            'enabled': False,
+            'path': '~/.shenfun/wisdom'
+        },
+        'pool':
+        {
+            # Sharing of work arrays of transforms between axes and spaces
+            # 'none' - never share
+            # 'scratch' - share arrays used only internally by a transform
+            # 'all' - share also the input and output arrays of transforms.
+            #         An array returned by a transform called without an
+            #         output array is then overwritten by any other transform
+            #         of the same shape
+            'share': 'scratch'
         }
     }
 }
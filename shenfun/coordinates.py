@@ -1,7 +1,116 @@
+import ast
 import numbers
+import hashlib
+import functools
 import sympy as sp
+from sympy.parsing.sympy_parser import parse_expr
 import numpy as np
 from shenfun.config import config
+from shenfun.utilities.diskcache import DiskCache
+
+_coordinates_cache = {}
+
+def get_coordinates_cache():
+    """Return on-disk cache of metric computations, or None if disabled
+
+    The cache is configured through ``config['coordinates']['cache']``.
+    """
+    conf = config['coordinates']['cache']
+    if not conf['enabled']:
+        return None
+    if conf['path'] not in _coordinates_cache:
+        _coordinates_cache[conf['path']] = DiskCache(conf['path'])
+    return _coordinates_cache[conf['path']]
+
+def _serialize(value):
+    """Return dictionary of arrays representing Sympy expression(s) `value`
+
+    Sympy expressions are stored as the strings returned by `sp.srepr`.
+    """
+    if isinstance(value, (numbers.Real, numbers.Complex)) and not isinstance(value, sp.Basic):
+        return {'n': np.asarray(value)}
+    if isinstance(value, np.ndarray):
+        return {'a': np.array([sp.srepr(v) for v in value.flat]).reshape(value.shape)}
+    return {'s': np.asarray(sp.srepr(value))}
+
+_srepr_names = {k: v for k, v in vars(sp).items() if not k.startswith('_') and (
+    isinstance(v, sp.Basic) or (isinstance(v, type) and issubclass(v, sp.Basic)))}
+_srepr_nodes = (ast.Expression, ast.Call, ast.Name, ast.Load, ast.Constant,
+                ast.keyword, ast.Tuple, ast.List, ast.UnaryOp, ast.USub)
+_srepr_string_args = ('Symbol', 'Dummy', 'Function', 'Float')
+
+def _parse_srepr(s):
+    """Return Sympy expression from string `s` returned by `sp.srepr`
+
+    Only Sympy objects and classes called with literal arguments are
+    accepted, and strings only as names of symbols and functions or as
+    digits of floats. A modified cache file can thus not execute code.
+    """
+    tree = ast.parse(s, mode='eval')
+    strings = set()
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id in _srepr_string_args and node.args):
+            strings.add(id(node.args[0]))
+    for node in ast.walk(tree):
+        if (not isinstance(node, _srepr_nodes)
+                or (isinstance(node, ast.Name) and node.id not in _srepr_names)
+                or (isinstance(node, ast.Constant) and isinstance(node.value, str) and id(node) not in strings)):
+            raise ValueError(f'Not a Sympy expression: {s}')
+    return parse_expr(s, local_dict=_srepr_names, global_dict={}, transformations=())
+
+def _deserialize(data):
+    """Return Sympy expression(s) stored by :func:`_serialize`"""
+    if 'n' in data:
+        return data['n'].item()
+    if 'a' in data:
+        a = data['a']
+        return np.array([_parse_srepr(str(v)) for v in a.flat], dtype=object).reshape(a.shape)
+    return _parse_srepr(str(data['s']))
+
+def _function_signature(f):
+    """Return string identifying function `f`, including its code"""
+    sig = getattr(f, '__module__', '')+'.'+getattr(f, '__qualname__', repr(f))
+    code = getattr(f, '__code__', None)
+    if code is not None:
+        sig += hashlib.sha1(code.co_code+repr(code.co_consts).encode('utf-8')).hexdigest()
+    return sig
+
+def cached_metric(attr):
+    """Decorator for methods of :class:`.Coordinates` computing `attr`
+
+    The result is looked up in the instance, then in the on-disk cache
+    (see :func:`get_coordinates_cache`), before it is computed. Methods
+    where `attr` is a dictionary take the key as the first argument
+    `covariant`.
+    """
+    def decorator(fun):
+        @functools.wraps(fun)
+        def wrapper(self, *args, **kw):
+            value = getattr(self, attr)
+            index = kw.get('covariant', args[0] if args else True) if isinstance(value, dict) else None
+            if index is not None:
+                value = value[index]
+            if value is not None:
+                return value
+            cache = get_coordinates_cache()
+            key = self._cache_key(attr, index) if cache is not None else None
+            if key is not None:
+                try:
+                    value = _deserialize(cache[key])
+                    if index is None:
+                        setattr(self, attr, value)
+                    else:
+                        getattr(self, attr)[index] = value
+                    return value
+                except KeyError:
+                    pass
+            value = fun(self, *args, **kw)
+            if key is not None:
+                cache[key] = _serialize(value)
+            return value
+        return wrapper
+    return decorator
 
 class Coordinates:
     """Class for handling curvilinear coordinates
@@ -25,6 +134,14 @@ class Coordinates:
             count = count.replace(POW, 100)
             count = count.replace(sp.Symbol, type(sp.S.One))
             return count
+
+    Note
+    ----
+    The symbolic computations of basis vectors, metric tensors etc. may be
+    slow for nontrivial coordinates. Enable ``config['coordinates']['cache']``
+    to store the results on disk, such that they are computed only once for
+    each set of coordinates, assumptions and replace rules. The cache is
+    not used if the replace rules contain anything but Sympy expressions.
     """
     def __init__(self, psi, rv, assumptions=True, replace=(), measure=sp.count_ops):
         self._psi = (psi,) if isinstance(psi, sp.Symbol) else psi
@@ -43,6 +160,17 @@ class Coordinates:
         self._det_g = {True: None, False: None}
         self._sqrt_det_g = {True: None, False: None}
 
+    def _cache_key(self, attr, index=None):
+        """Return key for `attr` in the on-disk cache, or None if the
+        coordinates cannot be serialized"""
+        for rule in self._replace:
+            if not all(isinstance(r, sp.Basic) for r in rule):
+                return None
+        from shenfun import __version__
+        return (__version__, sp.srepr(self._psi), sp.srepr(self._rv),
+                sp.srepr(self._assumptions), sp.srepr(tuple(self._replace)),
+                _function_signature(self._measure), attr, index)
+
     @property
     def b(self):
         return self.get_covariant_basis()
@@ -83,6 +211,7 @@ class Coordinates:
             return False
         return sp.Matrix(self.get_covariant_metric_tensor()).is_Identity
 
+    @cached_metric('_det_g')
     def get_det_g(self, covariant=True):
         """Return determinant of covariant metric tensor"""
         if self._det_g[covariant] is not None:
@@ -97,6 +226,7 @@ class Coordinates:
         self._det_g[covariant] = g
         return g
 
+    @cached_metric('_sqrt_det_g')
     def get_sqrt_det_g(self, covariant=True):
         """Return square root of determinant of covariant metric tensor"""
         if self._sqrt_det_g[covariant] is not None:
@@ -119,6 +249,7 @@ class Coordinates:
         """Return Cartesian basis vectors"""
         return np.eye(len(self.rv), dtype=object)
 
+    @cached_metric('_hi')
     def get_scaling_factors(self):
         """Return scaling factors"""
         if self._hi is not None:
@@ -132,6 +263,7 @@ class Coordinates:
         self._hi = hi
         return hi
 
+    @cached_metric('_e')
     def get_normal_basis(self):
         if self._e is not None:
             return self._e
@@ -144,6 +276,7 @@ class Coordinates:
         self._e = e
         return e
 
+    @cached_metric('_b')
     def get_covariant_basis(self):
         """Return covariant basisvectors"""
         if self._b is not None:
@@ -165,6 +298,7 @@ class Coordinates:
         self._b = b
         return b
 
+    @cached_metric('_bt')
     def get_contravariant_basis(self):
         """Return contravariant basisvectors"""
         if self._bt is not None:
@@ -182,6 +316,7 @@ class Coordinates:
         self._bt = bt
         return bt
 
+    @cached_metric('_gn')
     def get_normal_metric_tensor(self):
         """Return normal metric tensor"""
         if self._gn is not None:
@@ -196,6 +331,7 @@ class Coordinates:
         self._gn = gn
         return gn
 
+    @cached_metric('_g')
     def get_covariant_metric_tensor(self):
         """Return covariant metric tensor"""
         if self._g is not None:
@@ -210,6 +346,7 @@ class Coordinates:
         self._g = g
         return g
 
+    @cached_metric('_gt')
     def get_contravariant_metric_tensor(self):
         """Return contravariant metric tensor"""
         if self._gt is not None:
@@ -223,6 +360,7 @@ class Coordinates:
         self._gt = gt
         return gt
 
+    @cached_metric('_ct')
     def get_christoffel_second(self):
         """Return Christoffel symbol of second kind"""
         if self._ct is not None:
@@ -3,3 +3,4 @@ from .project import *
 from .inner import *
 from .operators import *
 from .arguments import *
+from .nonlinear import *
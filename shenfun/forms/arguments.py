@@ -2,10 +2,10 @@ from numbers import Number, Integral
 from itertools import product
 from collections import defaultdict
 import copy
-from scipy.special import sph_harm, erf, airy, jn, gammaln
 import numpy as np
 import sympy as sp
 from shenfun.config import config
+from shenfun.utilities import lambdify_cache
 from shenfun.optimization.cython import evaluate
 from shenfun.spectralbase import BoundaryConditions
 from mpi4py_fft import DistArray
@@ -13,20 +13,6 @@ from mpi4py_fft import DistArray
 __all__ = ('Expr', 'BasisFunction', 'TestFunction', 'TrialFunction', 'Function',
            'Array', 'FunctionSpace')
 
-# Define some special functions required for spherical harmonics
-cot = lambda x: 1/np.tan(x)
-Ynm = lambda n, m, x, y : sph_harm(m, n, y, x)
-airyai = lambda x: airy(x)[0]
-besselj = jn
-
-fun = {'airyai': airyai,
-       'cot': cot,
-       'Ynm': Ynm,
-       'erf': erf,
-       'besselj': besselj,
-       'loggamma': gammaln
-    }
-
 def FunctionSpace(N, family='Fourier', bc=None, dtype='d', quad=None,
                   domain=None, scaled=None, padding_factor=1, basis=None,
                   dealias_direct=False, coordinates=None, **kw):
@@ -53,7 +39,8 @@ def FunctionSpace(N, family='Fourier', bc=None, dtype='d', quad=None,
         See :class:`~shenfun.spectralbase.BoundaryConditions`
 
     dtype : str or np.dtype, optional
-        The datatype of physical space (input to forward transforms)
+        The datatype of physical space (input to forward transforms). Use
+        'f' or 'F' for single precision transforms, arrays and solvers.
 
     quad : str, optional
         Type of quadrature
@@ -137,7 +124,6 @@ def FunctionSpace(N, family='Fourier', bc=None, dtype='d', quad=None,
             B = fourier.bases.C2C
         else:
             B = fourier.bases.R2C
-        del par['dtype']
         return B(N, **par)
 
     elif family.lower() in ('chebyshev', 'c'):
@@ -739,7 +725,7 @@ class Expr:
         else:
             output_array[:] = 0
 
-        work = np.zeros_like(output_array)
+        work = np.zeros(output_array.shape, dtype=np.result_type(output_array.dtype, np.float64))
 
         assert V.dimensions == len(x)
 
@@ -784,12 +770,7 @@ class Expr:
                 if not hasattr(sc, 'free_symbols'):
                     sc = float(sc)
                 else:
-                    sym0 = tuple(sc.free_symbols)
-                    m = []
-                    for sym in sym0:
-                        j = 'xyzrs'.index(str(sym))
-                        m.append(x[j])
-                    sc = sp.lambdify(sym0, sc)(*m)
+                    sc = lambdify_cache.evaluate(sc, x)
                 output_array += sc*work
 
         return output_array
@@ -1227,8 +1208,7 @@ class ShenfunBaseArray(DistArray):
                     if isinstance(buf0, Number):
                         buffer.v[i] = buf0
                     elif hasattr(buf0, 'free_symbols'):
-                        x = buf0.free_symbols.pop()
-                        buffer.v[i] = sp.lambdify(x, buf0)(space.mesh()).astype(dtype)
+                        buffer.v[i] = lambdify_cache.evaluate(buf0, space.mesh()).astype(dtype)
 
                 if cls.__name__ == 'Function':
                     buf = Function(space)
@@ -1239,9 +1219,7 @@ class ShenfunBaseArray(DistArray):
                 # Evaluate sympy function on entire mesh
                 syms = buffer.free_symbols
                 if len(syms) > 0:
-                    x = syms.pop()
-                    buffer = sp.lambdify(x, buffer)
-                    buf = buffer(space.mesh()).astype(space.forward.input_array.dtype)
+                    buf = lambdify_cache.evaluate(buffer, space.mesh()).astype(space.forward.input_array.dtype)
                 else:
                     buf = buffer
                 buffer = Array(space)
@@ -1294,12 +1272,7 @@ class ShenfunBaseArray(DistArray):
                 if isinstance(buf0, Number):
                     buffer.v[i] = buf0
                 elif hasattr(buf0, 'free_symbols'):
-                    sym0 = tuple(buf0.free_symbols)
-                    m = []
-                    for sym in sym0:
-                        j = 'xyzrs'.index(str(sym))
-                        m.append(mesh[j])
-                    buffer.v[i] = sp.lambdify(sym0, buf0, modules=['numpy', {'airyai': airyai, 'cot': cot, 'Ynm': Ynm, 'erf': erf, 'besselj': besselj}])(*m).astype(adtype)
+                    buffer.v[i] = lambdify_cache.evaluate(buf0, mesh).astype(adtype)
                 else:
                     raise NotImplementedError
 
@@ -1313,11 +1286,7 @@ class ShenfunBaseArray(DistArray):
             sym0 = tuple(buffer.free_symbols)
             mesh = space.local_mesh(True)
             if len(sym0) > 0:
-                m = []
-                for sym in sym0:
-                    j = 'xyzrs'.index(str(sym))
-                    m.append(mesh[j])
-                buf = sp.lambdify(sym0, buffer, modules=['numpy', fun])(*m).astype(space.forward.input_array.dtype)
+                buf = lambdify_cache.evaluate(buffer, mesh).astype(space.forward.input_array.dtype)
             else:
                 buf = buffer
             buffer = Array(space)
@@ -1691,6 +1660,44 @@ class Function(ShenfunBaseArray, BasisFunction):
             output_array = space.to_ortho(self, output_array)
         return output_array
 
+    def differentiate(self, x=0, k=1, output_array=None):
+        """Return k'th derivative along axis `x` in orthogonal basis
+
+        The result is the same as ``project(Dx(self, x, k), T)``, where T
+        is the orthogonal space, but the coefficients of the derivative are
+        computed by a backward recurrence, see
+        :meth:`.SpectralBase.differentiate`. The cost is O(N) along each
+        line and there is no linear system to solve.
+
+        Parameters
+        ----------
+        x : int, optional
+            The axis to differentiate along
+        k : int, optional
+            The number of derivatives
+        output_array : :class:`.Function`, optional
+            Return array in orthogonal space
+
+        Note
+        ----
+        Implemented for Chebyshev, Legendre and ChebyshevU bases along an
+        axis that is not distributed in spectral space.
+        """
+        space = self.function_space()
+        assert space.num_components() == 1
+        if output_array is None:
+            output_array = Function(space.get_orthogonal())
+        if space.is_orthogonal:
+            output_array[:] = self
+        else:
+            output_array = self.to_ortho(output_array)
+        T = output_array.function_space()
+        base = T.bases[x] if T.dimensions > 1 else T
+        if output_array.shape[x] != base.N:
+            raise NotImplementedError('Axis is distributed')
+        output_array = base.differentiate(output_array, output_array, k)
+        return output_array
+
     def mask_nyquist(self, mask=None):
         """Set self to have zeros in Nyquist coefficients"""
         self.function_space().mask_nyquist(self, mask=mask)
@@ -1,18 +1,186 @@
 from numbers import Number
+from collections import OrderedDict
+from functools import wraps
 import sympy as sp
 import numpy as np
+from scipy.sparse import dia_matrix
 from shenfun.spectralbase import inner_product, SpectralBase, MixedFunctionSpace
-from shenfun.matrixbase import TPMatrix
+from shenfun.matrixbase import TPMatrix, SparseMatrix, _space_signature
 from shenfun.tensorproductspace import TensorProductSpace, CompositeSpace
 from shenfun.utilities import dx, split, scalar_product, CachedArrayDict
 from shenfun.config import config
 from .arguments import Expr, Function, BasisFunction, Array, TestFunction
 
-__all__ = ('inner', 'Inner')
+__all__ = ('inner', 'Inner', 'FormCache', 'form_cache')
 
 #pylint: disable=line-too-long,inconsistent-return-statements,too-many-return-statements
 
 
+class _Slot(tuple):
+    """Placeholder for a function space in a cached form
+
+    The tuple is (side, [component, [axis]]), where side is 'test' or
+    'trial', component is the index into the flattened space and axis the
+    index of the univariate base.
+    """
+
+def _slots(space, side):
+    """Return dictionary mapping id of `space`, its components and their
+    univariate bases to :class:`_Slot` placeholders"""
+    d = {id(space): _Slot((side,))}
+    subspaces = space.flatten() if space.is_composite_space else [space]
+    for j, sub in enumerate(subspaces):
+        d.setdefault(id(sub), _Slot((side, j)))
+        if sub.dimensions > 1:
+            for axis, base in enumerate(sub.bases):
+                d.setdefault(id(base), _Slot((side, j, axis)))
+    return d
+
+def _resolve(slot, spaces):
+    """Return the function space represented by `slot`"""
+    space = spaces[slot[0]]
+    if len(slot) > 1:
+        space = (space.flatten() if space.is_composite_space else [space])[slot[1]]
+    if len(slot) > 2:
+        space = space.bases[slot[2]]
+    return space
+
+def _signature(space):
+    """Return tuple of all the parameters of `space` that determine its
+    inner product matrices"""
+    if space.is_composite_space:
+        return (space.__class__.__name__, tuple(_signature(s) for s in space.flatten()))
+    coors = sp.srepr(space.coors.coordinates)
+    if space.dimensions > 1:
+        # The scales of TPMatrices are local arrays, so the decomposition
+        # is part of the signature
+        decomp = (str(space.axes),
+                  tuple((s.start, s.stop) for s in space.local_slice(True)),
+                  tuple((s.start, s.stop) for s in space.local_slice(False)))
+        return (tuple(_space_signature(base)+(base.padding_factor,) for base in space.bases),
+                coors, decomp)
+    return (_space_signature(space)+(space.padding_factor,), coors)
+
+def _expr_signature(expr):
+    """Return tuple uniquely determining Expr or BasisFunction `expr`"""
+    if isinstance(expr, BasisFunction):
+        expr = Expr(expr)
+    scales = tuple(tuple(sp.srepr(sp.sympify(s)) for s in scale) for scale in expr.scales())
+    terms = tuple(tuple(tuple(term) for term in terms) for terms in expr.terms())
+    indices = tuple(tuple(index) for index in expr.indices())
+    return (expr.argument, terms, scales, indices, _signature(expr.base.function_space()))
+
+def _copy_form(A, replace):
+    """Return copy of form `A`, with function spaces replaced by `replace`
+
+    The diagonals of all matrices are copied, such that the copy may be
+    modified without affecting `A`.
+    """
+    if isinstance(A, list):
+        return [_copy_form(a, replace) for a in A]
+    B = object.__new__(A.__class__)
+    B.__dict__.update(A.__dict__)
+    if isinstance(A, TPMatrix):
+        B.mats = [_copy_form(mat, replace) for mat in A.mats]
+        B.scale = A.scale.copy() if isinstance(A.scale, np.ndarray) else A.scale
+        for attr in ('space', 'trialspace', 'testbase', 'trialbase'):
+            setattr(B, attr, replace(getattr(A, attr)))
+        return B
+    assert isinstance(A, SparseMatrix)
+    B._storage = {k: v.copy() if isinstance(v, np.ndarray) else v for k, v in A._storage.items()}
+    B._diags = dia_matrix((1, 1))
+    B._matvec_methods = list(A._matvec_methods)
+    B.solver = None
+    for attr in ('testfunction', 'trialfunction'):
+        if hasattr(A, attr):
+            f = getattr(A, attr)
+            setattr(B, attr, (replace(f[0]),) + tuple(f[1:]))
+    for attr in ('testbase', 'trialbase'):
+        if hasattr(A, attr):
+            setattr(B, attr, replace(getattr(A, attr)))
+    return B
+
+class FormCache:
+    """Bounded cache of assembled bilinear forms
+
+    Bilinear forms are looked up using the structure of the two
+    expressions, i.e., their terms, scales and indices, the parameters of
+    the function spaces and the keyword arguments to :func:`.inner`. The
+    function spaces do not need to be the same objects. The least recently
+    used form is removed when the cache is full.
+
+    The cache stores copies of the forms, where the function spaces have
+    been replaced by placeholders. A form returned from the cache is always
+    a new copy, using the function spaces of the given expressions.
+
+    Parameters
+    ----------
+    maxitems : int or None, optional
+        Maximum number of stored forms. Default is
+        ``config['matrix']['forms']['maxitems']``.
+    """
+    def __init__(self, maxitems=None):
+        self._maxitems = maxitems
+        self._forms = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxitems(self):
+        if self._maxitems is None:
+            return config['matrix']['forms']['maxitems']
+        return self._maxitems
+
+    def clear(self):
+        self._forms.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._forms)
+
+    def __call__(self, fun, test, trial, **kw):
+        """Return form `fun(test, trial, **kw)`, from the cache if possible"""
+        key = (_expr_signature(test), _expr_signature(trial), tuple(sorted((k, repr(v)) for k, v in kw.items())))
+        spaces = {'test': test.base.function_space(), 'trial': trial.base.function_space()}
+        if key in self._forms:
+            self._forms.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+            A = fun(test, trial, **kw)
+            slots = _slots(spaces['trial'], 'trial')
+            slots.update(_slots(spaces['test'], 'test'))
+            self._forms[key] = _copy_form(A, lambda space: slots.get(id(space), space))
+            if len(self._forms) > self.maxitems:
+                self._forms.popitem(last=False)
+            return A
+        replace = lambda space: _resolve(space, spaces) if isinstance(space, _Slot) else space
+        return _copy_form(self._forms[key], replace)
+
+form_cache = FormCache()
+
+def _memoize_bilinear(func):
+    """Decorator that looks up bilinear forms in :data:`form_cache`
+
+    The cache is bypassed if `output_array` or `return_matrices` is given.
+    """
+    @wraps(func)
+    def wrapper(expr0, expr1, output_array=None, assemble=None, kind=None, fixed_resolution=None, return_matrices=False):
+        if (config['matrix']['forms']['maxitems'] > 0 and
+                output_array is None and not return_matrices and
+                isinstance(expr0, (Expr, BasisFunction)) and
+                isinstance(expr1, (Expr, BasisFunction)) and
+                set((expr0.argument, expr1.argument)) == set((0, 1))):
+            test, trial = (expr0, expr1) if expr0.argument == 0 else (expr1, expr0)
+            return form_cache(func, test, trial, assemble=assemble, kind=kind,
+                              fixed_resolution=fixed_resolution)
+        return func(expr0, expr1, output_array=output_array, assemble=assemble,
+                    kind=kind, fixed_resolution=fixed_resolution,
+                    return_matrices=return_matrices)
+    return wrapper
+
+@_memoize_bilinear
 def inner(expr0, expr1, output_array=None, assemble=None, kind=None, fixed_resolution=None, return_matrices=False):
     r"""
     Return (weighted or unweighted) discrete inner product
@@ -0,0 +1,217 @@
+r"""
+Module for computing nonlinear terms like :math:`(\boldsymbol{u} \cdot \nabla) \boldsymbol{u}`
+
+A nonlinear term is a sum of products of linear expressions of
+:class:`.Function` s, like the derivatives and curls returned by
+:func:`.Dx`, :func:`.grad` and :func:`.curl`. The products are computed
+pseudo-spectrally: all the factors are transformed to physical space, the
+products are computed pointwise and the result is transformed back to
+spectral space.
+"""
+import numpy as np
+import sympy as sp
+from .arguments import Expr, Function, Array
+from .operators import Dx, curl
+from .project import Project
+
+__all__ = ('NonlinearTerm', 'convection', 'rotational')
+
+#pylint: disable=protected-access
+
+class NonlinearTerm:
+    r"""Compiled nonlinear term
+
+    The nonlinear term is given as a sum of products for each component of
+    the output. For example, the convection
+    :math:`(\boldsymbol{u} \cdot \nabla) \boldsymbol{u}` of a 2D vector
+    :math:`\boldsymbol{u}` is::
+
+        terms = [[(u[0], Dx(u[0], 0, 1)), (u[1], Dx(u[0], 1, 1))],
+                 [(u[0], Dx(u[1], 0, 1)), (u[1], Dx(u[1], 1, 1))]]
+
+    which is also returned by :func:`convection`. A product may also
+    contain numbers, e.g., ``(-1, u[0], Dx(u[1], 1, 1))``.
+
+    The terms are compiled once, such that each call computes
+
+        1. One backward transform for each unique factor. Factors that
+           are the same in several products, like the velocity components
+           in the convection, are transformed only once. Factors with
+           derivatives are first projected to the orthogonal space.
+        2. The products, in preallocated work arrays and without
+           temporary arrays.
+        3. One forward transform for each component of the output.
+
+    Parameters
+    ----------
+    terms : list
+        List of products for each component of `T`. If `T` is not a
+        :class:`.CompositeSpace`, then `terms` may also be a list of products
+        for the one component. Each product is a sequence of
+        numbers and scalar :class:`.Expr` or :class:`.Function`
+    T : :class:`.TensorProductSpace`, :class:`.CompositeSpace` or :class:`.SpectralBase`
+        The space of the computed nonlinear term
+    padding_factor : number or tuple, optional
+        Padding factor used for dealiasing the products. All the
+        transforms are then computed with padding.
+
+    Example
+    -------
+    >>> import numpy as np
+    >>> from shenfun import FunctionSpace, TensorProductSpace, VectorSpace, \
+    ...     Function, NonlinearTerm, convection, comm
+    >>> F0 = FunctionSpace(8, 'F', dtype='D')
+    >>> F1 = FunctionSpace(8, 'F', dtype='d')
+    >>> T = TensorProductSpace(comm, (F0, F1))
+    >>> TV = VectorSpace(T)
+    >>> u = Function(TV)
+    >>> N = NonlinearTerm(convection(u), TV, padding_factor=1.5)
+    >>> H = N()
+    >>> len(N.factors)
+    6
+    """
+    def __init__(self, terms, T, padding_factor=1):
+        self.T = T
+        self.padding_factor = padding_factor
+        spaces = T.flatten() if T.is_composite_space else [T]
+        if not T.is_composite_space and len(terms) > 0 and not isinstance(terms[0][0], (list, tuple)):
+            terms = [terms]
+        assert len(terms) == len(spaces)
+        self.factors = []      # Unique factors as (callable, padded space)
+        self._keys = {}
+        self._padded = {}
+        self._ortho = {}
+        self.products = []
+        for comp in terms:
+            products = []
+            for product in comp:
+                scale = 1
+                index = []
+                for f in product:
+                    if isinstance(f, (Expr, Function)):
+                        s, i = self._add_factor(f)
+                        scale *= s
+                        index.append(i)
+                    else:
+                        scale *= f
+                assert len(index) > 0
+                products.append((complex(scale) if np.iscomplexobj(scale) else float(scale), index))
+            self.products.append(products)
+
+        self.work = []
+        for factor, space in self.factors:
+            self.work.append(Array(space))
+        self.padded_spaces = [self._get_padded(s) for s in spaces]
+        self.output = [Array(s) for s in self.padded_spaces]
+        self._tmp = np.zeros_like(self.output[0].v)
+
+    def _get_padded(self, space):
+        """Return padded space of `space`"""
+        if id(space) not in self._padded:
+            self._padded[id(space)] = space.get_dealiased(self.padding_factor)
+        return self._padded[id(space)]
+
+    def _add_factor(self, f):
+        """Return scale and index of unique factor `f`"""
+        f = Expr(f) if isinstance(f, Function) else f
+        assert isinstance(f.base, Function)
+        assert f.num_components() == 1, 'Factors must be scalar'
+        base = f.base
+        terms, scales, indices = f.terms()[0], f.scales()[0], f.indices()[0]
+        scale = 1
+        single = len(terms) == 1 and not np.any(terms[0]) and sp.sympify(scales[0]).is_number
+        if single:
+            # Only one Function component. Move scale to the product
+            scale = scales[0]
+            key = (id(base), indices[0])
+        else:
+            key = (id(base),) + tuple(sorted((tuple(term), i, str(s)) for term, i, s in zip(terms, indices, scales)))
+        if key in self._keys:
+            return scale, self._keys[key]
+
+        space = base.function_space()
+        if space.is_composite_space:
+            space = space.flatten()[indices[0]]
+        if single:
+            u = base[indices[0]] if base.function_space().is_composite_space else base
+            factor = (lambda: u, self._get_padded(space))
+        else:
+            # Compute linear combination in spectral space, with one projection
+            # to the orthogonal space, and use one backward transform
+            if id(space) not in self._ortho:
+                self._ortho[id(space)] = space.get_orthogonal()
+            To = self._ortho[id(space)]
+            factor = (Project(f, To), self._get_padded(To))
+        self.factors.append(factor)
+        self._keys[key] = len(self.factors)-1
+        return scale, self._keys[key]
+
+    def __call__(self, output_array=None):
+        """Return nonlinear term
+
+        Parameters
+        ----------
+        output_array : :class:`.Function`, optional
+            Return array
+
+        Returns
+        -------
+        :class:`.Function`
+            The nonlinear term in spectral space
+        """
+        if output_array is None:
+            output_array = Function(self.T)
+        for (factor, space), w in zip(self.factors, self.work):
+            space.backward(factor(), w)
+        work = [w.v for w in self.work]
+        tmp = self._tmp
+        out = output_array.v if self.T.is_composite_space else [output_array]
+        for i, products in enumerate(self.products):
+            H = self.output[i].v
+            for j, (scale, index) in enumerate(products):
+                w = H if j == 0 else tmp
+                if len(index) == 1:
+                    np.multiply(work[index[0]], scale, out=w)
+                else:
+                    np.multiply(work[index[0]], work[index[1]], out=w)
+                    for k in index[2:]:
+                        np.multiply(w, work[k], out=w)
+                    if scale != 1:
+                        w *= scale
+                if j > 0:
+                    H += w
+            if len(products) == 0:
+                H.fill(0)
+            out[i] = self.padded_spaces[i].forward(self.output[i], out[i])
+        return output_array
+
+def convection(u):
+    r"""Return terms of the convection :math:`(\boldsymbol{u} \cdot \nabla) \boldsymbol{u}`
+
+    The terms are used with :class:`.NonlinearTerm`. Only for Cartesian
+    coordinates.
+
+    Parameters
+    ----------
+    u : :class:`.Function`
+        Vector
+    """
+    assert u.function_space().coors.is_cartesian
+    dim = u.dimensions
+    return [[(u[j], Dx(u[i], j, 1)) for j in range(dim)] for i in range(dim)]
+
+def rotational(u):
+    r"""Return terms of the rotational form :math:`\boldsymbol{u} \times \nabla \times \boldsymbol{u}`
+
+    The terms are used with :class:`.NonlinearTerm`. Only for Cartesian
+    coordinates in 3D.
+
+    Parameters
+    ----------
+    u : :class:`.Function`
+        Vector
+    """
+    assert u.function_space().coors.is_cartesian
+    assert u.dimensions == 3
+    w = curl(u)
+    return [[(u[(i+1)%3], w[(i+2)%3]), (-1, u[(i+2)%3], w[(i+1)%3])] for i in range(3)]
@@ -1,5 +1,6 @@
 import types
 import numpy as np
+import sympy as sp
 from shenfun import la
 from shenfun.utilities import CachedArrayDict
 from shenfun.tensorproductspace import TensorProductSpace
@@ -124,6 +125,13 @@ def project(uh, T, output_array=None, fill=True, use_to_ortho=True, use_assign=T
 
     assert isinstance(uh, (Expr, BasisFunction))
 
+    diff = _get_recurrence(uh, T)
+    if diff is not None:
+        # Derivative of Function computed by recurrence
+        if output_array is None:
+            output_array = Function(T)
+        return _project_recurrence(diff, output_array)
+
     v = TestFunction(T)
     u = TrialFunction(T)
     output_array = inner(v, uh, output_array=output_array)
@@ -169,6 +177,52 @@ def project(uh, T, output_array=None, fill=True, use_to_ortho=True, use_assign=T
     return output_array
 
 
+def _get_recurrence(uh, T):
+    """Return Function, derivatives and scale if the projection of `uh` to
+    `T` can be computed with :meth:`.Function.differentiate`, or else None
+
+    This is possible if `uh` is a derivative of a :class:`.Function`, and `T`
+    is the orthogonal space of the same kind as the Function's space. The
+    derivatives must be along axes where the recurrence is implemented and
+    that are not distributed in spectral space.
+    """
+    if not isinstance(uh, Expr) or T.is_composite_space or not isinstance(uh.base, Function):
+        return None
+    if uh.num_components() > 1 or uh.num_terms()[0] > 1:
+        return None
+    term, scale, index = uh.terms()[0][0], uh.scales()[0][0], uh.indices()[0][0]
+    scale = sp.sympify(scale)
+    if not (scale.is_real and scale.is_number and T.is_orthogonal and T.coors.is_cartesian):
+        return None
+    if np.sum(term) == 0:
+        return None
+    u = uh.base
+    if u.function_space().is_composite_space:
+        u = u[index]
+    W = u.function_space()
+    bases = T.bases if T.dimensions > 1 else [T]
+    wbases = W.bases if W.dimensions > 1 else [W]
+    shape = T.shape(True) if T.dimensions > 1 else (T.N,)
+    for axis, (base, wbase) in enumerate(zip(bases, wbases)):
+        if not (base.compatible_base(wbase) and base.domain == wbase.domain):
+            return None
+        if term[axis] > 0:
+            if base.family() not in ('chebyshev', 'legendre', 'chebyshevu'):
+                return None
+            if shape[axis] != base.N:
+                return None
+    return u, [(axis, k) for axis, k in enumerate(term) if k > 0], float(scale)
+
+def _project_recurrence(diff, output_array):
+    """Return projection computed with :meth:`.Function.differentiate`"""
+    u, derivatives, scale = diff
+    for axis, k in derivatives:
+        output_array = u.differentiate(axis, k, output_array)
+        u = output_array
+    if scale != 1:
+        output_array *= scale
+    return output_array
+
 class Project:
     """Return an instance of a class that can perform projections efficiently
 
@@ -194,16 +248,20 @@ class Project:
     """
     def __init__(self, uh, T, output_array=None):
         assert isinstance(uh, (Expr, BasisFunction))
+        self.uh = uh
+        self.output_array = output_array
+        if output_array is None:
+            self.output_array = Function(T)
+        self.diff = _get_recurrence(uh, T)
+        if self.diff is not None:
+            # Derivative of Function computed by recurrence. No matrices needed
+            return
         v = TestFunction(T)
         u = TrialFunction(T)
         self.B = inner(v, u)
         # replace uh with trial function and assemble matrices used to compute
         # right hand side through matrix vector product
-        self.uh = uh
         self.A = inner(v, uh, return_matrices=True)
-        self.output_array = output_array
-        if output_array is None:
-            self.output_array = Function(T)
 
         if T.dimensions == 1:
             self.sol = la.Solver(self.B)
@@ -253,6 +311,8 @@ class Project:
                 self.sol = la.BlockMatrixSolver(BlockMatrix(self.B))
 
     def __call__(self):
+        if self.diff is not None:
+            return _project_recurrence(self.diff, self.output_array)
         wh = work[(self.output_array, 0, True)]
         uh = self.uh.base
         self.output_array.fill(0)
@@ -3,6 +3,7 @@
 import numpy as np
 from .bases import *
 from .matrices import *
+from .nufft import *
 
 def energy_fourier(u, T):
     r"""Compute the energy of u using Parceval's theorem
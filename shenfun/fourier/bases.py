@@ -136,17 +136,19 @@ class FourierBase(SpectralBase):
             self.forward.input_array[...] = input_array
 
         self.forward.xfftn()
-        self._truncation_forward(self.forward.tmp_array,
-                                 self.forward.output_array)
+        u = self.forward.output_array
+        if output_array is not None and self.forward.tmp_array is not u:
+            # Truncate directly into output_array
+            u = output_array
+        self._truncation_forward(self.forward.tmp_array, u)
         M = self.get_normalization()
-        self.forward._output_array *= M
+        u *= M
 
-        self.apply_inverse_mass(self.forward.output_array)
+        self.apply_inverse_mass(u)
 
-        if output_array is not None:
-            output_array[...] = self.forward.output_array
-            return output_array
-        return self.forward.output_array
+        if output_array is not None and u is not output_array:
+            output_array[...] = u
+        return u if output_array is None else output_array
 
     def apply_inverse_mass(self, array):
         coors = self.tensorproductspace.coors if self.tensorproductspace else self.coors
@@ -176,6 +178,7 @@ class FourierBase(SpectralBase):
 
     def get_unplanned(self, **kwargs):
         d = dict(domain=self.domain,
+                 dtype=self.dtype,
                  padding_factor=self.padding_factor,
                  dealias_direct=self.dealias_direct,
                  coordinates=self.coors.coordinates)
@@ -184,6 +187,7 @@ class FourierBase(SpectralBase):
 
     def get_dealiased(self, padding_factor=1.5, dealias_direct=False, **kwargs):
         d = dict(domain=self.domain,
+                 dtype=self.dtype,
                  padding_factor=padding_factor,
                  dealias_direct=dealias_direct,
                  coordinates=self.coors.coordinates)
@@ -192,6 +196,7 @@ class FourierBase(SpectralBase):
 
     def get_refined(self, N, **kwargs):
         d = dict(domain=self.domain,
+                 dtype=self.dtype,
                  padding_factor=self.padding_factor,
                  dealias_direct=self.dealias_direct,
                  coordinates=self.coors.coordinates)
@@ -246,9 +251,13 @@ class FourierBase(SpectralBase):
         flags = (fftw.flag_dict[opts['planner_effort']],
                  fftw.flag_dict[opts['overwrite_input']])
 
-        U = fftw.aligned(shape, dtype=dtype)
-        xfftn_fwd = plan_fwd(U, s=s, axes=axis, threads=threads, flags=flags)
-        V = xfftn_fwd.output_array
+        self.release_work_arrays()
+        Vshape = list(shape)
+        if np.issubdtype(dtype, np.floating):
+            Vshape[axis[-1]] = s[-1]//2+1
+        U = self.get_work_array(shape, dtype, 'U')
+        V = self.get_work_array(Vshape, np.dtype(dtype).char.upper(), 'V')
+        xfftn_fwd = plan_fwd(U, s=s, axes=axis, threads=threads, flags=flags, output_array=V)
 
         opts = plan_bck.opts
         opts['overwrite_input'] = 'FFTW_DESTROY_INPUT'
@@ -309,6 +318,9 @@ class R2C(FourierBase):
         corresponds to a 3/2-rule for dealiasing.
     domain : 2-tuple of numbers, optional
         The computational domain.
+    dtype : data-type, optional
+        Type of input data in real physical space. Use np.float32
+        for single precision.
     dealias_direct : bool, optional
         True for dealiasing using 2/3-rule. Must be used with
         padding_factor = 1.
@@ -317,9 +329,10 @@ class R2C(FourierBase):
 
     """
 
-    def __init__(self, N, padding_factor=1., domain=(0, 2*sp.pi),
+    def __init__(self, N, padding_factor=1., domain=(0, 2*sp.pi), dtype=float,
                  dealias_direct=False, coordinates=None, **kw):
-        FourierBase.__init__(self, N, padding_factor=padding_factor, dtype=float,
+        dtype = np.dtype(dtype).char.lower()
+        FourierBase.__init__(self, N, padding_factor=padding_factor, dtype=dtype,
                              domain=domain, dealias_direct=dealias_direct,
                              coordinates=coordinates)
         self.N = N
@@ -329,7 +342,7 @@ class R2C(FourierBase):
         self._xfftn_bck.opts = config['fftw']['irfft']
         self._sn = []
         self._sm = []
-        self.plan((int(padding_factor*N),), (0,), float, {})
+        self.plan((int(padding_factor*N),), (0,), dtype, {})
 
     def wavenumbers(self, bcast=True, scaled=False, eliminate_highest_freq=False):
         k = np.fft.rfftfreq(self.N, 1./self.N).astype(int)
@@ -363,7 +376,7 @@ class R2C(FourierBase):
         shape = list(shape)
         shape[self.axis] = int(shape[self.axis] / self.padding_factor)
         shape[self.axis] = shape[self.axis]//2 + 1
-        return fftw.aligned(shape, dtype=dtype)
+        return self.get_work_array(shape, dtype, 'trunc')
 
     @staticmethod
     def short_name():
@@ -408,7 +421,6 @@ class R2C(FourierBase):
 
     def _truncation_forward(self, padded_array, trunc_array):
         if not id(trunc_array) == id(padded_array):
-            trunc_array.fill(0)
             N = trunc_array.shape[self.axis]
             s = self.sl[slice(0, N)]
             trunc_array[:] = padded_array[s]
@@ -419,11 +431,13 @@ class R2C(FourierBase):
 
     def _padding_backward(self, trunc_array, padded_array):
         if not id(trunc_array) == id(padded_array):
-            padded_array.fill(0)
             N = trunc_array.shape[self.axis]
             if len(self._sn) != self.dimensions:
                 self._sn = self.sl[slice(0, N)]
                 self._sm = self.si[N-1]
+                self._sz = self.sl[slice(N, None)]
+            # Only the padded high wavenumbers are zeroed
+            padded_array[self._sz] = 0
             padded_array[self._sn] = trunc_array[self._sn]
             if self.N % 2 == 0:  # Symmetric Fourier interpolator
                 padded_array[self._sm] = padded_array[self._sm].real
@@ -498,6 +512,9 @@ class C2C(FourierBase):
         corresponds to a 3/2-rule for dealiasing.
     domain : 2-tuple of numbers, optional
         The computational domain.
+    dtype : data-type, optional
+        Type of input data in real physical space. Use np.complex64
+        for single precision.
     dealias_direct : bool, optional
         True for dealiasing using 2/3-rule. Must be used with
         padding_factor = 1.
@@ -506,9 +523,10 @@ class C2C(FourierBase):
 
     """
 
-    def __init__(self, N, padding_factor=1, domain=(0, 2*sp.pi),
+    def __init__(self, N, padding_factor=1, domain=(0, 2*sp.pi), dtype=complex,
                  dealias_direct=False, coordinates=None, **kw):
-        FourierBase.__init__(self, N, padding_factor=padding_factor, dtype=complex,
+        dtype = np.dtype(dtype).char.upper()
+        FourierBase.__init__(self, N, padding_factor=padding_factor, dtype=dtype,
                              domain=domain, dealias_direct=dealias_direct,
                              coordinates=coordinates)
         self.N = N
@@ -516,7 +534,7 @@ class C2C(FourierBase):
         self._xfftn_bck = fftw.ifftn
         self._xfftn_fwd.opts = config['fftw']['fft']
         self._xfftn_bck.opts = config['fftw']['ifft']
-        self.plan((int(padding_factor*N),), (0,), complex, {})
+        self.plan((int(padding_factor*N),), (0,), dtype, {})
         self._slp = []
 
     @staticmethod
@@ -569,23 +587,28 @@ class C2C(FourierBase):
 
     def _truncation_forward(self, padded_array, trunc_array):
         if not id(trunc_array) == id(padded_array):
-            trunc_array.fill(0)
             N = trunc_array.shape[self.axis]
+            M = padded_array.shape[self.axis]
             su = self.sl[slice(0, N//2+1)]
             trunc_array[su] = padded_array[su]
-            su = self.sl[slice(-(N//2), None)]
-            trunc_array[su] += padded_array[su]
+            n = N-N//2-1
+            trunc_array[self.sl[slice(N//2+1, None)]] = padded_array[self.sl[slice(M-n, None)]]
+            if N % 2 == 0:
+                # Nyquist is the sum of +/- N/2
+                trunc_array[self.si[N//2]] += padded_array[self.si[M-N//2]]
 
     def _padding_backward(self, trunc_array, padded_array):
         # pylint: disable=attribute-defined-outside-init
         if not id(trunc_array) == id(padded_array):
-            padded_array.fill(0)
             N = trunc_array.shape[self.axis]
             if len(self._slp) != self.dimensions: # Store for microoptimization
                 self._slp = self.sl[slice(0, N//2+1)]
                 self._slm = self.sl[slice(-(N//2), None)]
                 self._slp0 = self.si[N//2]
                 self._slm0 = self.si[-(N//2)]
+                self._slz = self.sl[slice(N//2+1, -(N//2))]
+            # Only the padded high wavenumbers are zeroed
+            padded_array[self._slz] = 0
             padded_array[self._slp] = trunc_array[self._slp]
             padded_array[self._slm] = trunc_array[self._slm]
             if self.N % 2 == 0:  # Use symmetric Fourier interpolator
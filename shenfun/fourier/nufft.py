@@ -0,0 +1,120 @@
+r"""
+Module for evaluating Fourier series at nonuniform points
+
+A Fourier series
+
+.. math::
+
+    u(x) = \sum_{k} \hat{u}_k \exp(ikx), \quad x \in [0, 2\pi),
+
+is evaluated at M arbitrary points with a nonuniform fast Fourier transform
+of type 2, using a Gaussian kernel as described by
+
+L. Greengard and J.-Y. Lee, "Accelerating the nonuniform fast Fourier
+transform", SIAM Review 46, 443-454, 2004.
+
+The coefficients are first divided by the Fourier transform of the
+kernel. The resulting series is then computed on a uniform mesh, oversampled
+by a factor R, with a regular FFT. Finally, the values at the points are
+interpolated from the 2w nearest mesh points, using the kernel as weights.
+The cost is O(RN log(RN) + Mw), as opposed to O(MN) for direct summation.
+The width w is set from the requested accuracy. The interpolation is
+done by the compiled kernel :func:`nufft_interp`.
+"""
+import numpy as np
+from shenfun.optimization import runtimeoptimizer
+
+__all__ = ['NUFFTKernel']
+
+class NUFFTKernel:
+    r"""Gaussian kernel for type 2 NUFFT along one axis
+
+    Parameters
+    ----------
+    N : int
+        Number of Fourier modes
+    tol : number, optional
+        Requested relative accuracy. Determines the number of mesh points w
+        on each side of a point used for interpolation, since the error
+        decays like :math:`\exp(-\pi w (R-1)/(R-1/2))`.
+    oversampling : number, optional
+        Oversampling factor R of the uniform mesh
+    width : int, optional
+        Use this w instead of the one computed from `tol`
+
+    Attributes
+    ----------
+    width : int
+        Number of mesh points w on each side of a point
+    Mr : int
+        Size of oversampled uniform mesh
+    tau : float
+        Parameter of the Gaussian :math:`\exp(-x^2/(4\tau))`
+    """
+    def __init__(self, N, tol=1e-12, oversampling=2, width=None):
+        R = oversampling
+        if width is None:
+            width = int(np.ceil(-np.log(tol)*(R-0.5)/(np.pi*(R-1))))
+        self.width = max(2, width)
+        self.Mr = max(int(np.ceil(oversampling*N)), 2*self.width)
+        R = self.Mr / N
+        self.tau = np.pi*self.width/(N**2*R*(R-0.5))
+
+    def deconvolve(self, k):
+        """Return scaling of Fourier coefficients with wavenumbers k
+
+        Parameters
+        ----------
+        k : array
+            Wavenumbers
+        """
+        return np.sqrt(np.pi/self.tau)*np.exp(k**2*self.tau)
+
+    def weights(self, x):
+        """Return indices into the uniform mesh and interpolation weights
+
+        Parameters
+        ----------
+        x : array
+            The M points, in the reference domain [0, 2pi)
+
+        Returns
+        -------
+        2-tuple of arrays
+            The indices and weights, both of shape (M, 2w). The weights
+            include the normalization of the backward FFT.
+        """
+        h = 2*np.pi/self.Mr
+        m = np.floor(x/h).astype(int)[:, None] + np.arange(1-self.width, self.width+1)[None, :]
+        d = x[:, None] - m*h
+        return np.mod(m, self.Mr), np.exp(-d**2/(4*self.tau))/self.Mr
+
+@runtimeoptimizer
+def nufft_interp(V, idx, W, strides, v):
+    """Interpolate from a uniform mesh to points, using tensor product
+    stencils
+
+    Parameters
+    ----------
+    V : array of shape (R, K)
+        Values on the flattened uniform mesh, for K independent series
+    idx : array of ints, shape (D, M, L)
+        Indices into the uniform mesh along each of D axes, for M points and
+        stencils of L points, see :meth:`.NUFFTKernel.weights`
+    W : array of shape (D, M, L)
+        The weights of the stencils
+    strides : array of D ints
+        Strides of the axes in the flattened mesh
+    v : array of shape (M, K)
+        Output array
+    """
+    D, M, L = idx.shape
+    v.fill(0)
+    for stencil in np.ndindex(*(L,)*D):
+        flat = 0
+        w = 1
+        for axis, l in enumerate(stencil):
+            flat = flat + idx[axis, :, l]*strides[axis]
+            w = w*W[axis, :, l]
+        v += w[:, None]*V[flat]
+    return v
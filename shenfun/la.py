@@ -6,6 +6,7 @@ from numbers import Number, Integral
 import numpy as np
 from scipy.sparse import spmatrix, kron
 from scipy.sparse.linalg import splu
+from scipy.linalg import eig
 from shenfun.config import config
 from shenfun.optimization import optimizer, runtimeoptimizer
 from shenfun.matrixbase import SparseMatrix, extract_bc_matrices, \
@@ -1016,6 +1017,497 @@ class SolverGeneric2ND:
             u.set_boundary_dofs()
         return u
 
+class SolverFastDiagonalization:
+    r"""Fast diagonalization solver for tensorproduct matrices with two or
+    more non-periodic directions
+
+    The solver handles any sum of separable :class:`.TPMatrix` instances
+    where there are at most two different matrices (apart from scaling)
+    along each non-periodic axis, say :math:`A_i` and :math:`B_i` for axis
+    :math:`i`. This is the case for, e.g., Poisson, Helmholtz and
+    biharmonic problems with Chebyshev, Legendre or Jacobi bases. The
+    generalized eigenvalue problems
+
+    .. math::
+
+        A_i V_i = B_i V_i \Lambda_i
+
+    are solved once, and a solve is then computed as
+
+    .. math::
+
+        u = (V_0 \otimes V_1 \otimes \cdots) \Lambda^{-1}
+            ((B_0 V_0)^{-1} \otimes (B_1 V_1)^{-1} \otimes \cdots) b,
+
+    where the diagonal :math:`\Lambda` is assembled from the eigenvalues of
+    all the terms. Each factor is applied as a dense matrix-matrix product
+    along its axis, such that a solve costs :math:`\mathcal{O}(N^{d+1})`
+    operations for :math:`d` non-periodic directions, and only one dense
+    :math:`N \times N` matrix needs to be stored for each factor.
+
+    Parameters
+    ----------
+    tpmats : sequence
+        sequence of instances of :class:`.TPMatrix`
+
+    Note
+    ----
+    The solver can also handle diagonal (Fourier) directions. Modes where
+    :math:`\Lambda` is zero, like the constant mode of a pure Neumann
+    problem, are set to zero, unless given as constraints.
+
+    Example
+    -------
+    >>> from shenfun import FunctionSpace, TensorProductSpace, TestFunction, \
+    ...     TrialFunction, Function, inner, div, grad, la, comm
+    >>> D = FunctionSpace(12, 'C', bc=(0, 0))
+    >>> T = TensorProductSpace(comm, (D, D))
+    >>> u = TrialFunction(T)
+    >>> v = TestFunction(T)
+    >>> sol = la.SolverFastDiagonalization(inner(v, div(grad(u))-u))
+    >>> f_hat = Function(T, buffer=1)
+    >>> u_hat = sol(f_hat, Function(T))
+    """
+
+    def __init__(self, tpmats):
+        tpmats = get_simplified_tpmatrices(tpmats)
+        bc_mats = extract_bc_matrices([tpmats])
+        self.tpmats = tpmats
+        self.bc_mats = bc_mats
+        self.T = T = tpmats[0].space
+        self.naxes = T.get_nondiagonal_axes()
+        self.V = {}
+        self.W = {}
+        self._transfers = {}
+        ls = T.local_slice(True)
+        lmbda = 0
+        interior = True
+        factors = [np.asarray(tpmat.scale) for tpmat in tpmats]
+        for axis in self.naxes:
+            base = T.bases[axis]
+            s = base.slice()
+            # Find the (at most two) different matrices along axis
+            reps = []
+            index = []
+            for tpmat in tpmats:
+                M = tpmat.mats[axis].diags('csr').toarray()
+                for i, R in enumerate(reps):
+                    c = np.vdot(R, M)/np.vdot(R, R)
+                    if np.linalg.norm(M-c*R) <= 1e-12*np.linalg.norm(M):
+                        index.append((i, c))
+                        break
+                else:
+                    reps.append(M)
+                    index.append((len(reps)-1, 1))
+            assert len(reps) <= 2, 'Fast diagonalization requires at most two different matrices along each non-periodic axis'
+            if len(reps) == 1:
+                self.V[axis] = None
+                self.W[axis] = np.linalg.inv(reps[0])
+                d = [np.ones(reps[0].shape[0])]
+            else:
+                # Use the best conditioned matrix as B
+                i = int(np.linalg.cond(reps[1]) < np.linalg.cond(reps[0]))
+                lm, V = eig(reps[1-i], reps[i])
+                if np.all(abs(lm.imag) <= 1e-12*abs(lm).max()):
+                    lm, V = lm.real, V.real
+                self.V[axis] = V
+                self.W[axis] = np.linalg.inv(reps[i].dot(V))
+                d = [None, None]
+                d[i] = np.ones(len(lm))
+                d[1-i] = lm
+            # Broadcast eigenvalues of each term along axis
+            bcast = [np.newaxis]*T.dimensions
+            bcast[axis] = slice(None)
+            for j, (i, c) in enumerate(index):
+                dj = np.zeros(base.N, dtype=d[i].dtype)
+                dj[s] = c*d[i]
+                factors[j] = factors[j]*dj[ls[axis]][tuple(bcast)]
+            k = np.arange(base.N)[ls[axis]]
+            interior = interior & ((k >= s.start) & (k < s.stop))[tuple(bcast)]
+        lmbda = np.broadcast_to(sum(factors[1:], factors[0]), T.shape(True))
+        self._interior = np.broadcast_to(interior, lmbda.shape)
+        self._lmbda = np.where(self._interior, lmbda, 1)
+        small = abs(self._lmbda) <= 1e-12*abs(self._lmbda).max()
+        # Zero also the boundary dofs, which are set by set_boundary_dofs
+        # for nonhomogeneous bcs
+        self._lmbda_inv = np.where(small | ~self._interior, 0, 1/np.where(small, 1, self._lmbda))
+
+    def _interior_slice(self, start, shape):
+        """Return slice of the local interior dofs for a local array
+
+        Parameters
+        ----------
+        start : sequence of ints
+            Global index of the first item of the local array
+        shape : sequence of ints
+            Shape of the local array
+        """
+        sl = [slice(None)]*self.T.dimensions
+        for axis in self.naxes:
+            s = self.T.bases[axis].slice()
+            sl[axis] = slice(max(s.start-start[axis], 0), max(min(s.stop-start[axis], shape[axis]), 0))
+        return tuple(sl)
+
+    def _apply(self, M, u, axis):
+        """Multiply the interior of `u` along `axis` by dense matrix `M`
+
+        If `axis` is distributed, then `u` is first redistributed to a pencil
+        aligned in `axis`.
+        """
+        pencil = self.T.forward.output_pencil
+        key = (axis, u.dtype.char)
+        if pencil.subshape[axis] != pencil.shape[axis]:
+            if key not in self._transfers:
+                transfer = pencil.transfer(pencil.pencil(axis), u.dtype)
+                self._transfers[key] = (transfer, np.zeros(transfer.subshapeB, dtype=u.dtype),
+                                        self._interior_slice(pencil.pencil(axis).substart, transfer.subshapeB))
+            transfer, w, sl = self._transfers[key]
+            transfer.forward(u, w)
+        else:
+            w, sl = u, self._interior_slice(pencil.substart, u.shape)
+        x = w[sl]
+        if np.iscomplexobj(x) and not np.iscomplexobj(M) and axis < x.ndim-1:
+            # Real and imaginary parts with one real matrix product
+            x = x.view(x.real.dtype)
+        x[...] = np.moveaxis(np.tensordot(M, x, (1, axis)), 0, axis)
+        if w is not u:
+            transfer.backward(w, u)
+        return u
+
+    def __call__(self, b, u=None, constraints=()):
+        """Solve problem with sum of separable :class:`.TPMatrix` instances
+
+        Parameters
+        ----------
+        b : array, right hand side
+        u : array, solution
+        constraints : tuple of 2-tuples
+            Each 2-tuple (row, value) sets the coefficient with flattened
+            index `row` of the non-periodic directions, for Fourier index 0,
+            to `value`. Only for modes in the nullspace of the operator,
+            like the constant mode of a pure Neumann problem.
+
+        """
+        if u is None:
+            u = b
+        else:
+            assert u.shape == b.shape
+
+        if len(self.bc_mats) > 0:
+            u.set_boundary_dofs()
+            w0 = Function(self.T).v
+            for bc_mat in self.bc_mats:
+                b -= bc_mat.matvec(u, w0)
+
+        complex_eigs = any(np.iscomplexobj(V) for V in self.V.values())
+        w = u if (np.iscomplexobj(u) or not complex_eigs) else np.zeros(u.shape, dtype=complex)
+        if w is not b:
+            w[...] = b
+        for axis in self.naxes:
+            w = self._apply(self.W[axis], w, axis)
+        w *= self._lmbda_inv
+        for axis in self.naxes[::-1]:
+            if self.V[axis] is not None:
+                w = self._apply(self.V[axis], w, axis)
+        if w is not u:
+            u[...] = w.real
+
+        if len(constraints) > 0 and comm.Get_rank() == 0:
+            s = self.T.slice()
+            dims = [self.T.dims()[axis] for axis in self.naxes]
+            for (row, val) in constraints:
+                index = [0]*self.T.dimensions
+                for axis, i in zip(self.naxes, np.unravel_index(row, dims)):
+                    index[axis] = s[axis].start+i
+                u[tuple(index)] = val
+
+        if len(self.bc_mats) > 0 and hasattr(u, 'set_boundary_dofs'):
+            u.set_boundary_dofs()
+        return u
+
+class SolverKrylov:
+    r"""Matrix-free Krylov solver for sums of :class:`.TPMatrix` instances
+
+    The solver never assembles a global matrix, but computes the action of
+    the operator with :meth:`.TPMatrix.matvec` on the distributed arrays of
+    the test space. It is thus applicable also to non-separable problems,
+    like variable coefficient problems and problems in curvilinear
+    coordinates, where the fast direct solvers cannot be used.
+
+    Parameters
+    ----------
+    tpmats : sequence
+        sequence of instances of :class:`.TPMatrix`
+    method : str, optional
+        The Krylov method
+
+            - 'cg' - Preconditioned conjugate gradients. Requires an
+              Hermitian and definite operator
+            - 'gmres' - Restarted GMRES with right preconditioning
+            - 'bicgstab' - Preconditioned BiCGStab
+
+    M : None, sequence or callable, optional
+        The preconditioner. A sequence of instances of :class:`.TPMatrix`,
+        usually a constant coefficient approximation of `tpmats`, is solved
+        with a fast direct solver, :class:`.SolverGeneric1ND` for one
+        non-periodic direction and :class:`.SolverFastDiagonalization`
+        otherwise. A callable is called as ``M(r, z)`` and should return
+        the approximate solution `z` of the problem with right hand side
+        `r`. None means no preconditioning.
+    rtol, atol : numbers, optional
+        The iterations stop when the norm of the residual is smaller than
+        ``max(rtol*norm(b), atol)``
+    maxiter : int, optional
+        Maximum number of iterations. Defaults to the number of unknowns.
+    restart : int, optional
+        Number of iterations between restarts of GMRES
+
+    Note
+    ----
+    Inner products are computed over all processors. The number of
+    iterations and the final residual norm of the last solve are stored in
+    the attributes `iterations` and `residual`.
+
+    Example
+    -------
+    >>> import sympy as sp
+    >>> from shenfun import FunctionSpace, TensorProductSpace, TestFunction, \
+    ...     TrialFunction, Function, inner, div, grad, la, comm
+    >>> x, y = sp.symbols('x,y', real=True)
+    >>> D = FunctionSpace(16, 'L', bc=(0, 0))
+    >>> T = TensorProductSpace(comm, (D, D))
+    >>> u = TrialFunction(T)
+    >>> v = TestFunction(T)
+    >>> A = inner(v, div(grad(u)) - (2+x*y)*u)
+    >>> M = inner(v, div(grad(u)) - 2*u)
+    >>> sol = la.SolverKrylov(A, method='cg', M=M)
+    >>> f_hat = Function(T, buffer=1)
+    >>> u_hat = sol(f_hat, Function(T))
+    """
+
+    def __init__(self, tpmats, method='cg', M=None, rtol=1e-10, atol=0,
+                 maxiter=None, restart=30):
+        assert method in ('cg', 'gmres', 'bicgstab')
+        tpmats = get_simplified_tpmatrices(tpmats)
+        bc_mats = extract_bc_matrices([tpmats])
+        self.tpmats = tpmats
+        self.bc_mats = bc_mats
+        self.T = T = tpmats[0].space
+        self.method = method
+        self.rtol = rtol
+        self.atol = atol
+        self.maxiter = maxiter
+        self.restart = restart
+        self.iterations = 0
+        self.residual = None
+        if isinstance(M, (list, tuple)):
+            M = self.get_preconditioner(list(M))
+        self.M = M
+        self._mask = np.ones(T.shape(True), dtype=bool)
+        ls = T.local_slice(True)
+        for axis in T.get_nondiagonal_axes():
+            s = T.bases[axis].slice()
+            k = np.arange(T.bases[axis].N)[ls[axis]]
+            bcast = [np.newaxis]*T.dimensions
+            bcast[axis] = slice(None)
+            self._mask = self._mask & ((k >= s.start) & (k < s.stop))[tuple(bcast)]
+
+    @staticmethod
+    def get_preconditioner(mats):
+        """Return fast direct solver for the :class:`.TPMatrix` instances
+        `mats`
+
+        Parameters
+        ----------
+        mats : list of :class:`.TPMatrix`
+        """
+        mats = get_simplified_tpmatrices(mats)
+        extract_bc_matrices([mats])
+        if len(mats[0].space.get_nondiagonal_axes()) == 1:
+            sol = SolverGeneric1ND(mats)
+        else:
+            sol = SolverFastDiagonalization(mats)
+        return lambda r, z: sol(r, z)
+
+    def matvec(self, u, c):
+        """Compute the action of the homogeneous operator on `u`
+
+        Parameters
+        ----------
+        u : array
+        c : array, the result
+        """
+        c.fill(0)
+        w0 = np.zeros_like(c)
+        for mat in self.tpmats:
+            c += mat.matvec(u, w0)
+        c *= self._mask
+        return c
+
+    def precondition(self, r, z):
+        if self.M is None:
+            z[...] = r
+        else:
+            z = self.M(r.copy(), z)
+            z *= self._mask
+        return z
+
+    def dot(self, a, b):
+        return self.T.comm.allreduce(np.vdot(a, b))
+
+    def norm(self, a):
+        return np.sqrt(abs(self.dot(a, a)))
+
+    def __call__(self, b, u=None, x0=None):
+        """Solve problem with sum of :class:`.TPMatrix` instances
+
+        Parameters
+        ----------
+        b : array, right hand side
+        u : array, solution
+        x0 : array, optional
+            Initial guess. Zero if None.
+
+        """
+        if u is None:
+            u = b
+        else:
+            assert u.shape == b.shape
+
+        if len(self.bc_mats) > 0:
+            u.set_boundary_dofs()
+            w0 = np.zeros_like(b)
+            for bc_mat in self.bc_mats:
+                b -= bc_mat.matvec(u, w0)
+
+        dtype = np.result_type(b.dtype, u.dtype)
+        rhs = np.zeros(b.shape, dtype=dtype)
+        rhs[...] = b
+        rhs *= self._mask
+        x = np.zeros_like(rhs)
+        if x0 is not None:
+            x[...] = x0
+            x *= self._mask
+        maxiter = self.maxiter if self.maxiter is not None else self.T.comm.allreduce(int(self._mask.sum()))
+        tol = max(self.rtol*self.norm(rhs), self.atol)
+        x = getattr(self, '_'+self.method)(rhs, x, tol, maxiter)
+
+        u[self._mask] = x[self._mask].real if u.dtype.char in 'fdg' else x[self._mask]
+        if len(self.bc_mats) > 0 and hasattr(u, 'set_boundary_dofs'):
+            u.set_boundary_dofs()
+        return u
+
+    def _cg(self, b, x, tol, maxiter):
+        r = b - self.matvec(x, np.zeros_like(b))
+        z = self.precondition(r, np.zeros_like(b))
+        p = z.copy()
+        q = np.zeros_like(b)
+        rz = self.dot(r, z)
+        self.residual = self.norm(r)
+        self.iterations = 0
+        while self.residual > tol and self.iterations < maxiter:
+            q = self.matvec(p, q)
+            alpha = rz/self.dot(p, q)
+            x += alpha*p
+            r -= alpha*q
+            self.iterations += 1
+            self.residual = self.norm(r)
+            if self.residual <= tol:
+                break
+            z = self.precondition(r, z)
+            rz, rz0 = self.dot(r, z), rz
+            p *= rz/rz0
+            p += z
+        return x
+
+    def _bicgstab(self, b, x, tol, maxiter):
+        r = b - self.matvec(x, np.zeros_like(b))
+        r0 = r.copy()
+        p = np.zeros_like(b)
+        v = np.zeros_like(b)
+        y = np.zeros_like(b)
+        z = np.zeros_like(b)
+        t = np.zeros_like(b)
+        rho = alpha = omega = 1
+        self.residual = self.norm(r)
+        self.iterations = 0
+        while self.residual > tol and self.iterations < maxiter:
+            rho, rho0 = self.dot(r0, r), rho
+            if rho == 0:
+                break
+            p *= (rho/rho0)*(alpha/omega)
+            p -= (rho/rho0)*alpha*v
+            p += r
+            y = self.precondition(p, y)
+            v = self.matvec(y, v)
+            alpha = rho/self.dot(r0, v)
+            x += alpha*y
+            r -= alpha*v
+            self.iterations += 1
+            self.residual = self.norm(r)
+            if self.residual <= tol:
+                break
+            z = self.precondition(r, z)
+            t = self.matvec(z, t)
+            tt = self.dot(t, t)
+            if tt == 0:
+                break
+            omega = self.dot(t, r)/tt
+            x += omega*z
+            r -= omega*t
+            self.residual = self.norm(r)
+            if omega == 0:
+                break
+        return x
+
+    def _gmres(self, b, x, tol, maxiter):
+        m = self.restart
+        dtype = np.result_type(b.dtype, np.float64)
+        w = np.zeros_like(b)
+        z = np.zeros_like(b)
+        self.iterations = 0
+        while True:
+            r = b - self.matvec(x, w)
+            beta = self.norm(r)
+            self.residual = beta
+            if beta <= tol or self.iterations >= maxiter:
+                break
+            V = [r/beta]
+            H = np.zeros((m+1, m), dtype=dtype)
+            cs = np.zeros(m, dtype=dtype)
+            sn = np.zeros(m, dtype=dtype)
+            g = np.zeros(m+1, dtype=dtype)
+            g[0] = beta
+            for j in range(m):
+                z = self.precondition(V[j], z)
+                w = self.matvec(z, w)
+                for i in range(j+1):
+                    H[i, j] = self.dot(V[i], w)
+                    w -= H[i, j]*V[i]
+                H[j+1, j] = self.norm(w)
+                V.append(w/H[j+1, j] if H[j+1, j] != 0 else np.zeros_like(w))
+                for i in range(j):
+                    h = H[i, j]
+                    H[i, j] = np.conj(cs[i])*h + np.conj(sn[i])*H[i+1, j]
+                    H[i+1, j] = -sn[i]*h + cs[i]*H[i+1, j]
+                d = np.sqrt(abs(H[j, j])**2 + abs(H[j+1, j])**2)
+                cs[j], sn[j] = (H[j, j]/d, H[j+1, j]/d) if d != 0 else (1, 0)
+                H[j, j] = d
+                H[j+1, j] = 0
+                g[j+1] = -sn[j]*g[j]
+                g[j] = np.conj(cs[j])*g[j]
+                self.iterations += 1
+                self.residual = abs(g[j+1])
+                if self.residual <= tol or self.iterations >= maxiter:
+                    break
+            k = j+1
+            yk = np.linalg.solve(np.triu(H[:k, :k]), g[:k])
+            dx = np.zeros_like(b)
+            for i in range(k):
+                dx += yk[i]*V[i]
+            x += self.precondition(dx, z)
+        return x
+
 class SolverDiagonal:
     """Solver for purely diagonal matrices, like Fourier in Cartesian coordinates.
 
@@ -1185,11 +1677,20 @@ class SolverGeneric1ND:
     ----------
     mats : sequence
         sequence of instances of :class:`.TPMatrix`
+    packed : bool, optional
+        Whether to store the LU factors of all the 1D matrices in one
+        contiguous array, instead of one 1D solver for each wavenumber.
+        Only possible for real banded matrices, and ignored otherwise.
 
     Note
     ----
     In addition to the one non-diagonal direction, the solver can also handle
     up to two diagonal (Fourier) directions.
+
+    With `packed` the 1D matrices of all wavenumbers are assembled and
+    LU-factorized together, vectorized over the wavenumbers. Only the solver
+    for the first wavenumber, that may be singular or constrained, is created
+    as a separate 1D solver.
     Also note that if there are boundary matrices in the list of mats, then
     these matrices are used to modify the right hand side before
     solving. If this is not the desired behaviour, then use
@@ -1197,7 +1698,7 @@ class SolverGeneric1ND:
 
     """
 
-    def __init__(self, mats):
+    def __init__(self, mats, packed=True):
         assert isinstance(mats, list)
         mats = get_simplified_tpmatrices(mats)
         assert len(mats[0].naxes) == 1
@@ -1207,10 +1708,13 @@ class SolverGeneric1ND:
         self.testspace = mats[0].space
         self.trialspace = mats[0].trialspace
         self.bc_mats = bc_mats
+        self.packed = packed
         self.solvers1D = None
+        self._data = None
+        self._sol0 = None
+        self._sol1 = None
         self.assemble()
         self._lu = False
-        self._data = None
 
     def matvec(self, u, c):
         c.fill(0)
@@ -1227,6 +1731,9 @@ class SolverGeneric1ND:
     def assemble(self):
         ndim = self.mats[0].dimensions
         shape = self.mats[0].space.shape(True)
+        if self.packed and self.assemble_packed():
+            return
+        self.packed = False
         self.solvers1D = []
         if ndim == 2:
             zi = np.ndindex((1, shape[1])) if self.naxes == 0 else np.ndindex((shape[0], 1))
@@ -1258,6 +1765,59 @@ class SolverGeneric1ND:
                             sol = mat.mats[self.naxes]*sc
                     self.solvers1D[-1].append(Solver(sol))
 
+        self._sol0 = self.solvers1D[0] if ndim == 2 else self.solvers1D[0][0]
+        self._sol1 = self.solvers1D[-1] if ndim == 2 else self.solvers1D[-1][-1]
+
+    def assemble_packed(self):
+        """Assemble the 1D matrices of all wavenumbers in one array
+
+        Returns
+        -------
+        bool
+            True if the matrices could be packed, False otherwise. Packing
+            requires real banded matrices, with the same structure for all
+            wavenumbers.
+        """
+        shape = self.mats[0].space.shape(True)
+        scales = []
+        for mat in self.mats:
+            try:
+                sc = np.broadcast_to(mat.scale, shape)
+            except ValueError:
+                return False
+            sc = np.take(sc, 0, axis=self.naxes)
+            if np.iscomplexobj(sc):
+                if not np.allclose(sc.imag, 0):
+                    return False
+                sc = sc.real
+            scales.append(sc)
+
+        def get_solver(i):
+            sol = None
+            for mat, sc in zip(self.mats, scales):
+                if sol:
+                    sol += mat.mats[self.naxes]*sc[i]
+                else:
+                    sol = mat.mats[self.naxes]*sc[i]
+            return Solver(sol)
+
+        P = scales[0].shape
+        sol1 = get_solver(tuple(np.array(P)-1))
+        if not isinstance(sol1, BandedMatrixSolver):
+            return False
+        offsets = list(sol1._lu.offsets)
+        data = np.zeros(P+sol1._lu.data.shape)
+        for mat, sc in zip(self.mats, scales):
+            A = mat.mats[self.naxes].diags('dia')
+            for key, d in zip(A.offsets, A.data):
+                if key not in offsets:
+                    return False
+                data[..., offsets.index(key), :] += sc[..., None]*d.real
+        self._sol0 = get_solver((0,)*len(P))
+        self._sol1 = sol1
+        self._data = data
+        return True
+
     def apply_constraints(self, b, constraints=()):
         #The SolverGeneric1ND solver can only constrain the first dofs of
         #the diagonal axes. For Fourier this is the zero dof with the
@@ -1272,7 +1832,7 @@ class SolverGeneric1ND:
         s[self.naxes] = slice(None)
         s = tuple(s)
         is_rank_zero = np.array([z0[i].start for i in paxes]).prod()
-        sol = self.solvers1D[0] if ndim == 2 else self.solvers1D[0][0]
+        sol = self._sol0
         if is_rank_zero != 0:
             return b
         sol.apply_constraints(b[s], constraints)
@@ -1282,7 +1842,19 @@ class SolverGeneric1ND:
         if self._lu is True:
             return
 
-        if isinstance(self.solvers1D[0], SparseMatrixSolver):
+        if self.packed:
+            self._sol0.perform_lu()
+            if self._sol1._inner_arg is None:
+                # LU-decomposition of all wavenumbers together, using the
+                # (vectorizable) Python implementation of the 1D solver
+                P = self._data.shape[:-2]
+                data = self._data.reshape((-1,)+self._data.shape[-2:])
+                data = np.moveaxis(data, 0, -1).copy()
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    self._sol1.LU.func(data)
+                self._data = np.ascontiguousarray(np.moveaxis(data, -1, 0)).reshape(P+data.shape[:2])
+
+        elif isinstance(self.solvers1D[0], SparseMatrixSolver):
             for m in self.solvers1D:
                 lu = m.perform_lu()
 
@@ -1339,14 +1911,14 @@ class SolverGeneric1ND:
                     sol(u[s0], data[i, j])
         return u
 
-    def fast_solve(self, u, b, solvers1D, naxes):
+    def fast_solve(self, u, b, solvers1D, naxes, fast=True):
         if u is not b:
             s = tuple([slice(0, i) for i in u.shape])
             u[s] = b[s]
         # Solve first for the possibly different Fourier wavenumber 0, or (0, 0) in 3D
         # All other wavenumbers we assume have the same solver
-        sol0 = solvers1D[0] if u.ndim == 2 else solvers1D[0][0]
-        sol1 = solvers1D[-1] if u.ndim == 2 else solvers1D[-1][-1]
+        sol0 = self._sol0
+        sol1 = self._sol1
         is_rank_zero = comm.Get_rank() == 0
 
         if is_rank_zero:
@@ -1356,8 +1928,11 @@ class SolverGeneric1ND:
             sol0.inner_solve(u[s], sol0._inner_arg)
 
         data = self.get_data(is_rank_zero)
-        sol = optimizer(sol1.inner_solve, False)
-        u = self.solve_data(u, data, sol, naxes, is_rank_zero)
+        if fast:
+            sol = optimizer(sol1.inner_solve, False)
+            u = self.solve_data(u, data, sol, naxes, is_rank_zero)
+        else:
+            u = self.solve_data.func(u, data, sol1.inner_solve, naxes, is_rank_zero)
 
     def solve(self, u, b, solvers1D, naxes):
         if u is not b:
@@ -1414,11 +1989,12 @@ class SolverGeneric1ND:
         if not self._lu:
             self.perform_lu()
 
-        sol1 = self.solvers1D[-1] if u.ndim == 2 else self.solvers1D[-1][-1]
-        if isinstance(sol1._inner_arg, tuple):
+        if isinstance(self._sol1._inner_arg, tuple):
             fast = False
 
-        if not fast:
+        if self.packed:
+            self.fast_solve(u, b, None, self.naxes, fast)
+        elif not fast:
             self.solve(u, b, self.solvers1D, self.naxes)
         else:
             self.fast_solve(u, b, self.solvers1D, self.naxes)
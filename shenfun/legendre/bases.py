@@ -196,8 +196,17 @@ class Orthogonal(JacobiBase):
             V = np.dot(V, D)
         return V
 
-    def _evaluate_expansion_all(self, input_array, output_array, x=None, kind='fast'):
+    def _get_kind(self, kind, x=None):
+        """Return kind of transform, with 'auto' resolved to either 'fast'
+        or 'recursive' depending on the size of the space"""
+        if kind == 'auto':
+            fast = (x is None and self.quad == 'LG' and
+                    self.N >= config['transforms']['auto']['legendre'])
+            kind = 'fast' if fast else 'recursive'
+        return kind
 
+    def _evaluate_expansion_all(self, input_array, output_array, x=None, kind='fast'):
+        kind = self._get_kind(kind, x)
         if kind != 'fast' or self.quad != 'LG':
             JacobiBase._evaluate_expansion_all(self, input_array, output_array, x, kind=kind)
             return
@@ -207,6 +216,7 @@ class Orthogonal(JacobiBase):
         output_array = self.backward.xfftn()
 
     def _evaluate_scalar_product(self, kind='fast'):
+        kind = self._get_kind(kind)
         if kind != 'fast' or self.quad != 'LG':
             JacobiBase._evaluate_scalar_product(self, kind=kind)
             return
@@ -254,6 +264,10 @@ class Orthogonal(JacobiBase):
             return output_array
         return input_array
 
+    def diff_recursion_weights(self):
+        n = np.arange(self.N)
+        return np.ones(self.N), 2.*n+1
+
     def to_chebyshev(self, input_array, output_array=None):
         from shenfun.forms.arguments import Function, FunctionSpace
         assert input_array.function_space().__class__.__name__ == 'Orthogonal'
@@ -281,18 +295,21 @@ class Orthogonal(JacobiBase):
         flags = (fftw.flag_dict[opts['planner_effort']],
                  fftw.flag_dict[opts['overwrite_input']])
         threads = opts['threads']
-        U = fftw.aligned(shape, dtype=float)
-        xfftn_fwd = DLT(U, axes=(axis,), kind='scalar product', threads=threads, flags=flags)
-        V = xfftn_fwd.output_array
+        self.release_work_arrays()
+        iscomplex = np.issubdtype(dtype, np.complexfloating)
+        rdtype = np.dtype(dtype).char.lower()  # float32 or float64
+        U = self.get_work_array(shape, rdtype, 'U', scratch=iscomplex)
+        V = self.get_work_array(shape, rdtype, 'V', scratch=iscomplex)
+        xfftn_fwd = DLT(U, axes=(axis,), kind='scalar product', threads=threads, flags=flags, output_array=V)
         xfftn_bck = DLT(V, axes=(axis,), kind='backward', threads=threads, flags=flags, output_array=U)
         V.fill(0)
         U.fill(0)
         self._leg2cheb = xfftn_fwd.leg2chebclass
 
-        if np.dtype(dtype) is np.dtype('complex'):
+        if iscomplex:
             # dct only works on real data, so need to wrap it
-            U = fftw.aligned(shape, dtype=complex)
-            V = fftw.aligned(shape, dtype=complex)
+            U = self.get_work_array(shape, dtype, 'U')
+            V = self.get_work_array(shape, dtype, 'V')
             U.fill(0)
             V.fill(0)
             xfftn_fwd = DCTWrap(xfftn_fwd, U, V)
@@ -1,11 +1,14 @@
 import importlib
+import timeit
 from copy import copy
+from collections import OrderedDict
 from scipy.special import gammaln
 import numpy as np
 from numpy.polynomial import chebyshev as n_cheb
 from mpi4py import MPI
 from mpi4py_fft import fftw
-from mpi4py_fft.fftw.utilities import FFTW_MEASURE, FFTW_PRESERVE_INPUT
+from mpi4py_fft.fftw.utilities import FFTW_MEASURE, FFTW_PRESERVE_INPUT, \
+    FFTW_ESTIMATE
 from shenfun.optimization import runtimeoptimizer
 from shenfun.optimization.cython import Leg2Cheb, Cheb2Leg, Lambda
 from shenfun.spectralbase import islicedict, slicedict
@@ -13,7 +16,8 @@ from shenfun.forms.arguments import FunctionSpace
 from . import fastgl
 
 __all__ = ['DLT', 'leg2cheb', 'cheb2leg', 'Leg2chebHaleTownsend',
-           'Leg2Cheb', 'Cheb2Leg', 'FMMLeg2Cheb', 'FMMCheb2Leg']
+           'Leg2Cheb', 'Cheb2Leg', 'FMMLeg2Cheb', 'FMMCheb2Leg',
+           'plan_leg2cheb']
 
 
 class DLT:
@@ -130,8 +134,7 @@ class DLT:
         U = input_array
         V = output_array if output_array is not None else U.copy()
         self.plan(U, V, kind, threads, flags)
-        ##self.leg2chebclass = Leg2Cheb(U, axis=axis, maxs=100, use_direct=500)
-        self.leg2chebclass = Leg2Cheb(U, domains=2, diagonals=16, axis=axis, maxs=100, use_direct=1000)
+        self.leg2chebclass = plan_leg2cheb(U, axis=axis, flags=flags)
 
     def plan(self, U, V, kind, threads, flags):
         Uc = U.copy()
@@ -203,6 +206,82 @@ class DLT:
         self._output_array[:] = fk
         return self._output_array
 
+# Fastest Legendre to Chebyshev method found for (shape, axis)
+leg2cheb_wisdom = {}
+
+def _get_leg2cheb(method, input_array, axis):
+    N = input_array.shape[axis]
+    if method == 'direct':
+        return Leg2Cheb(input_array, axis=axis, use_direct=N)
+    elif method == 'fmm':
+        return Leg2Cheb(input_array, domains=2, diagonals=16, axis=axis, maxs=100, use_direct=-1)
+    elif method == 'hale-townsend':
+        return Leg2chebHaleTownsend(input_array.copy(), axis=axis, Nmin=0)
+    raise ValueError(f'Unknown Legendre to Chebyshev method {method}')
+
+def plan_leg2cheb(input_array, axis=0, flags=(FFTW_MEASURE,), methods=None):
+    r"""Return the fastest Legendre to Chebyshev transform for `input_array`
+
+    Like FFTW_MEASURE, the eligible methods are timed for the given shape and
+    axis, and the winner is recorded in `leg2cheb_wisdom`, such that later
+    plans of the same shape and axis are not measured again.
+
+    Parameters
+    ----------
+    input_array : array
+        Array of the shape and type that will be transformed
+    axis : int, optional
+        The axis over which to transform
+    flags : sequence of ints, optional
+        If FFTW_ESTIMATE is in flags, then choose method from the size of
+        the transformed axis without measuring.
+    methods : None or sequence of str, optional
+        Methods to choose from, any of
+
+            - 'direct' - :class:`.Leg2Cheb` with direct summation, :math:`O(N^2)`
+            - 'fmm' - :class:`.Leg2Cheb` with fast multipole method, :math:`O(N)`
+            - 'hale-townsend' - :class:`.Leg2chebHaleTownsend`, :math:`O(N (\log N)^2)`
+
+        If None, use all methods applicable for the size of the transformed axis.
+
+    Note
+    ----
+    Measuring is only used for sizes where the fast methods are applicable
+    (N >= 512), since the direct method is faster for smaller N.
+    Measuring is expensive, since it creates and runs all the eligible
+    methods, including the :math:`O(N^2)` direct method. Use FFTW_ESTIMATE
+    to avoid this cost at plan time.
+    """
+    N = input_array.shape[axis]
+    if methods is None:
+        methods = ['direct']
+        if N >= 512:
+            methods.append('fmm')
+        if N >= 1000:
+            methods.append('hale-townsend')
+    methods = list(methods)
+    key = (input_array.shape, axis, tuple(methods))
+    if key in leg2cheb_wisdom:
+        return _get_leg2cheb(leg2cheb_wisdom[key], input_array, axis)
+    estimate = 'fmm' if N > 1000 and 'fmm' in methods else methods[0]
+    if FFTW_ESTIMATE in flags or len(methods) == 1:
+        return _get_leg2cheb(estimate, input_array, axis)
+    # Provisional, since planning 'hale-townsend' creates a Legendre space
+    leg2cheb_wisdom[key] = estimate
+    u = np.random.random(input_array.shape)
+    v = np.zeros_like(u)
+    timings = {}
+    classes = {}
+    for method in methods:
+        c = classes[method] = _get_leg2cheb(method, input_array, axis)
+        c(u, v)  # warm up
+        c(u, v, transpose=True)
+        timings[method] = min(timeit.repeat(lambda: (c(u, v), c(u, v, transpose=True)),
+                                            repeat=3, number=1))
+    method = min(timings, key=timings.get)
+    leg2cheb_wisdom[key] = method
+    return classes[method]
+
 class DCT:
     """Discrete cosine transform with appropriate scaling
 
@@ -758,6 +837,63 @@ def restricted_product(L, input_array, output_array, xi, i0, i1, a0, axis, a):
         output_array[k] = s
     return output_array
 
+# In-memory cache of matrices used by the FMM transforms, least recently
+# used first
+_fmm_cache = OrderedDict()
+_fmm_disk_cache = {}
+
+def get_fmm_cache():
+    """Return on-disk cache of FMM matrices, or None if disabled
+
+    The cache is configured through ``config['bases']['legendre']['fmm_cache']``.
+    """
+    from shenfun.config import config
+    from shenfun.utilities.diskcache import DiskCache
+    conf = config['bases']['legendre']['fmm_cache']
+    if not conf['enabled']:
+        return None
+    if conf['path'] not in _fmm_disk_cache:
+        _fmm_disk_cache[conf['path']] = DiskCache(conf['path'])
+    return _fmm_disk_cache[conf['path']]
+
+def fmm_cached(fun, key):
+    """Return dictionary of arrays computed by `fun`, cached under `key`
+
+    The result is first looked up in memory, then in the on-disk cache
+    (see :func:`get_fmm_cache`). If missing in both, then it is computed
+    by calling `fun` and stored. The matrices are thus shared by all the
+    FMM transforms of the same size, on all axes and in all spaces. At most
+    ``config['bases']['legendre']['fmm_cache']['maxitems']`` results are
+    kept in memory, and the least recently used are discarded first.
+
+    Parameters
+    ----------
+    fun : Callable
+        Function without arguments returning a dictionary of arrays
+    key : tuple
+        Unique key for the arrays computed by `fun`
+    """
+    from shenfun.config import config
+    if key in _fmm_cache:
+        _fmm_cache.move_to_end(key)
+        return _fmm_cache[key]
+    cache = get_fmm_cache()
+    if cache is not None:
+        from shenfun import __version__
+        try:
+            value = cache[(__version__,)+key]
+        except KeyError:
+            value = fun()
+            cache[(__version__,)+key] = value
+    else:
+        value = fun()
+    for v in value.values():
+        v.flags.writeable = False
+    _fmm_cache[key] = value
+    while len(_fmm_cache) > config['bases']['legendre']['fmm_cache']['maxitems']:
+        _fmm_cache.popitem(last=False)
+    return value
+
 def getChebyshev(level, D, s, diags, A, N, l2c=True):
     """Low-rank computation of Chebyshev coefficients
 
@@ -782,7 +918,24 @@ def getChebyshev(level, D, s, diags, A, N, l2c=True):
     l2c : bool
         If True, the transform goes from Legendre to Chebyshev, and
         vice versa if False
+
+    Note
+    ----
+    The coefficients are cached, see :func:`fmm_cached`.
     """
+    def fun():
+        A0, N0 = [], []
+        _getChebyshev(level, D, s, diags, A0, N0, l2c)
+        return {'A': np.hstack(A0), 'N': np.array(N0, dtype=int)}
+    key = ('getChebyshev', int(level), tuple(int(d) for d in D), int(s),
+           int(diags), bool(l2c))
+    value = fmm_cached(fun, key)
+    Nk = value['N'].tolist()
+    A.extend(np.split(value['A'], np.cumsum(np.array(Nk)**2)[:-1]))
+    N.extend(Nk)
+    return max(Nk)
+
+def _getChebyshev(level, D, s, diags, A, N, l2c=True):
     from shenfun import FunctionSpace, TensorProductSpace
     h = s*get_h(level, D)
     i0, j0 = get_ij(level, 0, s, D, diags)
@@ -1349,6 +1502,10 @@ def FMMcheb(input_array, output_array, axis, Nn, fk, Nk, T, Th, ThT, D, Mmin, s,
         output_array[sigma::2] = coa[:N//2+(N%2)*(1-sigma)]
 
 def conversionmatrix(D : int, M : int) -> np.ndarray:
+    key = ('conversionmatrix', int(D), int(M))
+    return fmm_cached(lambda: {'T': _conversionmatrix(D, M)}, key)['T']
+
+def _conversionmatrix(D : int, M : int) -> np.ndarray:
     from mpi4py_fft.fftw import dctn
     T = np.zeros((D, M, M))
     k = np.arange(M)
@@ -15,15 +15,43 @@ from scipy.sparse import bmat, spmatrix, dia_matrix, csr_matrix, kron, \
 from scipy.integrate import quadrature
 from mpi4py import MPI
 from shenfun.config import config
+from shenfun.optimization import runtimeoptimizer
 from .utilities import integrate_sympy
+from .utilities.diskcache import DiskCache
 
 __all__ = ['SparseMatrix', 'SpectralMatrix', 'extract_diagonal_matrix',
            'extract_bc_matrices', 'check_sanity', 'assemble_sympy',
            'TPMatrix', 'BlockMatrix', 'BlockMatrices', 'Identity',
-           'get_simplified_tpmatrices', 'ScipyMatrix', 'SpectralMatDict']
+           'get_simplified_tpmatrices', 'ScipyMatrix', 'SpectralMatDict',
+           'get_matrix_cache']
 
 comm = MPI.COMM_WORLD
 
+
+@runtimeoptimizer
+def dia_matvec(v, c, data, offsets):
+    """Matrix vector product with packed diagonals along the second axis
+
+    Parameters
+    ----------
+    v : array of shape (P, M, Q)
+        Input array
+    c : array of shape (P, N, Q)
+        Output array
+    data : array of shape (D, N)
+        Packed diagonals, see :meth:`.SparseMatrix.packed`
+    offsets : array of D ints
+        Offsets of the diagonals
+    """
+    N, M = c.shape[1], v.shape[1]
+    c.fill(0)
+    for j, k in enumerate(offsets):
+        i0, i1 = max(0, -k), min(N, M-k)
+        if i1 > i0:
+            c[:, i0:i1] += data[j, i0:i1, None]*v[:, i0+k:i1+k]
+    return c
+
+
 class SparseMatrix(MutableMapping):
     r"""Base class for sparse matrices.
 
@@ -45,6 +73,8 @@ class SparseMatrix(MutableMapping):
     The matrix format and storage is similar to Scipy's `dia_matrix`. The format is
     chosen because spectral matrices often are computed by hand and presented
     in the literature as banded matrices.
+    For matrix vector products the diagonals are also packed in one
+    contiguous array, see :meth:`packed`.
     Note that a SparseMatrix can easily be transformed to any of Scipy's formats
     using the `diags` method. However, Scipy's matrices are not implemented to
     act along different axes of multidimensional arrays, which is required
@@ -99,6 +129,7 @@ class SparseMatrix(MutableMapping):
         format : str, optional
              Choice for computation
 
+             - packed - Compiled kernel using the packed diagonals of :meth:`packed`
              - csr - Compressed sparse row format
              - dia - Sparse matrix with DIAgonal storage
              - python - Use numpy and vectorization
@@ -116,6 +147,26 @@ class SparseMatrix(MutableMapping):
         N, M = self.shape
         c.fill(0)
 
+        if format == 'packed':
+            offsets, data = self.packed()
+            dtype = np.result_type(v.dtype, data.dtype)
+            data = data.astype(dtype, copy=False)
+            P = int(np.prod(v.shape[:axis]))
+            Q = int(np.prod(v.shape[axis+1:]))
+            sv = [slice(None)]*v.ndim
+            sv[axis] = slice(0, M)
+            vi = np.ascontiguousarray(v[tuple(sv)], dtype=dtype).reshape((P, M, Q))
+            sv[axis] = slice(0, N)
+            ci = c[tuple(sv)]
+            matvec = dia_matvec if dtype.char in 'fdFD' else dia_matvec.func
+            if ci.flags.c_contiguous and ci.dtype == dtype:
+                matvec(vi, ci.reshape((P, N, Q)), data, offsets)
+            else:
+                ci[...] = matvec(vi, np.empty((P, N, Q), dtype=dtype), data, offsets).reshape(ci.shape)
+            if not (isinstance(self.scale, Number) and self.scale == 1):
+                c *= self.scale
+            return c
+
         # Roll relevant axis to first
         if axis > 0:
             v = np.moveaxis(v, axis, 0)
@@ -177,6 +228,43 @@ class SparseMatrix(MutableMapping):
             scale = np.atleast_1d(scale).item()
         return self._diags*scale if scaled else self._diags
 
+    def packed(self, dtype=None):
+        """Return the diagonals packed in one contiguous array
+
+        Parameters
+        ----------
+        dtype : Numpy dtype, optional
+            The dtype of the packed diagonals. Defaults to the dtype of the
+            diagonals, but at least float.
+
+        Returns
+        -------
+        offsets : array of ints
+            The sorted offsets of the diagonals
+        data : 2D array
+            Array of shape ``(len(offsets), self.shape[0])``, where
+            ``data[j, i]`` is the item in row i and column ``i+offsets[j]``.
+            Items outside the matrix are zero.
+
+        Note
+        ----
+        The scale of the matrix is not included. Like :meth:`diags`, a
+        diagonal longer than its length in the matrix is truncated, and
+        only its leading items are used. The arrays are not cached, such
+        that diagonals modified in place are always up to date.
+        """
+        N, M = self.shape
+        offsets = np.array(sorted(self.keys()), dtype=np.intp)
+        diagonals = [self[int(k)] for k in offsets]
+        if dtype is None:
+            dtype = np.result_type(float, *[np.asarray(d).dtype for d in diagonals])
+        data = np.zeros((len(offsets), N), dtype=dtype)
+        for j, (k, d) in enumerate(zip(offsets, diagonals)):
+            i0, i1 = max(0, -k), min(N, M-k)
+            d = np.asarray(d)
+            data[j, i0:i1] = d[:i1-i0] if d.ndim > 0 else d
+        return offsets, data
+
     def sort(self):
         self._storage = {si[0]: si[1] for si in sorted(self.items())}
 
@@ -203,17 +291,32 @@ class SparseMatrix(MutableMapping):
             return False
         if not self.same_keys(a):
             return False
-        d0 = self.diags('csr', False).data
-        a0 = a.diags('csr', False).data
-        if d0.shape[0] != a0.shape[0]:
-            return False
-        if not np.linalg.norm(d0-a0) < 1e-8:
-            return False
-        return True
+        return self.packed_allclose(a)
 
     def __neq__(self, a):
         return not self.__eq__(a)
 
+    def packed_allclose(self, a, atol=1e-8):
+        """Return whether the unscaled diagonals of self and `a` are equal
+
+        Parameters
+        ----------
+        a : :class:`.SparseMatrix`
+        atol : number, optional
+            Tolerance for the norm of the difference
+        """
+        o0, d0 = self.packed()
+        o1, d1 = a.packed()
+        if d0.shape[1] != d1.shape[1]:
+            return False
+        if not np.array_equal(o0, o1):
+            offsets = np.union1d(o0, o1)
+            data = np.zeros((2, len(offsets), d0.shape[1]), dtype=np.result_type(d0, d1))
+            data[0, np.searchsorted(offsets, o0)] = d0
+            data[1, np.searchsorted(offsets, o1)] = d1
+            d0, d1 = data
+        return np.linalg.norm(d0-d1) < atol
+
     def __imul__(self, y):
         """self.__imul__(y) <==> self*=y"""
         assert isinstance(y, Number)
@@ -234,6 +337,36 @@ class SparseMatrix(MutableMapping):
             return self.diags('csc')*y.diags('csc')
         raise RuntimeError
 
+    def matmul(self, y):
+        """Return matrix product of self and `y` as a :class:`.SparseMatrix`
+
+        The product is computed from the packed diagonals (see :meth:`packed`),
+        with one vectorized product for each pair of diagonals.
+
+        Parameters
+        ----------
+        y : :class:`.SparseMatrix`
+        """
+        N, K = self.shape
+        assert y.shape[0] == K
+        M = y.shape[1]
+        oa, da = self.packed()
+        ob, db = y.packed()
+        data = {}
+        for i, a in enumerate(oa):
+            i0, i1 = max(0, -a), min(N, K-a)
+            if i1 <= i0:
+                continue
+            for j, b in enumerate(ob):
+                k = int(a+b)
+                if k <= -N or k >= M:
+                    continue
+                if k not in data:
+                    data[k] = np.zeros(N, dtype=np.result_type(da, db))
+                data[k][i0:i1] += da[i, i0:i1]*db[j, i0+a:i1+a]
+        d = {k: val[max(0, -k):min(N, M-k)] for k, val in data.items()}
+        return SparseMatrix(d, (N, M), self.scale*y.scale)
+
     def __rmul__(self, y):
         """Returns copy of self.__rmul__(y) <==> y*self"""
         return self.__mul__(y)
@@ -637,9 +770,9 @@ class SpectralMatrix(SparseMatrix):
         if assemble == 'exact':
             d = self.assemble(assemble) # Look for implemented exact matrix
             if d is None:
-                d = _get_matrix(test, trial, measure, assemble=assemble)
+                d = assemble_cached(_get_matrix, test, trial, measure, assemble=assemble)
         elif assemble == 'adaptive':
-            d = _get_matrix(test, trial, measure, assemble=assemble)
+            d = assemble_cached(_get_matrix, test, trial, measure, assemble=assemble)
         else:
             if fixed_resolution is not None:
                 kind = 'vandermonde'
@@ -660,13 +793,13 @@ class SpectralMatrix(SparseMatrix):
                             kind = 'vandermonde'
                         elif test[0].short_name() in ('P1', 'P2', 'P3', 'P4'):
                             try:
-                                d = assemble_phi(test, trial, measure)
+                                d = assemble_cached(assemble_phi, test, trial, measure)
                                 _assembly_method += '_phi'
                             except AssertionError:
                                 kind = 'vandermonde'
                         else:
                             if test[0].is_jacobi and sp.sympify(measure).is_polynomial() and not (test[0].is_orthogonal and trial[0].is_orthogonal):
-                                d = assemble_stencil(test, trial, measure)
+                                d = assemble_cached(assemble_stencil, test, trial, measure)
                                 _assembly_method += '_stencil'
                             else:
                                 kind = 'vandermonde'
@@ -679,13 +812,13 @@ class SpectralMatrix(SparseMatrix):
                 elif kind == 'stencil':
                     assert sp.sympify(measure).is_polynomial(), 'Cannot use `stencil` with non-polynomial coefficients'
                     if test[0].short_name() in ('P1', 'P2', 'P3', 'P4'):
-                        d = assemble_phi(test, trial, measure)
+                        d = assemble_cached(assemble_phi, test, trial, measure)
                         _assembly_method += '_phi'
                     else:
-                        d = assemble_stencil(test, trial, measure)
+                        d = assemble_cached(assemble_stencil, test, trial, measure)
                         _assembly_method += '_stencil'
                 elif kind == 'vandermonde':
-                    d = _get_matrix(test, trial, measure, assemble='quadrature', fixed_resolution=fixed_resolution)
+                    d = assemble_cached(_get_matrix, test, trial, measure, assemble='quadrature', fixed_resolution=fixed_resolution)
                     _assembly_method += '_vandermonde'
         if test[0].domain_factor() != 1:
             scale *= float(test[0].domain_factor())**(test[1]+trial[1]-1)
@@ -787,13 +920,7 @@ class SpectralMatrix(SparseMatrix):
             return False
         if self.get_key() != a.get_key():
             return False
-        d0 = self.diags('csr', False).data
-        a0 = a.diags('csr', False).data
-        if d0.shape[0] != a0.shape[0]:
-            return False
-        if not np.linalg.norm(d0-a0) < 1e-8:
-            return False
-        return True
+        return self.packed_allclose(a)
 
     def is_bc_matrix(self):
         return self.trialfunction[0].boundary_condition() == 'Apply'
@@ -2251,6 +2378,74 @@ def sympy2SparseMatrix(sympymat, shape):
     return SparseMatrix(d, shape)
 
 
+_matrix_cache = {}
+
+
+def get_matrix_cache():
+    """Return on-disk cache of assembled matrices, or None if disabled
+
+    The cache is configured through ``config['matrix']['cache']``.
+    """
+    conf = config['matrix']['cache']
+    if not conf['enabled']:
+        return None
+    key = (conf['path'], conf['maxbytes'], conf['maxitems'])
+    if key not in _matrix_cache:
+        _matrix_cache[key] = DiskCache(*key)
+    return _matrix_cache[key]
+
+
+def _space_signature(space):
+    """Return tuple of all the parameters of a 1D space that determine
+    its inner product matrices"""
+    cls = space.__class__
+    sig = (cls.__module__+'.'+cls.__qualname__, space.family(), space.N,
+           space.dim(), space.quad, str(space.domain))
+    for key in ('alpha', 'beta', '_scaled', 'bcs'):
+        if hasattr(space, key):
+            sig += ((key, str(object.__getattribute__(space, key))),)
+    return sig
+
+
+def assemble_cached(fun, test, trial, measure=1, **kw):
+    """Return diagonals computed by ``fun(test, trial, measure, **kw)``
+
+    The diagonals are looked up in the on-disk cache (see
+    :func:`get_matrix_cache`) before anything is computed, and stored there
+    after the computation if missing. Without a cache this is just a call
+    to `fun`.
+
+    Parameters
+    ----------
+    fun : Callable
+        Function used for assembling a :class:`.SpectralMatrix`, like
+        :func:`assemble_stencil`
+    test : 2-tuple of (basis, int)
+    trial : 2-tuple of (basis, int)
+    measure : Number or Sympy expression, optional
+    kw : Keyword arguments, optional
+        Passed on to `fun`
+    """
+    cache = get_matrix_cache()
+    if cache is None:
+        return fun(test, trial, measure, **kw)
+    from shenfun import __version__
+    key = (__version__, fun.__name__, _space_signature(test[0]), test[1],
+           _space_signature(trial[0]), trial[1], sp.srepr(sp.sympify(measure)),
+           tuple(sorted(kw.items())))
+    try:
+        data = cache[key]
+        return {int(k[1:]): v.item() if v.ndim == 0 else v for k, v in data.items()}
+    except KeyError:
+        pass
+    d = fun(test, trial, measure, **kw)
+    if not isinstance(d, SparseMatrix):
+        d = {k: v(k) if hasattr(v, '__call__') else v for k, v in d.items()}
+    d = dict(d.items())
+    cache[key] = {'d%d'%k: np.asarray(v) for k, v in d.items()}
+    return d
+
+
 class SpectralMatDict(dict):
     """Dictionary for inner product matrices
 
@@ -11,8 +11,10 @@ ctypedef fused T:
 
 cpdef np.ndarray chebval(np.ndarray x, np.ndarray c):
     c = np.array(c, ndmin=1, copy=True)
-    if c.dtype.char in '?bBhHiIlLqQpP':
+    if c.dtype.char in '?bBhHiIlLqQpPf':
         c = c.astype(np.double)
+    elif c.dtype.char == 'F':
+        c = c.astype(np.complex128)
     if isinstance(x, (tuple, list)):
         x = np.asarray(x)
     x = x.astype(float)
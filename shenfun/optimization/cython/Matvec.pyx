@@ -8,9 +8,13 @@ from libcpp.vector cimport vector
 from libc.math cimport M_PI, M_PI_2
 np.import_array()
 
+ctypedef float complex float_complex
+
 ctypedef fused T:
     double
     complex
+    float
+    float_complex
 
 ctypedef void (*funv)(T* const, T*, int, int, void* const)
 
@@ -32,6 +36,28 @@ def imult(T[:, :, ::1] array, double scale):
                 array[i, j, k] *= scale
     return array
 
+def dia_matvec(T[:, :, ::1] v, T[:, :, ::1] c, T[:, ::1] data, Py_ssize_t[::1] offsets):
+    cdef:
+        Py_ssize_t i, j, p, q, k, i0, i1
+        Py_ssize_t P = v.shape[0]
+        Py_ssize_t M = v.shape[1]
+        Py_ssize_t Q = v.shape[2]
+        Py_ssize_t N = c.shape[1]
+        T d
+    for p in range(P):
+        for i in range(N):
+            for q in range(Q):
+                c[p, i, q] = 0
+        for j in range(offsets.shape[0]):
+            k = offsets[j]
+            i0 = max(0, -k)
+            i1 = min(N, M-k)
+            for i in range(i0, i1):
+                d = data[j, i]
+                for q in range(Q):
+                    c[p, i, q] += d*v[p, i+k, q]
+    return np.asarray(c)
+
 ctypedef struct CDN:
     double* ld
     double* ud
@@ -60,8 +86,13 @@ cpdef CDN_matvec(np.ndarray v, np.ndarray b, int axis, double[::1] ld, double[::
         np.ndarray[long int, ndim=1] shape = np.array(np.shape(v), dtype=int)
         int N = v.shape[axis]
         int st = v.strides[axis]//v.itemsize
-    if v.dtype.char in 'fdg':
+    dtype = v.dtype.char
+    if dtype == 'd':
         IterAllButAxis[double](CDN_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
+    elif dtype == 'f':
+        IterAllButAxis[float](CDN_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
+    elif dtype == 'F':
+        IterAllButAxis[float_complex](CDN_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
     else:
         IterAllButAxis[complex](CDN_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
     return b
@@ -98,8 +129,13 @@ cpdef BDN_matvec(np.ndarray v, np.ndarray b, int axis, double[::1] ld, double[::
         np.ndarray[long int, ndim=1] shape = np.array(np.shape(v), dtype=int)
         int N = v.shape[axis]
         int st = v.strides[axis]//v.itemsize
-    if v.dtype.char in 'fdg':
+    dtype = v.dtype.char
+    if dtype == 'd':
         IterAllButAxis[double](BDN_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
+    elif dtype == 'f':
+        IterAllButAxis[float](BDN_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
+    elif dtype == 'F':
+        IterAllButAxis[float_complex](BDN_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
     else:
         IterAllButAxis[complex](BDN_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
     return b
@@ -132,8 +168,13 @@ cpdef CDD_matvec(np.ndarray v, np.ndarray b, int axis, double[::1] ld, double[::
         np.ndarray[long int, ndim=1] shape = np.array(np.shape(v), dtype=int)
         int N = v.shape[axis]
         int st = v.strides[axis]//v.itemsize
-    if v.dtype.char in 'fdg':
+    dtype = v.dtype.char
+    if dtype == 'd':
         IterAllButAxis[double](CDD_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
+    elif dtype == 'f':
+        IterAllButAxis[float](CDD_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
+    elif dtype == 'F':
+        IterAllButAxis[float_complex](CDD_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
     else:
         IterAllButAxis[complex](CDD_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
     return b
@@ -182,8 +223,13 @@ cpdef SBB_matvec(np.ndarray v, np.ndarray b, int axis, double[::1] dd):
         np.ndarray[long int, ndim=1] shape = np.array(np.shape(v), dtype=int)
         int N = v.shape[axis]
         int st = v.strides[axis]//v.itemsize
-    if v.dtype.char in 'fdg':
+    dtype = v.dtype.char
+    if dtype == 'd':
         IterAllButAxis[double](SBB_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
+    elif dtype == 'f':
+        IterAllButAxis[float](SBB_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
+    elif dtype == 'F':
+        IterAllButAxis[float_complex](SBB_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
     else:
         IterAllButAxis[complex](SBB_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
     return b
@@ -227,8 +273,13 @@ cpdef ADD_matvec(np.ndarray v, np.ndarray b, int axis, double[::1] dd):
         np.ndarray[long int, ndim=1] shape = np.array(np.shape(v), dtype=int)
         int N = v.shape[axis]
         int st = v.strides[axis]//v.itemsize
-    if v.dtype.char in 'fdg':
+    dtype = v.dtype.char
+    if dtype == 'd':
         IterAllButAxis[double](ADD_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
+    elif dtype == 'f':
+        IterAllButAxis[float](ADD_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
+    elif dtype == 'F':
+        IterAllButAxis[float_complex](ADD_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
     else:
         IterAllButAxis[complex](ADD_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
     return b
@@ -268,8 +319,13 @@ cpdef ATT_matvec(np.ndarray v, np.ndarray b, int axis):
         np.ndarray[long int, ndim=1] shape = np.array(np.shape(v), dtype=int)
         int N = v.shape[axis]
         int st = v.strides[axis]//v.itemsize
-    if v.dtype.char in 'fdg':
+    dtype = v.dtype.char
+    if dtype == 'd':
         IterAllButAxis[double](ATT_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, NULL)
+    elif dtype == 'f':
+        IterAllButAxis[float](ATT_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, NULL)
+    elif dtype == 'F':
+        IterAllButAxis[float_complex](ATT_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, NULL)
     else:
         IterAllButAxis[complex](ATT_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, NULL)
     return b
@@ -309,8 +365,13 @@ cpdef GLL_matvec(np.ndarray v, np.ndarray b, int axis):
         np.ndarray[long int, ndim=1] shape = np.array(np.shape(v), dtype=int)
         int N = v.shape[axis]
         int st = v.strides[axis]//v.itemsize
-    if v.dtype.char in 'fdg':
+    dtype = v.dtype.char
+    if dtype == 'd':
         IterAllButAxis[double](GLL_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, NULL)
+    elif dtype == 'f':
+        IterAllButAxis[float](GLL_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, NULL)
+    elif dtype == 'F':
+        IterAllButAxis[float_complex](GLL_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, NULL)
     else:
         IterAllButAxis[complex](GLL_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, NULL)
     return b
@@ -342,8 +403,13 @@ cpdef CLL_matvec(np.ndarray v, np.ndarray b, int axis):
         np.ndarray[long int, ndim=1] shape = np.array(np.shape(v), dtype=int)
         int N = v.shape[axis]
         int st = v.strides[axis]//v.itemsize
-    if v.dtype.char in 'fdg':
+    dtype = v.dtype.char
+    if dtype == 'd':
         IterAllButAxis[double](CLL_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, NULL)
+    elif dtype == 'f':
+        IterAllButAxis[float](CLL_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, NULL)
+    elif dtype == 'F':
+        IterAllButAxis[float_complex](CLL_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, NULL)
     else:
         IterAllButAxis[complex](CLL_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, NULL)
     return b
@@ -383,8 +449,13 @@ cpdef CTSD_matvec(np.ndarray v, np.ndarray b, int axis):
         np.ndarray[long int, ndim=1] shape = np.array(np.shape(v), dtype=int)
         int N = v.shape[axis]
         int st = v.strides[axis]//v.itemsize
-    if v.dtype.char in 'fdg':
+    dtype = v.dtype.char
+    if dtype == 'd':
         IterAllButAxis[double](CTSD_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, NULL)
+    elif dtype == 'f':
+        IterAllButAxis[float](CTSD_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, NULL)
+    elif dtype == 'F':
+        IterAllButAxis[float_complex](CTSD_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, NULL)
     else:
         IterAllButAxis[complex](CTSD_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, NULL)
     return b
@@ -415,8 +486,13 @@ cpdef CTT_matvec(np.ndarray v, np.ndarray b, int axis):
         np.ndarray[long int, ndim=1] shape = np.array(np.shape(v), dtype=int)
         int N = v.shape[axis]
         int st = v.strides[axis]//v.itemsize
-    if v.dtype.char in 'fdg':
+    dtype = v.dtype.char
+    if dtype == 'd':
         IterAllButAxis[double](CTT_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, NULL)
+    elif dtype == 'f':
+        IterAllButAxis[float](CTT_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, NULL)
+    elif dtype == 'F':
+        IterAllButAxis[float_complex](CTT_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, NULL)
     else:
         IterAllButAxis[complex](CTT_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, NULL)
     return b
@@ -455,8 +531,13 @@ cpdef Tridiagonal_matvec(np.ndarray v, np.ndarray b, int axis, double[::1] ld, d
         np.ndarray[long int, ndim=1] shape = np.array(np.shape(v), dtype=int)
         int N = v.shape[axis]
         int st = v.strides[axis]//v.itemsize
-    if v.dtype.char in 'fdg':
+    dtype = v.dtype.char
+    if dtype == 'd':
         IterAllButAxis[double](Tridiagonal_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
+    elif dtype == 'f':
+        IterAllButAxis[float](Tridiagonal_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
+    elif dtype == 'F':
+        IterAllButAxis[float_complex](Tridiagonal_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
     else:
         IterAllButAxis[complex](Tridiagonal_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
     return b
@@ -505,8 +586,13 @@ cpdef Pentadiagonal_matvec(np.ndarray v, np.ndarray b, int axis, double[::1] ldd
         np.ndarray[long int, ndim=1] shape = np.array(np.shape(v), dtype=int)
         int N = v.shape[axis]
         int st = v.strides[axis]//v.itemsize
-    if v.dtype.char in 'fdg':
+    dtype = v.dtype.char
+    if dtype == 'd':
         IterAllButAxis[double](Pentadiagonal_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
+    elif dtype == 'f':
+        IterAllButAxis[float](Pentadiagonal_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
+    elif dtype == 'F':
+        IterAllButAxis[float_complex](Pentadiagonal_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
     else:
         IterAllButAxis[complex](Pentadiagonal_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
     return b
@@ -542,8 +628,13 @@ cpdef CBD_matvec(np.ndarray v, np.ndarray b, int axis, double[::1] ld, double[::
         np.ndarray[long int, ndim=1] shape = np.array(np.shape(v), dtype=int)
         int N = v.shape[axis]
         int st = v.strides[axis]/v.itemsize
-    if v.dtype.char in 'fdg':
+    dtype = v.dtype.char
+    if dtype == 'd':
         IterAllButAxis[double](CBD_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
+    elif dtype == 'f':
+        IterAllButAxis[float](CBD_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
+    elif dtype == 'F':
+        IterAllButAxis[float_complex](CBD_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
     else:
         IterAllButAxis[complex](CBD_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
     return b
@@ -582,8 +673,13 @@ cpdef CDB_matvec(np.ndarray v, np.ndarray b, int axis, double[::1] lld, double[:
         np.ndarray[long int, ndim=1] shape = np.array(np.shape(v), dtype=int)
         int N = v.shape[axis]
         int st = v.strides[axis]//v.itemsize
-    if v.dtype.char in 'fdg':
+    dtype = v.dtype.char
+    if dtype == 'd':
         IterAllButAxis[double](CDB_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
+    elif dtype == 'f':
+        IterAllButAxis[float](CDB_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
+    elif dtype == 'F':
+        IterAllButAxis[float_complex](CDB_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
     else:
         IterAllButAxis[complex](CDB_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
     return b
@@ -622,8 +718,13 @@ cpdef BBD_matvec(np.ndarray v, np.ndarray b, int axis, double ld, double[::1] dd
         np.ndarray[long int, ndim=1] shape = np.array(np.shape(v), dtype=int)
         int N = v.shape[axis]
         int st = v.strides[axis]//v.itemsize
-    if v.dtype.char in 'fdg':
+    dtype = v.dtype.char
+    if dtype == 'd':
         IterAllButAxis[double](BBD_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
+    elif dtype == 'f':
+        IterAllButAxis[float](BBD_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
+    elif dtype == 'F':
+        IterAllButAxis[float_complex](BBD_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
     else:
         IterAllButAxis[complex](BBD_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), st, N, axis, shape, shape, &c0)
     return b
@@ -704,8 +805,13 @@ cpdef Helmholtz_matvec(np.ndarray v, np.ndarray b, np.ndarray alfa, np.ndarray b
         np.ndarray[long int, ndim=1] ashape = np.array(np.shape(alfa), dtype=int)
         int N = v.shape[axis]
         int st = v.strides[axis]/v.itemsize
-    if v.dtype.char in 'fdg':
+    dtype = v.dtype.char
+    if dtype == 'd':
         ABIterAllButAxis[double](Helmholtz_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), np.PyArray_Ravel(alfa, np.NPY_CORDER), np.PyArray_Ravel(beta, np.NPY_CORDER), st, N, axis, shape, ashape, &c0)
+    elif dtype == 'f':
+        ABIterAllButAxis[float](Helmholtz_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), np.PyArray_Ravel(alfa, np.NPY_CORDER), np.PyArray_Ravel(beta, np.NPY_CORDER), st, N, axis, shape, ashape, &c0)
+    elif dtype == 'F':
+        ABIterAllButAxis[float_complex](Helmholtz_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), np.PyArray_Ravel(alfa, np.NPY_CORDER), np.PyArray_Ravel(beta, np.NPY_CORDER), st, N, axis, shape, ashape, &c0)
     else:
         ABIterAllButAxis[complex](Helmholtz_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), np.PyArray_Ravel(alfa, np.NPY_CORDER), np.PyArray_Ravel(beta, np.NPY_CORDER), st, N, axis, shape, ashape, &c0)
     return b
@@ -793,8 +899,13 @@ cpdef Helmholtz_Neumann_matvec(np.ndarray v, np.ndarray b, np.ndarray alfa, np.n
     bl[:] = B[-2]*j2[:-2]
     c0 = HN(&dd[0], &ud[0], &bl[0], &bd[0], &bu[0], A[0].shape[0])
 
-    if v.dtype.char in 'fdg':
+    dtype = v.dtype.char
+    if dtype == 'd':
         ABIterAllButAxis[double](Helmholtz_Neumann_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), np.PyArray_Ravel(alfa, np.NPY_CORDER), np.PyArray_Ravel(beta, np.NPY_CORDER), st, N, axis, shape, ashape, &c0)
+    elif dtype == 'f':
+        ABIterAllButAxis[float](Helmholtz_Neumann_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), np.PyArray_Ravel(alfa, np.NPY_CORDER), np.PyArray_Ravel(beta, np.NPY_CORDER), st, N, axis, shape, ashape, &c0)
+    elif dtype == 'F':
+        ABIterAllButAxis[float_complex](Helmholtz_Neumann_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), np.PyArray_Ravel(alfa, np.NPY_CORDER), np.PyArray_Ravel(beta, np.NPY_CORDER), st, N, axis, shape, ashape, &c0)
     else:
         ABIterAllButAxis[complex](Helmholtz_Neumann_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), np.PyArray_Ravel(alfa, np.NPY_CORDER), np.PyArray_Ravel(beta, np.NPY_CORDER), st, N, axis, shape, ashape, &c0)
     return b
@@ -915,8 +1026,13 @@ cpdef Biharmonic_matvec(np.ndarray v, np.ndarray b, double a0, np.ndarray alfa,
         np.ndarray[long int, ndim=1] ashape = np.array(np.shape(alfa), dtype=int)
         int N = v.shape[axis]
         int st = v.strides[axis]/v.itemsize
-    if v.dtype.char in 'fdg':
+    dtype = v.dtype.char
+    if dtype == 'd':
         ABIterAllButAxis[double](Biharmonic_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), np.PyArray_Ravel(alfa, np.NPY_CORDER), np.PyArray_Ravel(beta, np.NPY_CORDER), st, N, axis, shape, ashape, &c0)
+    elif dtype == 'f':
+        ABIterAllButAxis[float](Biharmonic_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), np.PyArray_Ravel(alfa, np.NPY_CORDER), np.PyArray_Ravel(beta, np.NPY_CORDER), st, N, axis, shape, ashape, &c0)
+    elif dtype == 'F':
+        ABIterAllButAxis[float_complex](Biharmonic_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), np.PyArray_Ravel(alfa, np.NPY_CORDER), np.PyArray_Ravel(beta, np.NPY_CORDER), st, N, axis, shape, ashape, &c0)
     else:
         ABIterAllButAxis[complex](Biharmonic_matvec_ptr, np.PyArray_Ravel(v, np.NPY_CORDER), np.PyArray_Ravel(b, np.NPY_CORDER), np.PyArray_Ravel(alfa, np.NPY_CORDER), np.PyArray_Ravel(beta, np.NPY_CORDER), st, N, axis, shape, ashape, &c0)
     return b
@@ -7,10 +7,12 @@ from .la import TDMA_LU, TDMA_Solve, PDMA_LU, PDMA_Solve, \
     ThreeDMA_inner_solve, HeptaDMA_inner_solve, HeptaDMA_Solve, HeptaDMA_LU, \
     SolverGeneric1ND_solve_data
 
-from .Matvec import Helmholtz_matvec, Helmholtz_Neumann_matvec, Biharmonic_matvec
+from .Matvec import Helmholtz_matvec, Helmholtz_Neumann_matvec, Biharmonic_matvec, dia_matvec
 from .outer import outer2D, outer3D
 from .applymask import apply_mask
 from .Cheb import chebval
+from .diff import diff_recursion
+from .nufft import nufft_interp
 from .transforms import evaluate_expansion_all, scalar_product, leg2cheb, cheb2leg, \
     restricted_product, FMMcheb, FMMdirect1, FMMdirect2, FMMdirect3, FMMdirect4, \
     _leg2cheb, _cheb2leg, FMMcheb, Lambda
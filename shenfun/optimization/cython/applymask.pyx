@@ -9,6 +9,8 @@ cimport numpy as np
 ctypedef fused T:
     np.float64_t
     np.complex128_t
+    np.float32_t
+    np.complex64_t
 
 ctypedef np.int64_t int_t
 
@@ -9,6 +9,8 @@ cimport numpy as np
 ctypedef fused T:
     np.float64_t
     np.complex128_t
+    np.float32_t
+    np.complex64_t
 
 def cross2D(T[:, ::1] c, T[:, :, ::1] a, T[:, :, ::1] b):
     cdef:
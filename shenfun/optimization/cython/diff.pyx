@@ -0,0 +1,30 @@
+#cython: boundscheck=False
+#cython: wraparound=False
+#cython: language_level=3
+
+import numpy as np
+cimport cython
+cimport numpy as np
+
+ctypedef fused T:
+    np.float64_t
+    np.complex128_t
+    np.float32_t
+    np.complex64_t
+
+def diff_recursion(T[:, :, ::1] a, T[:, :, ::1] b, double[::1] s):
+    cdef:
+        Py_ssize_t i, n, k
+        Py_ssize_t P = a.shape[0]
+        Py_ssize_t N = a.shape[1]
+        Py_ssize_t Q = a.shape[2]
+    for i in range(P):
+        for k in range(Q):
+            b[i, N-1, k] = 0
+        if N > 1:
+            for k in range(Q):
+                b[i, N-2, k] = s[N-1]*a[i, N-1, k]
+        for n in range(N-3, -1, -1):
+            for k in range(Q):
+                b[i, n, k] = b[i, n+2, k] + s[n+1]*a[i, n+1, k]
+    return np.asarray(b)
@@ -14,6 +14,16 @@ ctypedef fused T:
     real_t
     complex_t
 
+# Expansion coefficients may also be in single precision. The sums are
+# always computed in double precision.
+ctypedef fused ucomplex_t:
+    np.complex128_t
+    np.complex64_t
+
+ctypedef fused ureal_t:
+    np.float64_t
+    np.float32_t
+
 cdef extern from "complex.h" nogil:
     double complex exp(double complex)
 
@@ -50,7 +60,7 @@ def evaluate_2D(b, u, list P, int r2c, int M, int start):
     return b
 
 def _evaluate_2D_cc0(np.ndarray[complex_t, ndim=1] b,
-                     np.ndarray[complex_t, ndim=2] u,
+                     np.ndarray[ucomplex_t, ndim=2] u,
                      np.ndarray[complex_t, ndim=2] P0,
                      np.ndarray[complex_t, ndim=2] P1,
                      int r2c, int M, int start):
@@ -66,7 +76,7 @@ def _evaluate_2D_cc0(np.ndarray[complex_t, ndim=1] b,
     return b
 
 def _evaluate_2D_cc1(np.ndarray[real_t, ndim=1] b,
-                     np.ndarray[complex_t, ndim=2] u,
+                     np.ndarray[ucomplex_t, ndim=2] u,
                      np.ndarray[complex_t, ndim=2] P0,
                      np.ndarray[complex_t, ndim=2] P1,
                      int r2c, int M, int start):
@@ -82,13 +92,13 @@ def _evaluate_2D_cc1(np.ndarray[real_t, ndim=1] b,
                     ii = k + start
                 else:
                     ii = l + start
-                if ii > 0 & ii < M:
+                if ii > 0 and ii < M:
                     b[i] += p
 
     return b
 
 def _evaluate_2D_rc0(np.ndarray[complex_t, ndim=1] b,
-                     np.ndarray[complex_t, ndim=2] u,
+                     np.ndarray[ucomplex_t, ndim=2] u,
                      np.ndarray[real_t, ndim=2] P0,
                      np.ndarray[complex_t, ndim=2] P1,
                      int r2c, int M, int start):
@@ -103,7 +113,7 @@ def _evaluate_2D_rc0(np.ndarray[complex_t, ndim=1] b,
 
 
 def _evaluate_2D_rc1(np.ndarray[real_t, ndim=1] b,
-                     np.ndarray[complex_t, ndim=2] u,
+                     np.ndarray[ucomplex_t, ndim=2] u,
                      np.ndarray[real_t, ndim=2] P0,
                      np.ndarray[complex_t, ndim=2] P1,
                      int r2c, int M, int start):
@@ -120,12 +130,12 @@ def _evaluate_2D_rc1(np.ndarray[real_t, ndim=1] b,
                     ii = k + start
                 else:
                     ii = l + start
-                if ii > 0 & ii < M:
+                if ii > 0 and ii < M:
                     b[i] += p
     return b
 
 def _evaluate_2D_cr0(np.ndarray[complex_t, ndim=1] b,
-                     np.ndarray[complex_t, ndim=2] u,
+                     np.ndarray[ucomplex_t, ndim=2] u,
                      np.ndarray[complex_t, ndim=2] P0,
                      np.ndarray[real_t, ndim=2] P1,
                      int r2c, int M, int start):
@@ -139,7 +149,7 @@ def _evaluate_2D_cr0(np.ndarray[complex_t, ndim=1] b,
     return b
 
 def _evaluate_2D_cr1(np.ndarray[real_t, ndim=1] b,
-                     np.ndarray[complex_t, ndim=2] u,
+                     np.ndarray[ucomplex_t, ndim=2] u,
                      np.ndarray[complex_t, ndim=2] P0,
                      np.ndarray[real_t, ndim=2] P1,
                      int r2c, int M, int start):
@@ -156,13 +166,13 @@ def _evaluate_2D_cr1(np.ndarray[real_t, ndim=1] b,
                     ii = k + start
                 else:
                     ii = l + start
-                if ii > 0 & ii < M:
+                if ii > 0 and ii < M:
                     b[i] += p
 
     return b
 
 def _evaluate_2D_rr0(np.ndarray[real_t, ndim=1] b,
-                     np.ndarray[real_t, ndim=2] u,
+                     np.ndarray[ureal_t, ndim=2] u,
                      np.ndarray[real_t, ndim=2] P0,
                      np.ndarray[real_t, ndim=2] P1):
     cdef int k, l, i
@@ -218,7 +228,7 @@ def evaluate_3D(b, u, list P, int r2c, int M, int start):
     return b
 
 def _evaluate_3D_ccc0(np.ndarray[complex_t, ndim=1] b,
-                      np.ndarray[complex_t, ndim=3] u,
+                      np.ndarray[ucomplex_t, ndim=3] u,
                       np.ndarray[complex_t, ndim=2] P0,
                       np.ndarray[complex_t, ndim=2] P1,
                       np.ndarray[complex_t, ndim=2] P2,
@@ -250,7 +260,7 @@ def _evaluate_3D_ccc0(np.ndarray[complex_t, ndim=1] b,
     return b
 
 def _evaluate_3D_ccc1(np.ndarray[real_t, ndim=1] b,
-                      np.ndarray[complex_t, ndim=3] u,
+                      np.ndarray[ucomplex_t, ndim=3] u,
                       np.ndarray[complex_t, ndim=2] P0,
                       np.ndarray[complex_t, ndim=2] P1,
                       np.ndarray[complex_t, ndim=2] P2,
@@ -276,13 +286,13 @@ def _evaluate_3D_ccc1(np.ndarray[real_t, ndim=1] b,
                     b[i] += p
                     if r2c == 2:
                         ii = m + start
-                    if ii > 0 & ii < M:
+                    if ii > 0 and ii < M:
                         b[i] += p
 
     return b
 
 def _evaluate_3D_rcc0(np.ndarray[complex_t, ndim=1] b,
-                      np.ndarray[complex_t, ndim=3] u,
+                      np.ndarray[ucomplex_t, ndim=3] u,
                       np.ndarray[real_t, ndim=2] P0,
                       np.ndarray[complex_t, ndim=2] P1,
                       np.ndarray[complex_t, ndim=2] P2,
@@ -318,7 +328,7 @@ def _evaluate_3D_rcc0(np.ndarray[complex_t, ndim=1] b,
     return b
 
 def _evaluate_3D_rcc1(np.ndarray[real_t, ndim=1] b,
-                      np.ndarray[complex_t, ndim=3] u,
+                      np.ndarray[ucomplex_t, ndim=3] u,
                       np.ndarray[real_t, ndim=2] P0,
                       np.ndarray[complex_t, ndim=2] P1,
                       np.ndarray[complex_t, ndim=2] P2,
@@ -341,12 +351,12 @@ def _evaluate_3D_rcc1(np.ndarray[real_t, ndim=1] b,
                         ii = l + start
                     else:
                         ii = m + start
-                    if ii > 0 & ii < M:
+                    if ii > 0 and ii < M:
                         b[i] += p
     return b
 
 def _evaluate_3D_crc0(np.ndarray[complex_t, ndim=1] b,
-                      np.ndarray[complex_t, ndim=3] u,
+                      np.ndarray[ucomplex_t, ndim=3] u,
                       np.ndarray[complex_t, ndim=2] P0,
                       np.ndarray[real_t, ndim=2] P1,
                       np.ndarray[complex_t, ndim=2] P2,
@@ -364,7 +374,7 @@ def _evaluate_3D_crc0(np.ndarray[complex_t, ndim=1] b,
     return b
 
 def _evaluate_3D_crc1(np.ndarray[real_t, ndim=1] b,
-                      np.ndarray[complex_t, ndim=3] u,
+                      np.ndarray[ucomplex_t, ndim=3] u,
                       np.ndarray[complex_t, ndim=2] P0,
                       np.ndarray[real_t, ndim=2] P1,
                       np.ndarray[complex_t, ndim=2] P2,
@@ -387,11 +397,11 @@ def _evaluate_3D_crc1(np.ndarray[real_t, ndim=1] b,
                         ii = k + start
                     else:
                         ii = m + start
-                    if ii > 0 & ii < M:
+                    if ii > 0 and ii < M:
                         b[i] += p
     return b
 
-def _evaluate_3D_ccr0(np.ndarray[complex_t, ndim=1] b, np.ndarray[complex_t, ndim=3] u,
+def _evaluate_3D_ccr0(np.ndarray[complex_t, ndim=1] b, np.ndarray[ucomplex_t, ndim=3] u,
                       np.ndarray[complex_t, ndim=2] P0,
                       np.ndarray[complex_t, ndim=2] P1,
                       np.ndarray[real_t, ndim=2] P2,
@@ -408,7 +418,7 @@ def _evaluate_3D_ccr0(np.ndarray[complex_t, ndim=1] b, np.ndarray[complex_t, ndi
     return b
 
 def _evaluate_3D_ccr1(np.ndarray[real_t, ndim=1] b,
-                      np.ndarray[complex_t, ndim=3] u,
+                      np.ndarray[ucomplex_t, ndim=3] u,
                       np.ndarray[complex_t, ndim=2] P0,
                       np.ndarray[complex_t, ndim=2] P1,
                       np.ndarray[real_t, ndim=2] P2,
@@ -431,12 +441,12 @@ def _evaluate_3D_ccr1(np.ndarray[real_t, ndim=1] b,
                         ii = k + start
                     else:
                         ii = l + start
-                    if ii > 0 & ii < M:
+                    if ii > 0 and ii < M:
                         b[i] += p
     return b
 
 def _evaluate_3D_rrc1(np.ndarray[real_t, ndim=1] b,
-                      np.ndarray[complex_t, ndim=3] u,
+                      np.ndarray[ucomplex_t, ndim=3] u,
                       np.ndarray[real_t, ndim=2] P0,
                       np.ndarray[real_t, ndim=2] P1,
                       np.ndarray[complex_t, ndim=2] P2,
@@ -456,12 +466,12 @@ def _evaluate_3D_rrc1(np.ndarray[real_t, ndim=1] b,
                     #p = P0[i, k]*P1[i, l]*(u[k, l, m].real*p0.real - u[k, l, m].imag*p0.imag)
                     b[i] += p
                     ii = m + start
-                    if ii > 0 & ii < M:
+                    if ii > 0 and ii < M:
                         b[i] += p
     return b
 
 def _evaluate_3D_rcr1(np.ndarray[real_t, ndim=1] b,
-                      np.ndarray[complex_t, ndim=3] u,
+                      np.ndarray[ucomplex_t, ndim=3] u,
                       np.ndarray[real_t, ndim=2] P0,
                       np.ndarray[complex_t, ndim=2] P1,
                       np.ndarray[real_t, ndim=2] P2,
@@ -481,12 +491,12 @@ def _evaluate_3D_rcr1(np.ndarray[real_t, ndim=1] b,
                     #p = P0[i, k]*P1[i, l]*(u[k, l, m].real*p0.real - u[k, l, m].imag*p0.imag)
                     b[i] += p
                     ii = l + start
-                    if ii > 0 & ii < M:
+                    if ii > 0 and ii < M:
                         b[i] += p
     return b
 
 def _evaluate_3D_crr1(np.ndarray[real_t, ndim=1] b,
-                      np.ndarray[complex_t, ndim=3] u,
+                      np.ndarray[ucomplex_t, ndim=3] u,
                       np.ndarray[complex_t, ndim=2] P0,
                       np.ndarray[real_t, ndim=2] P1,
                       np.ndarray[real_t, ndim=2] P2,
@@ -506,12 +516,12 @@ def _evaluate_3D_crr1(np.ndarray[real_t, ndim=1] b,
                     #p = P0[i, k]*P1[i, l]*(u[k, l, m].real*p0.real - u[k, l, m].imag*p0.imag)
                     b[i] += p
                     ii = k + start
-                    if ii > 0 & ii < M:
+                    if ii > 0 and ii < M:
                         b[i] += p
     return b
 
 def _evaluate_3D_rrr(np.ndarray[real_t, ndim=1] b,
-                      np.ndarray[real_t, ndim=3] u,
+                      np.ndarray[ureal_t, ndim=3] u,
                       np.ndarray[real_t, ndim=2] P0,
                       np.ndarray[real_t, ndim=2] P1,
                       np.ndarray[real_t, ndim=2] P2):
@@ -552,7 +562,7 @@ def evaluate_lm_2D(list bases, b, u, x0, x1, w0, w1, int r2c, int M, int start):
     return b
 
 def _evaluate_lm_2D_cc0(np.ndarray[complex_t, ndim=1] b,
-                        np.ndarray[complex_t, ndim=2] u,
+                        np.ndarray[ucomplex_t, ndim=2] u,
                         np.ndarray[real_t, ndim=1] x0,
                         np.ndarray[real_t, ndim=1] x1,
                         np.ndarray[real_t, ndim=1] w0,
@@ -576,7 +586,7 @@ def _evaluate_lm_2D_cc0(np.ndarray[complex_t, ndim=1] b,
     return b
 
 def _evaluate_lm_2D_cc1(np.ndarray[real_t, ndim=1] b,
-                        np.ndarray[complex_t, ndim=2] u,
+                        np.ndarray[ucomplex_t, ndim=2] u,
                         np.ndarray[real_t, ndim=1] x0,
                         np.ndarray[real_t, ndim=1] x1,
                         np.ndarray[real_t, ndim=1] w0,
@@ -600,12 +610,12 @@ def _evaluate_lm_2D_cc1(np.ndarray[real_t, ndim=1] b,
                     ii = k + start
                 elif r2c == 1:
                     ii = l + start
-                if ii > 0 & ii < M:
+                if ii > 0 and ii < M:
                     b[i] += p
     return b
 
 def _evaluate_lm_2D_rc0(np.ndarray[complex_t, ndim=1] b,
-                        np.ndarray[complex_t, ndim=2] u,
+                        np.ndarray[ucomplex_t, ndim=2] u,
                         np.ndarray[real_t, ndim=1] x0,
                         np.ndarray[real_t, ndim=1] x1,
                         np.ndarray[real_t, ndim=1] w0,
@@ -633,7 +643,7 @@ def _evaluate_lm_2D_rc0(np.ndarray[complex_t, ndim=1] b,
 
 
 def _evaluate_lm_2D_rc1(np.ndarray[real_t, ndim=1] b,
-                        np.ndarray[complex_t, ndim=2] u,
+                        np.ndarray[ucomplex_t, ndim=2] u,
                         np.ndarray[real_t, ndim=1] x0,
                         np.ndarray[real_t, ndim=1] x1,
                         np.ndarray[real_t, ndim=1] w0,
@@ -659,12 +669,12 @@ def _evaluate_lm_2D_rc1(np.ndarray[real_t, ndim=1] b,
                     ii = k + start
                 elif r2c == 1:
                     ii = l + start
-                if ii > 0 & ii < M:
+                if ii > 0 and ii < M:
                     b[i] += p
     return b
 
 def _evaluate_lm_2D_cr0(np.ndarray[complex_t, ndim=1] b,
-                        np.ndarray[complex_t, ndim=2] u,
+                        np.ndarray[ucomplex_t, ndim=2] u,
                         np.ndarray[real_t, ndim=1] x0,
                         np.ndarray[real_t, ndim=1] x1,
                         np.ndarray[real_t, ndim=1] w0,
@@ -691,7 +701,7 @@ def _evaluate_lm_2D_cr0(np.ndarray[complex_t, ndim=1] b,
     return b
 
 def _evaluate_lm_2D_cr1(np.ndarray[real_t, ndim=1] b,
-                        np.ndarray[complex_t, ndim=2] u,
+                        np.ndarray[ucomplex_t, ndim=2] u,
                         np.ndarray[real_t, ndim=1] x0,
                         np.ndarray[real_t, ndim=1] x1,
                         np.ndarray[real_t, ndim=1] w0,
@@ -718,7 +728,7 @@ def _evaluate_lm_2D_cr1(np.ndarray[real_t, ndim=1] b,
                     ii = k + start
                 elif r2c == 1:
                     ii = l + start
-                if ii > 0 & ii < M:
+                if ii > 0 and ii < M:
                     b[i] += p
     return b
 
@@ -755,7 +765,7 @@ def evaluate_lm_3D(list bases, b, u, x0, x1, x2, w0, w1, w2, int r2c, int M, int
     return b
 
 def _evaluate_lm_3D_ccc0(complex_t[::1] b,
-                         complex_t[:, :, ::1] u,
+                         ucomplex_t[:, :, ::1] u,
                          real_t[::1] x0,
                          real_t[::1] x1,
                          real_t[::1] x2,
@@ -786,7 +796,7 @@ def _evaluate_lm_3D_ccc0(complex_t[::1] b,
     return b
 
 def _evaluate_lm_3D_ccc1(np.ndarray[real_t, ndim=1] b,
-                         np.ndarray[complex_t, ndim=3] u,
+                         np.ndarray[ucomplex_t, ndim=3] u,
                          np.ndarray[real_t, ndim=1] x0,
                          np.ndarray[real_t, ndim=1] x1,
                          np.ndarray[real_t, ndim=1] x2,
@@ -816,12 +826,12 @@ def _evaluate_lm_3D_ccc1(np.ndarray[real_t, ndim=1] b,
                         ii = l + start
                     elif r2c == 2:
                         ii = m + start
-                    if ii > 0 & ii < M:
+                    if ii > 0 and ii < M:
                         b[i] += p
     return b
 
 def _evaluate_lm_3D_rcc0(np.ndarray[complex_t, ndim=1] b,
-                         np.ndarray[complex_t, ndim=3] u,
+                         np.ndarray[ucomplex_t, ndim=3] u,
                          np.ndarray[real_t, ndim=1] x0,
                          np.ndarray[real_t, ndim=1] x1,
                          np.ndarray[real_t, ndim=1] x2,
@@ -852,7 +862,7 @@ def _evaluate_lm_3D_rcc0(np.ndarray[complex_t, ndim=1] b,
     return b
 
 def _evaluate_lm_3D_rcc1(np.ndarray[real_t, ndim=1] b,
-                         np.ndarray[complex_t, ndim=3] u,
+                         np.ndarray[ucomplex_t, ndim=3] u,
                          np.ndarray[real_t, ndim=1] x0,
                          np.ndarray[real_t, ndim=1] x1,
                          np.ndarray[real_t, ndim=1] x2,
@@ -883,12 +893,12 @@ def _evaluate_lm_3D_rcc1(np.ndarray[real_t, ndim=1] b,
                         ii = l + start
                     elif r2c == 2:
                         ii = m + start
-                    if ii > 0 & ii < M:
+                    if ii > 0 and ii < M:
                         b[i] += p
     return b
 
 def _evaluate_lm_3D_crc0(np.ndarray[complex_t, ndim=1] b,
-                         np.ndarray[complex_t, ndim=3] u,
+                         np.ndarray[ucomplex_t, ndim=3] u,
                          np.ndarray[real_t, ndim=1] x0,
                          np.ndarray[real_t, ndim=1] x1,
                          np.ndarray[real_t, ndim=1] x2,
@@ -918,7 +928,7 @@ def _evaluate_lm_3D_crc0(np.ndarray[complex_t, ndim=1] b,
     return b
 
 def _evaluate_lm_3D_crc1(np.ndarray[real_t, ndim=1] b,
-                         np.ndarray[complex_t, ndim=3] u,
+                         np.ndarray[ucomplex_t, ndim=3] u,
                          np.ndarray[real_t, ndim=1] x0,
                          np.ndarray[real_t, ndim=1] x1,
                          np.ndarray[real_t, ndim=1] x2,
@@ -949,12 +959,12 @@ def _evaluate_lm_3D_crc1(np.ndarray[real_t, ndim=1] b,
                         ii = k + start
                     elif r2c == 2:
                         ii = m + start
-                    if ii > 0 & ii < M:
+                    if ii > 0 and ii < M:
                         b[i] += p
     return b
 
 def _evaluate_lm_3D_ccr0(np.ndarray[complex_t, ndim=1] b,
-                         np.ndarray[complex_t, ndim=3] u,
+                         np.ndarray[ucomplex_t, ndim=3] u,
                          np.ndarray[real_t, ndim=1] x0,
                          np.ndarray[real_t, ndim=1] x1,
                          np.ndarray[real_t, ndim=1] x2,
@@ -985,7 +995,7 @@ def _evaluate_lm_3D_ccr0(np.ndarray[complex_t, ndim=1] b,
     return b
 
 def _evaluate_lm_3D_ccr1(np.ndarray[real_t, ndim=1] b,
-                         np.ndarray[complex_t, ndim=3] u,
+                         np.ndarray[ucomplex_t, ndim=3] u,
                          np.ndarray[real_t, ndim=1] x0,
                          np.ndarray[real_t, ndim=1] x1,
                          np.ndarray[real_t, ndim=1] x2,
@@ -1016,6 +1026,6 @@ def _evaluate_lm_3D_ccr1(np.ndarray[real_t, ndim=1] b,
                         ii = k + start
                     elif r2c == 1:
                         ii = l + start
-                    if ii > 0 & ii < M:
+                    if ii > 0 and ii < M:
                         b[i] += p
     return b
@@ -6,194 +6,116 @@ import numpy as np
 cimport numpy as np
 import cython
 cimport cython
+from cython.parallel cimport prange
 from libcpp.vector cimport vector
 from libcpp.algorithm cimport copy
 from libc.stdlib cimport malloc, free
 from cpython cimport array
 import array
+from shenfun.config import config
 np.import_array()
 
+ctypedef float complex float_complex
+
 ctypedef fused T:
     double
     complex
+    float
+    float_complex
 
 #ctypedef complex complex_t
 #ctypedef double double
 #ctypedef np.int64_t int
 
-ctypedef void (*innerfunc)(complex*, int, double*, int, int)
-ctypedef void (*funcT)(T*, int, double*, int, int)
+ctypedef fused C:
+    complex
+    float_complex
+
+ctypedef void (*funcd)(double*, int, double*, int, int) noexcept nogil
+ctypedef void (*funcf)(float*, int, double*, int, int) noexcept nogil
+ctypedef void (*innerfunc)(complex*, int, double*, int, int) noexcept nogil
+ctypedef void (*innerfuncf)(float_complex*, int, double*, int, int) noexcept nogil
+ctypedef void (*funcC)(C*, int, double*, int, int) noexcept nogil
+ctypedef void (*funcT)(T*, int, double*, int, int) noexcept nogil
+
+def get_threads():
+    """Return number of threads used for the independent 1D systems"""
+    return config['optimization'].get('threads', 1)
 
 # XXX_Solve - Solve multidimensional array u along axis
 
 def ThreeDMA_Solve(u, data, axis):
-    if u.dtype.char in 'FDG':
-        if u.ndim == 1:
-            ThreeDMA_inner_solve[complex](u, data)
-        elif u.ndim == 2:
-            Solve_axis_2D[complex](u, data, ThreeDMA_inner_solve_ptr, axis)
-        elif u.ndim == 3:
-            Solve_axis_3D[complex](u, data, ThreeDMA_inner_solve_ptr, axis)
-    else:
-        if u.ndim == 1:
-            ThreeDMA_inner_solve[double](u, data)
-        elif u.ndim == 2:
-            Solve_axis_2D[double](u, data, ThreeDMA_inner_solve_ptr, axis)
-        elif u.ndim == 3:
-            Solve_axis_3D[double](u, data, ThreeDMA_inner_solve_ptr, axis)
+    Solve_axis(u, data, axis, ThreeDMA_inner_solve_ptr[double], ThreeDMA_inner_solve_ptr[complex],
+               ThreeDMA_inner_solve_ptr[float], ThreeDMA_inner_solve_ptr[float_complex])
 
 def TwoDMA_Solve(u, data, axis):
-    if u.dtype.char in 'FDG':
-        if u.ndim == 1:
-            TwoDMA_inner_solve[complex](u, data)
-        elif u.ndim == 2:
-            Solve_axis_2D[complex](u, data, TwoDMA_inner_solve_ptr, axis)
-        elif u.ndim == 3:
-            Solve_axis_3D[complex](u, data, TwoDMA_inner_solve_ptr, axis)
-    else:
-        if u.ndim == 1:
-            TwoDMA_inner_solve[double](u, data)
-        elif u.ndim == 2:
-            Solve_axis_2D[double](u, data, TwoDMA_inner_solve_ptr, axis)
-        elif u.ndim == 3:
-            Solve_axis_3D[double](u, data, TwoDMA_inner_solve_ptr, axis)
+    Solve_axis(u, data, axis, TwoDMA_inner_solve_ptr[double], TwoDMA_inner_solve_ptr[complex],
+               TwoDMA_inner_solve_ptr[float], TwoDMA_inner_solve_ptr[float_complex])
 
 def PDMA_Solve(u, data, axis):
-    if u.dtype.char in 'FDG':
-        if u.ndim == 1:
-            PDMA_inner_solve[complex](u, data)
-        elif u.ndim == 2:
-            Solve_axis_2D[complex](u, data, PDMA_inner_solve_ptr, axis)
-        elif u.ndim == 3:
-            Solve_axis_3D[complex](u, data, PDMA_inner_solve_ptr, axis)
-    else:
-        if u.ndim == 1:
-            PDMA_inner_solve[double](u, data)
-        elif u.ndim == 2:
-            Solve_axis_2D[double](u, data, PDMA_inner_solve_ptr, axis)
-        elif u.ndim == 3:
-            Solve_axis_3D[double](u, data, PDMA_inner_solve_ptr, axis)
+    Solve_axis(u, data, axis, PDMA_inner_solve_ptr[double], PDMA_inner_solve_ptr[complex],
+               PDMA_inner_solve_ptr[float], PDMA_inner_solve_ptr[float_complex])
 
 def TDMA_Solve(u, data, axis):
-    if u.dtype.char in 'FDG':
-        if u.ndim == 1:
-            TDMA_inner_solve[complex](u, data)
-        elif u.ndim == 2:
-            Solve_axis_2D[complex](u, data, TDMA_inner_solve_ptr, axis)
-        elif u.ndim == 3:
-            Solve_axis_3D[complex](u, data, TDMA_inner_solve_ptr, axis)
-    else:
-        if u.ndim == 1:
-            TDMA_inner_solve[double](u, data)
-        elif u.ndim == 2:
-            Solve_axis_2D[double](u, data, TDMA_inner_solve_ptr, axis)
-        elif u.ndim == 3:
-            Solve_axis_3D[double](u, data, TDMA_inner_solve_ptr, axis)
+    Solve_axis(u, data, axis, TDMA_inner_solve_ptr[double], TDMA_inner_solve_ptr[complex],
+               TDMA_inner_solve_ptr[float], TDMA_inner_solve_ptr[float_complex])
 
 def TDMA_O_Solve(u, data, axis):
-    if u.dtype.char in 'FDG':
-        if u.ndim == 1:
-            TDMA_O_inner_solve[complex](u, data)
-        elif u.ndim == 2:
-            Solve_axis_2D[complex](u, data, TDMA_O_inner_solve_ptr, axis)
-        elif u.ndim == 3:
-            Solve_axis_3D[complex](u, data, TDMA_O_inner_solve_ptr, axis)
-    else:
-        if u.ndim == 1:
-            TDMA_O_inner_solve[double](u, data)
-        elif u.ndim == 2:
-            Solve_axis_2D[double](u, data, TDMA_O_inner_solve_ptr, axis)
-        elif u.ndim == 3:
-            Solve_axis_3D[double](u, data, TDMA_O_inner_solve_ptr, axis)
+    Solve_axis(u, data, axis, TDMA_O_inner_solve_ptr[double], TDMA_O_inner_solve_ptr[complex],
+               TDMA_O_inner_solve_ptr[float], TDMA_O_inner_solve_ptr[float_complex])
 
 cpdef DiagMA_Solve(u, double[:, ::1] data, int axis):
-    cdef:
-        int n = u.ndim
-
-    if u.dtype.char in 'FDG':
-        if n == 1:
-            DiagMA_inner_solve[complex](u, data)
-        elif n == 2:
-            DiagMA_Solve_2D[complex](u, data, axis)
-        elif n == 3:
-            DiagMA_Solve_3D[complex](u, data, axis)
+    Solve_axis(u, data, axis, DiagMA_inner_solve_ptr[double], DiagMA_inner_solve_ptr[complex],
+               DiagMA_inner_solve_ptr[float], DiagMA_inner_solve_ptr[float_complex], True)
+
+def FDMA_Solve(u, data, axis):
+    Solve_axis(u, data, axis, FDMA_inner_solve_ptr[double], FDMA_inner_solve_ptr[complex],
+               FDMA_inner_solve_ptr[float], FDMA_inner_solve_ptr[float_complex])
+
+def HeptaDMA_Solve(u, data, axis):
+    Solve_axis(u, data, axis, HeptaDMA_inner_solve_ptr[double], HeptaDMA_inner_solve_ptr[complex],
+               HeptaDMA_inner_solve_ptr[float], HeptaDMA_inner_solve_ptr[float_complex])
+
+cdef Solve_axis(u, double[:, ::1] data, int axis, funcd fd, innerfunc fz,
+                funcf fs, innerfuncf fc, bint strided=False):
+    """Solve along axis of u with the inner solver for the dtype of u
+
+    All complex arrays except single precision ('F') use the double
+    precision complex solver, like 'D'. If strided is True, then u may be
+    noncontiguous for ndim > 1.
+    """
+    dtype = u.dtype.char
+    if dtype == 'F':
+        Solve_axis_T[float_complex](u, data, axis, fc, strided)
+    elif dtype in 'DG':
+        Solve_axis_T[complex](u, data, axis, fz, strided)
+    elif dtype == 'f':
+        Solve_axis_T[float](u, data, axis, fs, strided)
     else:
-        if n == 1:
-            DiagMA_inner_solve[double](u, data)
-        elif n == 2:
-            DiagMA_Solve_2D[double](u, data, axis)
-        elif n == 3:
-            DiagMA_Solve_3D[double](u, data, axis)
-
-cpdef DiagMA_Solve_2D(np.ndarray[T, ndim=2] u, double[:, ::1] data, int axis):
-    cdef:
-        int st = u.strides[axis]/u.itemsize
-        np.flatiter ita = np.PyArray_IterAllButAxis(u, &axis)
-        int N = u.shape[axis]
-        double* dp = &data[0, 0]
-    while np.PyArray_ITER_NOTDONE(ita):
-        DiagMA_inner_solve_ptr[T](<T*>np.PyArray_ITER_DATA(ita), st, dp, 0, N)
-        np.PyArray_ITER_NEXT(ita)
+        Solve_axis_T[double](u, data, axis, fd, strided)
+
+cdef Solve_axis_T(u, double[:, ::1] data, int axis, funcT sol, bint strided):
+    if u.ndim == 1:
+        Solve_axis_1D[T](u, data, sol)
+    elif strided:
+        Solve_axis_strided[T](u, data, axis, sol)
+    elif u.ndim == 2:
+        Solve_axis_2D[T](u, data, sol, axis, get_threads())
+    elif u.ndim == 3:
+        Solve_axis_3D[T](u, data, sol, axis, get_threads())
+
+cdef void Solve_axis_1D(T[:] u, double[:, ::1] data, funcT sol):
+    sol(&u[0], u.strides[0]/u.itemsize, &data[0, 0], data.shape[0], data.shape[1])
 
-cpdef DiagMA_Solve_3D(np.ndarray[T, ndim=3] u, double[:, ::1] data, int axis):
+cdef Solve_axis_strided(np.ndarray u, double[:, ::1] data, int axis, funcT sol):
     cdef:
         int st = u.strides[axis]/u.itemsize
         np.flatiter ita = np.PyArray_IterAllButAxis(u, &axis)
-        int N = u.shape[axis]
         double* dp = &data[0, 0]
     while np.PyArray_ITER_NOTDONE(ita):
-        DiagMA_inner_solve_ptr[T](<T*>np.PyArray_ITER_DATA(ita), st, dp, 0, N)
+        sol(<T*>np.PyArray_ITER_DATA(ita), st, dp, data.shape[0], data.shape[1])
         np.PyArray_ITER_NEXT(ita)
 
-#def DiagMA_Solve(u, data, int axis):
-#    if u.dtype.char in 'FDG':
-#        if u.ndim == 1:
-#            DiagMA_inner_solve[complex](u, data)
-#        elif u.ndim == 2:
-#            Solve_axis_2D[complex](u, data, DiagMA_inner_solve_ptr, axis)
-#        elif u.ndim == 3:
-#            Solve_axis_3D[complex](u, data, DiagMA_inner_solve_ptr, axis)
-#    else:
-#        if u.ndim == 1:
-#            DiagMA_inner_solve[double](u, data)
-#        elif u.ndim == 2:
-#            Solve_axis_2D[double](u, data, DiagMA_inner_solve_ptr, axis)
-#        elif u.ndim == 3:
-#            Solve_axis_3D[double](u, data, DiagMA_inner_solve_ptr, axis)
-
-
-def FDMA_Solve(u, data, axis):
-    if u.dtype.char in 'FDG':
-        if u.ndim == 1:
-            FDMA_inner_solve[complex](u, data)
-        elif u.ndim == 2:
-            Solve_axis_2D[complex](u, data, FDMA_inner_solve_ptr, axis)
-        elif u.ndim == 3:
-            Solve_axis_3D[complex](u, data, FDMA_inner_solve_ptr, axis)
-    else:
-        if u.ndim == 1:
-            FDMA_inner_solve[double](u, data)
-        elif u.ndim == 2:
-            Solve_axis_2D[double](u, data, FDMA_inner_solve_ptr, axis)
-        elif u.ndim == 3:
-            Solve_axis_3D[double](u, data, FDMA_inner_solve_ptr, axis)
-
-def HeptaDMA_Solve(u, data, axis):
-    if u.dtype.char in 'FDG':
-        if u.ndim == 1:
-            HeptaDMA_inner_solve[complex](u, data)
-        elif u.ndim == 2:
-            Solve_axis_2D[complex](u, data, HeptaDMA_inner_solve_ptr, axis)
-        elif u.ndim == 3:
-            Solve_axis_3D[complex](u, data, HeptaDMA_inner_solve_ptr, axis)
-    else:
-        if u.ndim == 1:
-            HeptaDMA_inner_solve[double](u, data)
-        elif u.ndim == 2:
-            Solve_axis_2D[double](u, data, HeptaDMA_inner_solve_ptr, axis)
-        elif u.ndim == 3:
-            Solve_axis_3D[double](u, data, HeptaDMA_inner_solve_ptr, axis)
-
 # LU - decomposition
 
 def FDMA_LU(double[:, ::1] data):
@@ -324,6 +246,26 @@ cdef innerfunc func_from_name(fun_name) except NULL:
     else:
         return NULL
 
+cdef innerfuncf func_from_name_f(fun_name) except NULL:
+    if fun_name == "PDMA_inner_solve":
+        return PDMA_inner_solve_ptr[float_complex]
+    elif fun_name == "TDMA_inner_solve":
+        return TDMA_inner_solve_ptr[float_complex]
+    elif fun_name == "TDMA_O_inner_solve":
+        return TDMA_O_inner_solve_ptr[float_complex]
+    elif fun_name == "FDMA_inner_solve":
+        return FDMA_inner_solve_ptr[float_complex]
+    elif fun_name == "ThreeDMA_inner_solve":
+        return ThreeDMA_inner_solve_ptr[float_complex]
+    elif fun_name == "TwoDMA_inner_solve":
+        return TwoDMA_inner_solve_ptr[float_complex]
+    elif fun_name == "DiagMA_inner_solve":
+        return DiagMA_inner_solve_ptr[float_complex]
+    elif fun_name == "HeptaDMA_inner_solve":
+        return HeptaDMA_inner_solve_ptr[float_complex]
+    else:
+        return NULL
+
 #def SolverGeneric1ND_solve_data2D(complex[:, ::1] u, double[:, :, ::1] data, sol, int naxes, bint is_zero_index):
 #    cdef:
 #        int i
@@ -370,19 +312,29 @@ cdef innerfunc func_from_name(fun_name) except NULL:
 
 def SolverGeneric1ND_solve_data(u, data, sol, naxes, is_zero_index):
     cdef:
-        innerfunc f = func_from_name(sol.__name__)
+        innerfunc f
+        innerfuncf ff
+
+    if u.dtype.char == 'F':
+        ff = func_from_name_f(sol.__name__)
+        if u.ndim == 2:
+            SolverGeneric1ND_solve_2D[float_complex](u, data, ff, naxes, is_zero_index)
+        elif u.ndim == 3:
+            SolverGeneric1ND_solve_3D[float_complex](u, data, ff, naxes, is_zero_index)
+        return u
 
+    f = func_from_name(sol.__name__)
     if u.ndim == 2:
-        SolverGeneric1ND_solve_2D(u, data, f, naxes, is_zero_index)
+        SolverGeneric1ND_solve_2D[complex](u, data, f, naxes, is_zero_index)
     elif u.ndim == 3:
-        SolverGeneric1ND_solve_3D(u, data, f, naxes, is_zero_index)
+        SolverGeneric1ND_solve_3D[complex](u, data, f, naxes, is_zero_index)
     #if u.ndim == 2:
     #    SolverGeneric1ND_solve_data2D(u, data, sol, naxes, is_zero_index)
     #elif u.ndim == 3:
     #    SolverGeneric1ND_solve_data3D(u, data, sol, naxes, is_zero_index)
     return u
 
-cdef void SolverGeneric1ND_solve_3D(complex[:, :, ::1] u, double[:, :, :, ::1] data, innerfunc sol, int naxes, bint is_zero_index):
+cdef void SolverGeneric1ND_solve_3D(C[:, :, ::1] u, double[:, :, :, ::1] data, funcC sol, int naxes, bint is_zero_index):
     cdef:
         int i, j, st
 
@@ -408,7 +360,7 @@ cdef void SolverGeneric1ND_solve_3D(complex[:, :, ::1] u, double[:, :, :, ::1] d
                     continue
                 sol(&u[i, j, 0], st, &data[i, j, 0, 0], data.shape[2], data.shape[3])
 
-cdef void SolverGeneric1ND_solve_2D(complex[:, ::1] u, double[:, :, ::1] data, innerfunc sol, int naxes, bint is_zero_index):
+cdef void SolverGeneric1ND_solve_2D(C[:, ::1] u, double[:, :, ::1] data, funcC sol, int naxes, bint is_zero_index):
     cdef:
         int i, j, st
 
@@ -426,44 +378,45 @@ cdef void SolverGeneric1ND_solve_2D(complex[:, ::1] u, double[:, :, ::1] data, i
             sol(&u[i, 0], st, &data[i, 0, 0], data.shape[1], data.shape[2])
 
 @cython.cdivision(True)
-cdef void Solve_axis_3D(T[:, :, ::1] u, double[:, ::1] data, funcT sol, int naxes):
+cdef void Solve_axis_3D(T[:, :, ::1] u, double[:, ::1] data, funcT sol, int naxes, int threads):
     cdef:
         int i, j, st
 
+    # The independent 1D systems are distributed over threads
     st = u.strides[naxes]/u.itemsize
     if naxes == 0:
-        for i in range(u.shape[1]):
+        for i in prange(u.shape[1], nogil=True, num_threads=threads):
             for j in range(u.shape[2]):
                 sol(&u[0, i, j], st, &data[0, 0], data.shape[0], data.shape[1])
 
     elif naxes == 1:
-        for i in range(u.shape[0]):
+        for i in prange(u.shape[0], nogil=True, num_threads=threads):
             for j in range(u.shape[2]):
                 sol(&u[i, 0, j], st, &data[0, 0], data.shape[0], data.shape[1])
 
     elif naxes == 2:
-        for i in range(u.shape[0]):
+        for i in prange(u.shape[0], nogil=True, num_threads=threads):
             for j in range(u.shape[1]):
                 sol(&u[i, j, 0], st, &data[0, 0], data.shape[0], data.shape[1])
 
 @cython.cdivision(True)
-cdef void Solve_axis_2D(T[:, ::1] u, double[:, ::1] data, funcT sol, int naxes):
+cdef void Solve_axis_2D(T[:, ::1] u, double[:, ::1] data, funcT sol, int naxes, int threads):
     cdef:
         int i, j, st
 
     st = u.strides[naxes]/u.itemsize
     if naxes == 0:
-        for i in range(u.shape[1]):
+        for i in prange(u.shape[1], nogil=True, num_threads=threads):
             sol(&u[0, i], st, &data[0, 0], data.shape[0], data.shape[1])
     elif naxes == 1:
-        for i in range(u.shape[0]):
+        for i in prange(u.shape[0], nogil=True, num_threads=threads):
             sol(&u[i, 0], st, &data[0, 0], data.shape[0], data.shape[1])
 
 cpdef HeptaDMA_inner_solve(T[:] u, double[:, ::1] data):
     HeptaDMA_inner_solve_ptr[T](&u[0], u.strides[0]/u.itemsize, &data[0, 0], data.shape[0], data.shape[1])
 
 @cython.cdivision(True)
-cdef void HeptaDMA_inner_solve_ptr(T* u, int st, double* data, int m0, int m1):
+cdef void HeptaDMA_inner_solve_ptr(T* u, int st, double* data, int m0, int m1) noexcept nogil:
     cdef:
         int n = m1
         int k
@@ -493,7 +446,7 @@ cpdef PDMA_inner_solve(T[:] u, double[:, ::1] data):
     PDMA_inner_solve_ptr[T](&u[0], u.strides[0]/u.itemsize, &data[0, 0], data.shape[0], data.shape[1])
 
 @cython.cdivision(True)
-cdef void PDMA_inner_solve_ptr(T* u, int st, double* data, int m0, int m1):
+cdef void PDMA_inner_solve_ptr(T* u, int st, double* data, int m0, int m1) noexcept nogil:
     cdef:
         int n = m1
         int k
@@ -517,7 +470,7 @@ cpdef TDMA_inner_solve(T[:] u, double[:, ::1] data):
     TDMA_inner_solve_ptr[T](&u[0], u.strides[0]/u.itemsize, &data[0, 0], data.shape[0], data.shape[1])
 
 @cython.cdivision(True)
-cdef void TDMA_inner_solve_ptr(T* u, int st, double* data, int m0, int m1):
+cdef void TDMA_inner_solve_ptr(T* u, int st, double* data, int m0, int m1) noexcept nogil:
     cdef:
         int n = m1
         int i
@@ -535,7 +488,7 @@ cpdef TDMA_O_inner_solve(T[:] u, double[:, ::1] data):
     TDMA_O_inner_solve_ptr[T](&u[0], u.strides[0]/u.itemsize, &data[0, 0], data.shape[0], data.shape[1])
 
 @cython.cdivision(True)
-cdef void TDMA_O_inner_solve_ptr(T* u, int st, double* data, int m0, int m1):
+cdef void TDMA_O_inner_solve_ptr(T* u, int st, double* data, int m0, int m1) noexcept nogil:
     cdef:
         int n = m1
         int i
@@ -552,7 +505,7 @@ cpdef TwoDMA_inner_solve(T[:] u, double[:, ::1] data):
     TwoDMA_inner_solve_ptr[T](&u[0], u.strides[0]/u.itemsize, &data[0, 0], data.shape[0], data.shape[1])
 
 @cython.cdivision(True)
-cdef void TwoDMA_inner_solve_ptr(T* u, int st, double* data, int m0, int m1):
+cdef void TwoDMA_inner_solve_ptr(T* u, int st, double* data, int m0, int m1) noexcept nogil:
     cdef:
         int i, n = m1
         double* d = &data[0]
@@ -566,7 +519,7 @@ cpdef ThreeDMA_inner_solve(T[:] u, double[:, ::1] data):
     ThreeDMA_inner_solve_ptr[T](&u[0], u.strides[0]/u.itemsize, &data[0, 0], data.shape[0], data.shape[1])
 
 @cython.cdivision(True)
-cdef void ThreeDMA_inner_solve_ptr(T* u, int st, double* data, int m0, int m1):
+cdef void ThreeDMA_inner_solve_ptr(T* u, int st, double* data, int m0, int m1) noexcept nogil:
     cdef:
         int i, n = m1
         double* d = &data[0]
@@ -583,7 +536,7 @@ cpdef DiagMA_inner_solve(T[:] u, double[:, ::1] data):
     DiagMA_inner_solve_ptr[T](&u[0], u.strides[0]/u.itemsize, &data[0, 0], data.shape[0], data.shape[1])
 
 @cython.cdivision(True)
-cdef void DiagMA_inner_solve_ptr(T* u, int st, double* data, int m0, int m1):
+cdef void DiagMA_inner_solve_ptr(T* u, int st, double* data, int m0, int m1) noexcept nogil:
     cdef:
         int i
     for i in range(m1):
@@ -593,7 +546,7 @@ cpdef FDMA_inner_solve(T[:] u, double[:, ::1] data):
     FDMA_inner_solve_ptr[T](&u[0], u.strides[0]/u.itemsize, &data[0, 0], data.shape[0], data.shape[1])
 
 @cython.cdivision(True)
-cdef void FDMA_inner_solve_ptr(T* u, int st, double* data, int m0, int m1):
+cdef void FDMA_inner_solve_ptr(T* u, int st, double* data, int m0, int m1) noexcept nogil:
     cdef:
         int i
         int n = m1
@@ -670,11 +623,11 @@ def Poisson_Solve_ADD_3D_ptr(double[::1] d,
                 Poisson_Solve_ADD_1D_ptr(&d[0], &d1[0], scale, &b[i, j, 0], &u[i, j, 0], N, strides)
 
 
-cdef void Poisson_Solve_ADD_1D(double[::1] d,
-                               double[::1] d1,
-                               double scale,
-                               double[::1] b,
-                               double[::1] u):
+def Poisson_Solve_ADD_1D(double[::1] d,
+                         double[::1] d1,
+                         double scale,
+                         T[::1] b,
+                         T[::1] u):
     Poisson_Solve_ADD_1D_ptr(&d[0], &d1[0], scale, &b[0], &u[0], d.shape[0], 1)
 
 cdef void Poisson_Solve_ADD_1D_ptr(double* d,
@@ -0,0 +1,42 @@
+#cython: boundscheck=False
+#cython: wraparound=False
+#cython: language_level=3
+
+import numpy as np
+cimport cython
+cimport numpy as np
+
+def nufft_interp(complex[:, ::1] V, Py_ssize_t[:, :, ::1] idx, double[:, :, ::1] W,
+                 Py_ssize_t[::1] strides, complex[:, ::1] v):
+    cdef:
+        Py_ssize_t j, a, k, flat
+        Py_ssize_t D = idx.shape[0]
+        Py_ssize_t M = idx.shape[1]
+        Py_ssize_t L = idx.shape[2]
+        Py_ssize_t K = V.shape[1]
+        double w
+        Py_ssize_t[::1] l = np.zeros(D, dtype=np.intp)
+    for j in range(M):
+        for k in range(K):
+            v[j, k] = 0
+        for a in range(D):
+            l[a] = 0
+        # Loop over all L**D points of the tensor product stencil
+        while True:
+            flat = 0
+            w = 1
+            for a in range(D):
+                flat += idx[a, j, l[a]]*strides[a]
+                w *= W[a, j, l[a]]
+            for k in range(K):
+                v[j, k] += w*V[flat, k]
+            a = D-1
+            while a >= 0:
+                l[a] += 1
+                if l[a] < L:
+                    break
+                l[a] = 0
+                a -= 1
+            if a < 0:
+                break
+    return np.asarray(v)
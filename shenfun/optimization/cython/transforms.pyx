@@ -13,9 +13,13 @@ import cython
 from scipy.special import gammaln
 np.import_array()
 
+ctypedef float complex float_complex
+
 ctypedef fused T:
     double
     complex
+    float
+    float_complex
 
 ctypedef void (*funv)(T* const, T*, int, int , void* const)
 
@@ -160,6 +164,10 @@ cpdef np.ndarray restricted_product(L, np.ndarray input_array, np.ndarray output
         IterAllButAxis[double](_restricted_product_ptr, np.PyArray_Ravel(input, np.NPY_CORDER), np.PyArray_Ravel(output_array, np.NPY_CORDER), st, N, axis, shapein, shapeout, &r0)
     elif dtype == 'D':
         IterAllButAxis[complex](_restricted_product_ptr, np.PyArray_Ravel(input, np.NPY_CORDER), np.PyArray_Ravel(output_array, np.NPY_CORDER), st, N, axis, shapein, shapeout, &r0)
+    elif dtype == 'f':
+        IterAllButAxis[float](_restricted_product_ptr, np.PyArray_Ravel(input, np.NPY_CORDER), np.PyArray_Ravel(output_array, np.NPY_CORDER), st, N, axis, shapein, shapeout, &r0)
+    elif dtype == 'F':
+        IterAllButAxis[float_complex](_restricted_product_ptr, np.PyArray_Ravel(input, np.NPY_CORDER), np.PyArray_Ravel(output_array, np.NPY_CORDER), st, N, axis, shapein, shapeout, &r0)
     else:
         raise NotImplementedError
     return output_array
@@ -186,6 +194,10 @@ cpdef scalar_product(np.ndarray input_array, np.ndarray output_array, double[::1
         IterAllButAxis[double](_scalar_product_ptr, np.PyArray_Ravel(input_array, np.NPY_CORDER), np.PyArray_Ravel(output_array, np.NPY_CORDER), st, N, axis, shapein, shapeout, &s0)
     elif dtype == 'D':
         IterAllButAxis[complex](_scalar_product_ptr, np.PyArray_Ravel(input_array, np.NPY_CORDER), np.PyArray_Ravel(output_array, np.NPY_CORDER), st, N, axis, shapein, shapeout, &s0)
+    elif dtype == 'f':
+        IterAllButAxis[float](_scalar_product_ptr, np.PyArray_Ravel(input_array, np.NPY_CORDER), np.PyArray_Ravel(output_array, np.NPY_CORDER), st, N, axis, shapein, shapeout, &s0)
+    elif dtype == 'F':
+        IterAllButAxis[float_complex](_scalar_product_ptr, np.PyArray_Ravel(input_array, np.NPY_CORDER), np.PyArray_Ravel(output_array, np.NPY_CORDER), st, N, axis, shapein, shapeout, &s0)
     else:
         raise NotImplementedError
 
@@ -212,6 +224,10 @@ cpdef evaluate_expansion_all(np.ndarray input_array, np.ndarray output_array, do
         IterAllButAxis[double](_evaluate_expansion_all_ptr, np.PyArray_Ravel(input_array, np.NPY_CORDER), np.PyArray_Ravel(output_array, np.NPY_CORDER), st, N, axis, shapein, shapeout, &e0)
     elif dtype == 'D':
         IterAllButAxis[complex](_evaluate_expansion_all_ptr, np.PyArray_Ravel(input_array, np.NPY_CORDER), np.PyArray_Ravel(output_array, np.NPY_CORDER), st, N, axis, shapein, shapeout, &e0)
+    elif dtype == 'f':
+        IterAllButAxis[float](_evaluate_expansion_all_ptr, np.PyArray_Ravel(input_array, np.NPY_CORDER), np.PyArray_Ravel(output_array, np.NPY_CORDER), st, N, axis, shapein, shapeout, &e0)
+    elif dtype == 'F':
+        IterAllButAxis[float_complex](_evaluate_expansion_all_ptr, np.PyArray_Ravel(input_array, np.NPY_CORDER), np.PyArray_Ravel(output_array, np.NPY_CORDER), st, N, axis, shapein, shapeout, &e0)
     else:
         raise NotImplementedError
 
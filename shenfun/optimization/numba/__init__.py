@@ -45,6 +45,64 @@ def cross3D(c, a, b):
                 c[1, i, j, k] = a2*b0 - a0*b2
                 c[2, i, j, k] = a0*b1 - a1*b0
 
+@nb.jit(nopython=True, fastmath=True, cache=True)
+def diff_recursion(a, b, s):
+    P, N, Q = a.shape
+    for i in range(P):
+        for k in range(Q):
+            b[i, N-1, k] = 0
+        if N > 1:
+            for k in range(Q):
+                b[i, N-2, k] = s[N-1]*a[i, N-1, k]
+        for n in range(N-3, -1, -1):
+            for k in range(Q):
+                b[i, n, k] = b[i, n+2, k] + s[n+1]*a[i, n+1, k]
+    return b
+
+@nb.jit(nopython=True, fastmath=True, cache=True)
+def dia_matvec(v, c, data, offsets):
+    P, M, Q = v.shape
+    N = c.shape[1]
+    for p in range(P):
+        for i in range(N):
+            for q in range(Q):
+                c[p, i, q] = 0
+        for j in range(offsets.shape[0]):
+            k = offsets[j]
+            for i in range(max(0, -k), min(N, M-k)):
+                d = data[j, i]
+                for q in range(Q):
+                    c[p, i, q] += d*v[p, i+k, q]
+    return c
+
+@nb.jit(nopython=True, fastmath=True, cache=True)
+def nufft_interp(V, idx, W, strides, v):
+    D, M, L = idx.shape
+    K = V.shape[1]
+    l = np.zeros(D, dtype=np.intp)
+    for j in range(M):
+        for k in range(K):
+            v[j, k] = 0
+        l[:] = 0
+        while True:
+            flat = 0
+            w = 1.0
+            for a in range(D):
+                flat += idx[a, j, l[a]]*strides[a]
+                w *= W[a, j, l[a]]
+            for k in range(K):
+                v[j, k] += w*V[flat, k]
+            a = D-1
+            while a >= 0:
+                l[a] += 1
+                if l[a] < L:
+                    break
+                l[a] = 0
+                a -= 1
+            if a < 0:
+                break
+    return v
+
 @nb.jit(nopython=True, fastmath=True, cache=True)
 def outer2D(a, b, c, symmetric):
     N, M = a.shape[1:]
@@ -1,5 +1,6 @@
 import numpy as np
 import numba as nb
+from shenfun.config import config
 
 __all__ = ['SolverGeneric1ND_solve_data',
            'Solve_axis_2D', 'Solve_axis_3D', 'Solve_axis_4D']
@@ -42,8 +43,34 @@ def SolverGeneric1ND_solve_data(u, data, sol, naxes, is_zero_index):
                     sol(u[i, j, :], data[i, j])
     return u
 
-@nb.jit(nopython=True, fastmath=True, cache=False)
+def _solve_axis(serial, threaded, data, x, innerfun, axis):
+    """Solve along axis with config['optimization']['threads'] threads
+
+    The number of threads of numba is only changed for the threaded call,
+    and then restored.
+    """
+    threads = config['optimization'].get('threads', 1)
+    if threads <= 1:
+        serial(data, x, innerfun, axis)
+        return
+    num_threads = nb.get_num_threads()
+    nb.set_num_threads(min(threads, nb.config.NUMBA_NUM_THREADS))
+    try:
+        threaded(data, x, innerfun, axis)
+    finally:
+        nb.set_num_threads(num_threads)
+
 def Solve_axis_2D(data, x, innerfun, axis):
+    _solve_axis(_Solve_axis_2D, _Solve_axis_2D_threaded, data, x, innerfun, axis)
+
+def Solve_axis_3D(data, x, innerfun, axis):
+    _solve_axis(_Solve_axis_3D, _Solve_axis_3D_threaded, data, x, innerfun, axis)
+
+def Solve_axis_4D(data, x, innerfun, axis):
+    _solve_axis(_Solve_axis_4D, _Solve_axis_4D_threaded, data, x, innerfun, axis)
+
+@nb.jit(nopython=True, fastmath=True, cache=False)
+def _Solve_axis_2D(data, x, innerfun, axis):
     if axis == 0:
         for j in range(x.shape[1]):
             innerfun(x[:, j], data)
@@ -52,7 +79,7 @@ def Solve_axis_2D(data, x, innerfun, axis):
             innerfun(x[i, :], data)
 
 @nb.jit(nopython=True, fastmath=True, cache=False)
-def Solve_axis_3D(data, x, innerfun, axis):
+def _Solve_axis_3D(data, x, innerfun, axis):
     if axis == 0:
         for j in range(x.shape[1]):
             for k in range(x.shape[2]):
@@ -67,7 +94,7 @@ def Solve_axis_3D(data, x, innerfun, axis):
                 innerfun(x[i, j], data)
 
 @nb.jit(nopython=True, fastmath=True, cache=False)
-def Solve_axis_4D(data, x, innerfun, axis):
+def _Solve_axis_4D(data, x, innerfun, axis):
     if axis == 0:
         for j in range(x.shape[1]):
             for k in range(x.shape[2]):
@@ -88,3 +115,52 @@ def Solve_axis_4D(data, x, innerfun, axis):
             for j in range(x.shape[1]):
                 for k in range(x.shape[2]):
                     innerfun(x[i, j, k], data)
+
+# Independent 1D systems distributed over threads
+
+@nb.jit(nopython=True, fastmath=True, cache=False, parallel=True)
+def _Solve_axis_2D_threaded(data, x, innerfun, axis):
+    if axis == 0:
+        for j in nb.prange(x.shape[1]):
+            innerfun(x[:, j], data)
+    elif axis == 1:
+        for i in nb.prange(x.shape[0]):
+            innerfun(x[i, :], data)
+
+@nb.jit(nopython=True, fastmath=True, cache=False, parallel=True)
+def _Solve_axis_3D_threaded(data, x, innerfun, axis):
+    if axis == 0:
+        for j in nb.prange(x.shape[1]):
+            for k in range(x.shape[2]):
+                innerfun(x[:, j, k], data)
+    elif axis == 1:
+        for i in nb.prange(x.shape[0]):
+            for k in range(x.shape[2]):
+                innerfun(x[i, :, k], data)
+    elif axis == 2:
+        for i in nb.prange(x.shape[0]):
+            for j in range(x.shape[1]):
+                innerfun(x[i, j], data)
+
+@nb.jit(nopython=True, fastmath=True, cache=False, parallel=True)
+def _Solve_axis_4D_threaded(data, x, innerfun, axis):
+    if axis == 0:
+        for j in nb.prange(x.shape[1]):
+            for k in range(x.shape[2]):
+                for l in range(x.shape[3]):
+                    innerfun(x[:, j, k, l], data)
+    elif axis == 1:
+        for i in nb.prange(x.shape[0]):
+            for k in range(x.shape[2]):
+                for l in range(x.shape[3]):
+                    innerfun(x[i, :, k, l], data)
+    elif axis == 2:
+        for i in nb.prange(x.shape[0]):
+            for j in range(x.shape[1]):
+                for l in range(x.shape[3]):
+                    innerfun(x[i, j, :, l], data)
+    elif axis == 3:
+        for i in nb.prange(x.shape[0]):
+            for j in range(x.shape[1]):
+                for k in range(x.shape[2]):
+                    innerfun(x[i, j, k], data)
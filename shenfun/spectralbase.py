@@ -18,13 +18,13 @@ import importlib
 import re
 import copy
 import importlib
+import weakref
 from numbers import Number
 import sympy as sp
 import numpy as np
-from mpi4py_fft import fftw
 from shenfun import config
-from shenfun.utilities import get_stencil_matrix, n
-from .utilities import CachedArrayDict, split
+from shenfun.utilities import get_stencil_matrix, n, diff_recursion
+from .utilities import CachedArrayDict, split, array_pool
 from .coordinates import Coordinates
 work = CachedArrayDict()
 xp = sp.Symbol('x', real=True)
@@ -52,6 +52,8 @@ class SpectralBase:
         self._M = 1.0             # Normalization factor
         self._xfftn_fwd = None    # external forward transform function
         self._xfftn_bck = None    # external backward transform function
+        self._work_arrays = []    # work arrays acquired from array_pool
+        weakref.finalize(self, array_pool.release_all, self._work_arrays).atexit = False
         coors = coordinates if coordinates is not None else ((sp.Symbol('x', real=True),),)*2
         self.coors = Coordinates(*coors)
         self.hi = self.coors.hi
@@ -204,6 +206,7 @@ class SpectralBase:
             - 'fast' - use fast transform if implemented
             - 'vandermonde' - use Vandermonde matrix
             - 'recursive' - Use low-memory implementation (only for polynomials)
+            - 'auto' - 'fast' for large N, otherwise 'recursive' (only Legendre)
 
         Note
         ----
@@ -219,6 +222,11 @@ class SpectralBase:
 
         self._evaluate_scalar_product(kind=kind)
 
+        if output_array is not None and self.scalar_product.tmp_array is not self.scalar_product.output_array:
+            # Truncate directly into output_array
+            self._truncation_forward(self.scalar_product.tmp_array, output_array)
+            return output_array
+
         self._truncation_forward(self.scalar_product.tmp_array,
                                  self.scalar_product.output_array)
         if output_array is not None:
@@ -239,6 +247,7 @@ class SpectralBase:
             - 'fast' - use fast transform if implemented
             - 'vandermonde' - Use Vandermonde matrix
             - 'recursive' - Use low-memory implementation (only for polynomials)
+            - 'auto' - 'fast' for large N, otherwise 'recursive' (only Legendre)
 
         Note
         ----
@@ -247,14 +256,14 @@ class SpectralBase:
 
         """
         kind = kind if kind is not None else config['transforms']['kind'][self.family()]
-        self.scalar_product(input_array, kind=kind)
+        padded = self.forward.tmp_array is not self.forward.output_array
+        u = self.scalar_product(input_array, output_array if padded else None, kind=kind)
         if self.bc:
-            self.bc._add_mass_rhs(self.forward.output_array)
-        self.apply_inverse_mass(self.forward.output_array)
-        if output_array is not None:
-            output_array[...] = self.forward.output_array
-            return output_array
-        return self.forward.output_array
+            self.bc._add_mass_rhs(u)
+        self.apply_inverse_mass(u)
+        if output_array is not None and u is not output_array:
+            output_array[...] = u
+        return u if output_array is None else output_array
 
     def backward(self, input_array=None, output_array=None, kind=None, mesh=None):
         """Compute backward (inverse) transform
@@ -268,6 +277,7 @@ class SpectralBase:
         kind : str, optional
             - 'fast' - Use fast transform on regular quadrature points
             - 'recursive' - Use low-memory implementation (only for polynomials)
+            - 'auto' - 'fast' for large N, otherwise 'recursive' (only Legendre)
             - 'vandermonde' - use Vandermonde on regular quadrature points
         mesh : str or functionspace, optional
             - 'quadrature' - use quadrature mesh of self
@@ -281,11 +291,15 @@ class SpectralBase:
 
         """
         kind = kind if kind is not None else config['transforms']['kind'][self.family()]
+        trunc_array = self.backward.input_array
         if input_array is not None:
-            self.backward.input_array[...] = input_array
+            if trunc_array is self.backward.tmp_array:
+                trunc_array[...] = input_array
+            else:
+                # Pad directly from input_array
+                trunc_array = input_array
 
-        self._padding_backward(self.backward.input_array,
-                               self.backward.tmp_array)
+        self._padding_backward(trunc_array, self.backward.tmp_array)
 
         if isinstance(mesh, str):
             assert mesh in ('quadrature', 'uniform')
@@ -516,6 +530,7 @@ class SpectralBase:
             - 'fast' - use fast transform if implemented
             - 'vandermonde' - Use Vandermonde matrix
             - 'recursive' - Use low-memory implementation (only for polynomials)
+            - 'auto' - 'fast' for large N, otherwise 'recursive' (only Legendre)
 
         Note
         ----
@@ -593,6 +608,59 @@ class SpectralBase:
         #                       use_to_ortho=False)
         #return output_array
 
+    def differentiate(self, input_array, output_array, k=1):
+        r"""Return coefficients of the k'th derivative along axis
+
+        Both the input and the output are expansion coefficients in the
+        orthogonal basis :math:`\{\phi_n\}_{n=0}^{N-1}`. The coefficients
+        :math:`b_n` of the derivative are computed from a backward recurrence
+
+        .. math::
+
+            d_n = d_{n+2} + s_{n+1} a_{n+1}, \quad b_n = w_n d_n,
+
+        for :math:`n=N-2, N-3, \ldots, 0`, where :math:`s_n` and
+        :math:`w_n` are given by :meth:`diff_recursion_weights`. The cost is
+        O(N) for each line along the axis, and no linear system is solved.
+
+        Parameters
+        ----------
+        input_array : array
+            Expansion coefficients of orthogonal basis
+        output_array : array
+            Expansion coefficients of derivative in orthogonal basis
+        k : int, optional
+            The number of derivatives
+
+        Returns
+        -------
+        array
+            output_array
+        """
+        assert self.is_orthogonal
+        s, w = self.diff_recursion_weights()
+        w = w*float(self.domain_factor())
+        w = self.broadcast_to_ndims(w)
+        axis = self.axis
+        P = int(np.prod(input_array.shape[:axis]))
+        Q = int(np.prod(input_array.shape[axis+1:]))
+        shape = (P, input_array.shape[axis], Q)
+        b = np.empty(shape, dtype=output_array.dtype)
+        a = input_array
+        for i in range(k):
+            a = np.ascontiguousarray(a, dtype=b.dtype).reshape(shape)
+            b = diff_recursion(a, b, s)
+            a = b.reshape(input_array.shape)*w
+        output_array[...] = a
+        return output_array
+
+    def diff_recursion_weights(self):
+        """Return weights :math:`s_n` and :math:`w_n` used by :meth:`differentiate`
+
+        The weights are for the reference domain.
+        """
+        raise NotImplementedError
+
     def plan(self, shape, axis, dtype, options):
         """Plan transform
 
@@ -623,8 +691,9 @@ class SpectralBase:
                 # Already planned
                 return
 
-        U = fftw.aligned(shape, dtype=dtype)
-        V = fftw.aligned(shape, dtype=dtype)
+        self.release_work_arrays()
+        U = self.get_work_array(shape, dtype, 'U')
+        V = self.get_work_array(shape, dtype, 'V')
         U.fill(0)
         V.fill(0)
         self.axis = axis
@@ -644,7 +713,39 @@ class SpectralBase:
     def _get_truncarray(self, shape, dtype):
         shape = list(shape) if np.ndim(shape) else [shape]
         shape[self.axis] = int(np.round(shape[self.axis] / self.padding_factor))
-        return fftw.aligned(shape, dtype=dtype)
+        return self.get_work_array(shape, dtype, 'trunc')
+
+    def get_work_array(self, shape, dtype, tag, scratch=False):
+        """Return aligned work array for transforms from :data:`.array_pool`
+
+        Parameters
+        ----------
+        shape : sequence of ints
+            Shape of array
+        dtype : Numpy dtype
+            Type of array
+        tag : str
+            Arrays with different tags are never shared
+        scratch : bool, optional
+            Whether the array is only used internally by a transform, such
+            that it is not live between calls
+
+        Note
+        ----
+        The array is shared with other bases according to
+        ``config['fftw']['pool']['share']``. Scratch arrays are shared unless
+        this is 'none'. Other arrays, like the input and output arrays of
+        transforms, are shared only if this is 'all'.
+        """
+        share = config['fftw']['pool']['share']
+        shared = share == 'all' or (scratch and share == 'scratch')
+        a = array_pool.acquire(shape, dtype, tag, shared=shared)
+        self._work_arrays.append(a)
+        return a
+
+    def release_work_arrays(self):
+        """Release all work arrays acquired by :meth:`get_work_array`"""
+        array_pool.release_all(self._work_arrays)
 
     def get_normalization(self):
         return self._M
@@ -1356,15 +1457,17 @@ class SpectralBase:
 
     def _truncation_forward(self, padded_array, trunc_array):
         if not id(trunc_array) == id(padded_array):
-            trunc_array.fill(0)
-            s = self.sl[self.slice()]
-            trunc_array[s] = padded_array[s]
+            s = self.slice()
+            trunc_array[self.sl[slice(0, s.start)]] = 0
+            trunc_array[self.sl[slice(s.stop, None)]] = 0
+            trunc_array[self.sl[s]] = padded_array[self.sl[s]]
 
     def _padding_backward(self, trunc_array, padded_array):
         if not id(trunc_array) == id(padded_array):
-            padded_array.fill(0)
-            s = self.sl[self.slice()]
-            padded_array[s] = trunc_array[s]
+            s = self.slice()
+            padded_array[self.sl[slice(0, s.start)]] = 0
+            padded_array[self.sl[slice(s.stop, None)]] = 0
+            padded_array[self.sl[s]] = trunc_array[self.sl[s]]
 
         elif self.dealias_direct:
             s = self.sl[slice(2*self.N//3, None)]
@@ -2,25 +2,29 @@
 Module for implementation of the :class:`.TensorProductSpace` class and
 related methods.
 """
+import os
 import copy
 from numbers import Number
 import sympy as sp
 import numpy as np
 from mpi4py_fft.mpifft import Transform, PFFT
-from mpi4py_fft.pencil import Subcomm, Pencil
+from mpi4py_fft.pencil import Subcomm, Pencil, Transfer
+from mpi4py_fft.fftw.factory import fftlib
+from mpi4py_fft import fftw
 from mpi4py import MPI
 from shenfun import config
-from shenfun.fourier.bases import R2C, C2C
-from shenfun.utilities import apply_mask
+from shenfun.fourier.bases import R2C, C2C, FourierBase
+from shenfun.fourier.nufft import NUFFTKernel, nufft_interp
+from shenfun.utilities import apply_mask, lambdify_cache
 from shenfun.forms.arguments import Function, Array
 from shenfun.optimization.cython import evaluate
-from shenfun.spectralbase import slicedict, islicedict, SpectralBase
+from shenfun.spectralbase import slicedict, islicedict, SpectralBase, FuncWrap
 from shenfun.coordinates import Coordinates
 
 comm = MPI.COMM_WORLD
 
 __all__ = ('TensorProductSpace', 'VectorSpace', 'TensorSpace',
-           'CompositeSpace', 'Convolve')
+           'CompositeSpace', 'Convolve', 'EvalPlan')
 
 @staticmethod
 def _get_kind(xfftn, kind):
@@ -41,6 +45,58 @@ def _get_mesh(xfftn, mesh):
 # Monkey-patch
 Transform._get_kind = _get_kind
 Transform._get_mesh = _get_mesh
+Transform._pipeline = ()
+Transform._local = ()
+
+def _get_wisdom_files(shape, dtype):
+    """Return FFTW wisdom filenames, one for each precision, for the
+    current rank and a global shape/dtype"""
+    path = os.path.expanduser(os.path.expandvars(config['fftw']['wisdom']['path']))
+    name = 'wisdom_{}_{}_{}_{}'.format('x'.join(map(str, shape)), np.dtype(dtype).char,
+                                       comm.Get_size(), comm.Get_rank())
+    return {key: os.path.join(path, key+'_'+name) for key in fftlib}
+
+def import_wisdom(shape, dtype):
+    """Import FFTW wisdom stored for global shape and dtype
+
+    Parameters
+    ----------
+    shape : sequence of ints
+        The global shape of a :class:`.TensorProductSpace`
+    dtype : Numpy dtype
+        The dtype of the input to the forward transform
+
+    Returns
+    -------
+    list
+        The names of the files imported
+
+    Note
+    ----
+    Only used if ``config['fftw']['wisdom']['enabled']`` is True. The
+    wisdom is read from ``config['fftw']['wisdom']['path']``, with one
+    file per precision and per MPI rank. Missing files are ignored.
+    """
+    imported = []
+    if not config['fftw']['wisdom']['enabled']:
+        return imported
+    for key, filename in _get_wisdom_files(shape, dtype).items():
+        if os.path.isfile(filename):
+            fftlib[key].import_wisdom(bytearray(filename, 'utf-8'))
+            imported.append(filename)
+    return imported
+
+def export_wisdom(shape, dtype):
+    """Export all accumulated FFTW wisdom for global shape and dtype
+
+    See :func:`import_wisdom`
+    """
+    if not config['fftw']['wisdom']['enabled']:
+        return
+    files = _get_wisdom_files(shape, dtype)
+    os.makedirs(os.path.dirname(files['D']), exist_ok=True)
+    for key, filename in files.items():
+        fftlib[key].export_wisdom(bytearray(filename, 'utf-8'))
 
 class BackwardTransform(Transform):
     def __call__(self, input_array=None, output_array=None, kind=None, mesh=None, **kw):
@@ -78,22 +134,24 @@ class BackwardTransform(Transform):
         as planned with serial transform object ``_xfftn``.
 
         """
-
-        if input_array is not None:
-            self.input_array[...] = input_array
-
+        # Within a process the output of one serial transform is the input of
+        # the next, such that a padded transform pads from it without an
+        # extra copy
+        array = input_array
         for i in range(len(self._transfer)):
-            self._xfftn[i](kind=self._get_kind(self._xfftn[i], kind), mesh=self._get_mesh(self._xfftn[i], mesh), **kw)
-            arrayA = self._xfftn[i].output_array
-            arrayB = self._xfftn[i+1].input_array
-            self._transfer[i](arrayA, arrayB)
-        self._xfftn[-1](kind=self._get_kind(self._xfftn[-1], kind), mesh=self._get_mesh(self._xfftn[-1], mesh), **kw)
-
-        if output_array is not None:
-            output_array[...] = self.output_array
-            return output_array
-        else:
-            return self.output_array
+            if self._pipeline and self._pipeline[i] is not None:
+                if array is not None:
+                    self._xfftn[i].input_array[...] = array
+                    array = None
+                self._pipeline[i](self._xfftn[i+1].input_array, kind=self._get_kind(self._xfftn[i], kind), mesh=self._get_mesh(self._xfftn[i], mesh), **kw)
+                continue
+            arrayA = self._xfftn[i](array, kind=self._get_kind(self._xfftn[i], kind), mesh=self._get_mesh(self._xfftn[i], mesh), **kw)
+            if self._local and self._local[i]:
+                array = arrayA
+            else:
+                self._transfer[i](arrayA, self._xfftn[i+1].input_array)
+                array = None
+        return self._xfftn[-1](array, output_array, kind=self._get_kind(self._xfftn[-1], kind), mesh=self._get_mesh(self._xfftn[-1], mesh), **kw)
 
 class ScalarTransform(Transform):
     """Class for performing the scalar product in parallel
@@ -134,12 +192,7 @@ class ScalarTransform(Transform):
             self.input_array[:] = self.input_array*dx
             return
 
-        sym0 = dx.free_symbols
-        m = []
-        for sym in sym0:
-            j = 'xyzrs'.index(str(sym))
-            m.append(mesh[j])
-        xj = sp.lambdify(tuple(sym0), dx)(*m)
+        xj = lambdify_cache.evaluate(dx, mesh)
         self.input_array[...] = self.input_array*xj
         return
 
@@ -170,24 +223,28 @@ class ScalarTransform(Transform):
         as planned with serial transform object ``_xfftn``.
 
         """
-        if input_array is not None:
-            self.input_array[...] = input_array
-
         if not self._T.coors.is_cartesian:
+            if input_array is not None:
+                self.input_array[...] = input_array
+                input_array = None
             self.get_measured_input_array()
 
+        # Within a process the serial transforms write directly into the
+        # input array of the next, such that a padded transform truncates
+        # into it without an extra copy
+        array = input_array
         for i in range(len(self._transfer)):
-            self._xfftn[i](kind=self._get_kind(self._xfftn[i], kind), **kw)
-            arrayA = self._xfftn[i].output_array
-            arrayB = self._xfftn[i+1].input_array
-            self._transfer[i](arrayA, arrayB)
-        self._xfftn[-1](kind=self._get_kind(self._xfftn[-1], kind), **kw)
-
-        if output_array is not None:
-            output_array[...] = self.output_array
-            return output_array
-        else:
-            return self.output_array
+            if self._pipeline and self._pipeline[i] is not None:
+                if array is not None:
+                    self._xfftn[i].input_array[...] = array
+                self._pipeline[i](self._xfftn[i+1].input_array, kind=self._get_kind(self._xfftn[i], kind), **kw)
+            elif self._local and self._local[i]:
+                self._xfftn[i](array, self._xfftn[i+1].input_array, kind=self._get_kind(self._xfftn[i], kind), **kw)
+            else:
+                arrayA = self._xfftn[i](array, kind=self._get_kind(self._xfftn[i], kind), **kw)
+                self._transfer[i](arrayA, self._xfftn[i+1].input_array)
+            array = None
+        return self._xfftn[-1](array, output_array, kind=self._get_kind(self._xfftn[-1], kind), **kw)
 
 
 class ForwardTransform(ScalarTransform):
@@ -229,14 +286,12 @@ class ForwardTransform(ScalarTransform):
         as planned with serial transform object ``_xfftn``.
 
         """
-        if input_array is not None:
-            self.input_array[...] = input_array
-
-        if not self._T.coors.is_cartesian:
-            self.get_measured_input_array()
-
         if len(self._T.get_nonhomogeneous_axes()) > 1:
             from shenfun import la, TestFunction, TrialFunction, inner
+            if input_array is not None:
+                self.input_array[...] = input_array
+            if not self._T.coors.is_cartesian:
+                self.get_measured_input_array()
             assert self._T.dimensions == 2, 'Two inhomogeneous boundary directions only implemented for 2D'
             u = TrialFunction(self._T)
             v = TestFunction(self._T)
@@ -245,12 +300,7 @@ class ForwardTransform(ScalarTransform):
             sol = la.Solver2D(B)
             self.output_array[:] = sol(b)
         else:
-            for i in range(len(self._transfer)):
-                self._xfftn[i](kind=self._get_kind(self._xfftn[i], kind), **kw)
-                arrayA = self._xfftn[i].output_array
-                arrayB = self._xfftn[i+1].input_array
-                self._transfer[i](arrayA, arrayB)
-            self._xfftn[-1](kind=self._get_kind(self._xfftn[-1], kind), **kw)
+            return ScalarTransform.__call__(self, input_array, output_array, kind=kind, **kw)
 
         if output_array is not None:
             output_array[...] = self.output_array
@@ -259,6 +309,147 @@ class ForwardTransform(ScalarTransform):
             return self.output_array
 
 
+class PipelinedStage:
+    """Serial transform followed by a global redistribution, computed in
+    chunks
+
+    The local arrays are split into chunks along an axis that is neither
+    transformed nor redistributed. The serial transform is computed for one
+    chunk at the time, and as soon as a chunk is finished, it is
+    redistributed with ``Alltoallw``. The exchanges are blocking, since
+    nonblocking exchanges (``Ialltoallw``) of the chunks have been seen to
+    corrupt memory. Hence communication and computation do not overlap
+    yet, but each exchange only holds one chunk.
+
+    Parameters
+    ----------
+    xfftn : serial transform object
+        The forward, backward or scalar_product of a 1D base
+    transfer : bound method
+        The forward or backward method of a :class:`mpi4py_fft.pencil.Transfer`
+        redistributing the output of `xfftn`
+    chunks : int
+        The number of chunks
+
+    Note
+    ----
+    Use :meth:`.is_pipelinable` to check whether the stage can be pipelined.
+    Stages without any global communication (a subcommunicator of size 1)
+    are by default not pipelined.
+    """
+    def __init__(self, xfftn, transfer, chunks):
+        assert self.is_pipelinable(xfftn, transfer, local=True)
+        self.xfftn = xfftn
+        self.transfer = transfer
+        base, name = BatchedTransform._get_base(xfftn)
+        tr = transfer.__self__
+        self.comm = tr.comm
+        if transfer.__name__ == 'forward':
+            send = (tr.subshapeA, tr.axisA)
+            recv = (tr.subshapeB, tr.axisB)
+        else:
+            send = (tr.subshapeB, tr.axisB)
+            recv = (tr.subshapeA, tr.axisA)
+        self.axis = axis = self.get_chunk_axis(transfer)
+        n = send[0][axis]
+        self.slices = []
+        self.xfftn_chunks = []
+        self.subtypes = []
+        U = base.forward.input_array
+        # A rank with no local extent along axis has nothing to transform.
+        # The extent is shared by all ranks of the subcommunicator, so none
+        # of them start any communication
+        sections = np.array_split(np.arange(n), min(chunks, n)) if n > 0 else []
+        for chunk in sections:
+            sl = [slice(None)]*U.ndim
+            sl[axis] = slice(chunk[0], chunk[-1]+1)
+            self.slices.append(tuple(sl))
+            shape = list(U.shape)
+            shape[axis] = len(chunk)
+            b = base.get_unplanned()
+            b.plan(tuple(shape), base.axis, U.dtype, {})
+            self.xfftn_chunks.append(getattr(b, name))
+            self.subtypes.append((self._subarraytypes(tr.shape, send, axis, chunk, tr.dtype),
+                                  self._subarraytypes(tr.shape, recv, axis, chunk, tr.dtype)))
+        size = self.comm.Get_size()
+        self._counts_displs = ([1] * size, [0] * size)
+
+    @staticmethod
+    def get_chunk_axis(transfer):
+        """Return the axis used for splitting into chunks, or None"""
+        tr = transfer.__self__
+        axes = [ax for ax in range(len(tr.shape)) if ax not in (tr.axisA, tr.axisB)]
+        if len(axes) == 0:
+            return None
+        return axes[np.argmax([tr.subshapeA[ax] for ax in axes])]
+
+    @staticmethod
+    def is_pipelinable(xfftn, transfer, local=False):
+        """Return whether the stage (xfftn, transfer) can be pipelined
+
+        Parameters
+        ----------
+        xfftn : serial transform object
+        transfer : bound method
+        local : bool, optional
+            Whether to also pipeline a redistribution that is a local copy,
+            i.e., with a subcommunicator of size 1. There is nothing to
+            overlap then, so this is mainly for testing.
+        """
+        base = BatchedTransform._get_base(xfftn)[0]
+        T = base.tensorproductspace
+        if not isinstance(T, TensorProductSpace):
+            return False
+        if not T.coors.is_cartesian or base.has_nonhomogeneous_bcs:
+            return False
+        if max([len(axes) for axes in T.axes]) > 1:
+            return False
+        if transfer.__self__.comm.Get_size() == 1 and not local:
+            # Nothing to overlap, the redistribution is a local copy
+            return False
+        return PipelinedStage.get_chunk_axis(transfer) is not None
+
+    def _subarraytypes(self, shape, sub, axis, chunk, dtype):
+        # Like mpi4py_fft.pencil._subarraytypes, but only for one chunk
+        subshape, alignaxis = sub
+        N = shape[alignaxis]
+        p = self.comm.Get_size()
+        datatype = MPI._typedict[np.dtype(dtype).char]
+        sizes = list(subshape)
+        subsizes = sizes[:]
+        substarts = [0] * len(sizes)
+        subsizes[axis] = len(chunk)
+        substarts[axis] = chunk[0]
+        datatypes = []
+        for i in range(p):
+            q, r = divmod(N, p)
+            subsizes[alignaxis] = q + (1 if r > i else 0)
+            substarts[alignaxis] = i * q + min(i, r)
+            datatypes.append(datatype.Create_subarray(sizes, subsizes, substarts).Commit())
+        return tuple(datatypes)
+
+    def __call__(self, arrayB, **kw):
+        arrayA = self.xfftn.output_array
+        for sl, xfftn, (sendtypes, recvtypes) in zip(self.slices, self.xfftn_chunks, self.subtypes):
+            xfftn.input_array[...] = self.xfftn.input_array[sl]
+            xfftn(**kw)
+            arrayA[sl] = xfftn.output_array
+            self.comm.Alltoallw([arrayA, self._counts_displs, sendtypes],
+                                [arrayB, self._counts_displs, recvtypes])
+
+    def destroy(self):
+        for sendtypes, recvtypes in self.subtypes:
+            for t in sendtypes + recvtypes:
+                t.Free()
+        # The bases of the chunks are owned by the stage. Their plans free
+        # themselves when garbage collected
+        for xfftn in self.xfftn_chunks:
+            BatchedTransform._get_base(xfftn)[0].release_work_arrays()
+        self.subtypes = []
+        self.slices = []
+        self.xfftn_chunks = []
+
+
 class TensorProductSpace(PFFT):
     """Class for multidimensional tensorproductspaces.
 
@@ -306,6 +497,11 @@ class TensorProductSpace(PFFT):
     modify_spaces_inplace : bool, optional
         Whether or not a copy should be made of the input functionspaces.
         If True, then the input spaces will be modified inplace.
+    chunks : int, optional
+        If larger than 1, then split the local arrays into this many chunks
+        and redistribute each chunk as soon as its serial transform is
+        finished, see :class:`.PipelinedStage`. Only possible for 3D and
+        higher dimensions.
     kw : dict, optional
         Dictionary that can be used to plan transforms. Input to method
         ``plan`` for the bases.
@@ -313,10 +509,12 @@ class TensorProductSpace(PFFT):
     """
     def __init__(self, comm, bases, axes=None, dtype=None, slab=False,
                  collapse_fourier=False, backward_from_pencil=False,
-                 coordinates=None, modify_spaces_inplace=False, **kw):
+                 coordinates=None, modify_spaces_inplace=False, chunks=1,
+                 **kw):
         # Note do not call __init__ of super
         self.comm = comm
         self.bases = bases
+        self.chunks = chunks
         if not modify_spaces_inplace:
             self.bases = tuple([base.get_unplanned() for base in bases])
 
@@ -362,7 +560,10 @@ class TensorProductSpace(PFFT):
             assert sorted(axes[i]) == sorted(set(axes[i]))
 
         if dtype is None:
-            dtype = complex if isinstance(self.bases[axes[-1][-1]], C2C) else float
+            # Single precision only if all bases are planned in single precision
+            dtype = np.result_type(*[np.dtype(b.dtype).char.lower() for b in self.bases])
+            if isinstance(self.bases[axes[-1][-1]], C2C):
+                dtype = dtype.char.upper()
 
         dtype = np.dtype(dtype)
         assert dtype.char in 'fdgFDG'
@@ -370,6 +571,8 @@ class TensorProductSpace(PFFT):
         self.xfftn = []
         self.transfer = []
         self.pencil = [None, None]
+        wisdom_key = (tuple(shape), dtype)
+        import_wisdom(*wisdom_key)
         for axis, base in enumerate(self.bases):
             base.tensorproductspace = self
             base.axis = axis
@@ -462,11 +665,21 @@ class TensorProductSpace(PFFT):
         else:
             self.configure_backwards(backward_from_pencil, dtype, kw)
 
+        export_wisdom(*wisdom_key)
+
         for i, base in enumerate(self.bases):
             base.axis = i
             if base.has_nonhomogeneous_bcs:
                 base.bc.set_tensor_bcs(base, self)
 
+        for transform in (self.forward, self.backward, self.scalar_product):
+            transform._local = [t.__self__.comm.Get_size() == 1 for t in transform._transfer]
+
+        if chunks > 1:
+            for transform in (self.forward, self.backward, self.scalar_product):
+                transform._pipeline = [PipelinedStage(x, t, chunks) if PipelinedStage.is_pipelinable(x, t) else None
+                                       for x, t in zip(transform._xfftn[:-1], transform._transfer)]
+
     def configure_backwards(self, pencil, dtype, kw):
         """Configure transforms starting from spectral space
 
@@ -539,6 +752,15 @@ class TensorProductSpace(PFFT):
             [o.forward for o in self.transfer[::-1]],
             self.pencil[::-1], self)
 
+    def destroy(self):
+        self.__dict__.pop('_nufft', None)
+        self.__dict__.pop('_eval_plan', None)
+        for transform in (self.forward, self.backward, self.scalar_product):
+            for stage in transform._pipeline:
+                if stage is not None:
+                    stage.destroy()
+        PFFT.destroy(self)
+
     def get_dealiased(self, padding_factor=1.5, dealias_direct=False):
         """Return space (otherwise as self) to be used for dealiasing
 
@@ -568,7 +790,8 @@ class TensorProductSpace(PFFT):
         return TensorProductSpace(self.comm, padded_bases, axes=tuple(axes),
                                   dtype=self.forward.output_array.dtype,
                                   backward_from_pencil=self.forward.output_pencil,
-                                  coordinates=self.coors.coordinates)
+                                  coordinates=self.coors.coordinates,
+                                  chunks=self.chunks)
 
     def get_refined(self, N):
         """Return space (otherwise as self) refined to new shape
@@ -589,7 +812,8 @@ class TensorProductSpace(PFFT):
                          for axis, base in enumerate(self.bases)]
         return TensorProductSpace(self.subcomm, refined_bases, axes=self.axes,
                                   dtype=self.dtype(),
-                                  coordinates=self.coors.coordinates)
+                                  coordinates=self.coors.coordinates,
+                                  chunks=self.chunks)
 
     def get_unplanned(self, tensorproductspace=False, **kwargs):
         """Return unplanned bases otherwise as self. Or return a new
@@ -658,7 +882,8 @@ class TensorProductSpace(PFFT):
         ab_hat = self.forward(a*b, ab_hat)
         return ab_hat
 
-    def eval(self, points, coefficients, output_array=None, method=1):
+    def eval(self, points, coefficients, output_array=None, method=1,
+             distribution='replicated'):
         """Evaluate Function at points, given expansion coefficients
 
         Parameters
@@ -673,24 +898,56 @@ class TensorProductSpace(PFFT):
             Chooses implementation. The method 0 is a low-memory cython
             version. Using method = 1 (default) leads to a faster cython
             implementation that, on the downside, uses more memory.
-            The final, method = 2, is a python implementation.
+            Method = 2 is a python implementation. Method = 3 is
+            experimental and uses a nonuniform FFT for the Fourier axes
+            that are not distributed in spectral space, see :mod:`.nufft`.
+            It has not yet been shown to be faster than method 1, and is
+            only used if ``config['transforms']['nufft']['enabled']`` is
+            True. Otherwise, or if there are no such Fourier axes, method 3
+            falls back to method 1.
+        distribution : str, optional
+            How the points are distributed between the processors
+
+            - 'replicated' - all processors hold the same points and get
+              the same result
+            - 'scattered' - each processor holds its own points and gets
+              the result for its own points only
+            - 'gathered' - each processor holds its own points, and all
+              processors get the result for all points, ordered by rank
+
+            See :class:`.PointRouter`.
         """
+        if len(self.get_nonperiodic_axes()) > 1 and method in (0, 2):
+            method = 1
+        if method == 3 and not (config['transforms']['nufft']['enabled'] and self._get_nufft_axes()):
+            method = 1
+        assert self.dimensions < 4, 'eval not implemented (yet) for higher dimensions'
+        if method == 1:
+            return self._eval_cython(points, coefficients, output_array, distribution)
+        router = PointRouter(self, points, distribution)
         if output_array is None:
-            output_array = np.zeros(points.shape[1], dtype=self.forward.input_array.dtype)
+            output_array = np.zeros(router.output_size, dtype=self.forward.input_array.dtype)
         else:
             output_array[:] = 0
-        if len(self.get_nonperiodic_axes()) > 1:
-            method = 1
-        assert self.dimensions < 4, 'eval not implemented (yet) for higher dimensions'
+        # Partial sums are computed in double precision
+        dtype = np.result_type(output_array.dtype, np.float64)
+        if distribution == 'replicated' and dtype == output_array.dtype:
+            partial = output_array
+        else:
+            partial = np.zeros(router.points.shape[1], dtype=dtype)
         if method == 0:
-            return self._eval_lm_cython(points, coefficients, output_array)
-        elif method == 1:
-            return self._eval_cython(points, coefficients, output_array)
+            partial = self._eval_lm_cython(router.points, coefficients, partial)
+        elif method == 3:
+            partial = self._eval_nufft(router.points, coefficients, partial)
         else:
-            return self._eval_python(points, coefficients, output_array)
+            partial = self._eval_python(router.points, coefficients, partial)
+        return router.reduce(partial, output_array)
 
     def _eval_python(self, points, coefficients, output_array):
-        """Evaluate Function at points, given expansion coefficients
+        """Evaluate the local part of Function at points
+
+        The returned partial sums must be reduced over all processors,
+        see :class:`.PointRouter`.
 
         Parameters
         ----------
@@ -765,12 +1022,14 @@ class TensorProductSpace(PFFT):
                 out = out2
             previous_axes.append(axis)
         output_array[:] = out
-        output_array = comm.allreduce(output_array)
         return output_array
 
 
     def _eval_lm_cython(self, points, coefficients, output_array):
-        """Evaluate Function at points, given expansion coefficients
+        """Evaluate the local part of Function at points
+
+        The returned partial sums must be reduced over all processors,
+        see :class:`.PointRouter`.
 
         Parameters
         ----------
@@ -805,11 +1064,54 @@ class TensorProductSpace(PFFT):
             output_array = evaluate.evaluate_lm_3D(list(self.bases), output_array, coefficients, x[0], x[1], x[2], w[0], w[1], w[2], r2c, last_conj_index, sl)
 
         output_array = np.atleast_1d(output_array)
-        output_array = comm.allreduce(output_array)
         return output_array
 
-    def _eval_cython(self, points, coefficients, output_array):
-        """Evaluate Function at points, given expansion coefficients
+    def _get_nufft_axes(self):
+        """Return the Fourier axes that are not distributed in spectral space
+
+        These are the axes that :meth:`_eval_nufft` handles with a
+        nonuniform FFT.
+        """
+        ls = self.local_slice(True)
+        shape = self.global_shape(True)
+        return [axis for axis, base in enumerate(self.bases)
+                if isinstance(base, FourierBase) and ls[axis].stop-ls[axis].start == shape[axis]]
+
+    def _get_nufft(self, faxes, shape):
+        """Return kernels, input array and FFTW plan used by :meth:`_eval_nufft`
+
+        The kernels and plan are created once for each set of Fourier axes
+        and stored on the space.
+
+        Parameters
+        ----------
+        faxes : list of ints
+            The Fourier axes
+        shape : tuple of ints
+            Shape of the oversampled array of coefficients
+        """
+        if '_nufft' not in self.__dict__:
+            self._nufft = {}
+        tol = config['transforms']['nufft']['tol']
+        key = (tuple(faxes), tuple(shape), tol)
+        if key not in self._nufft:
+            kernels = [NUFFTKernel(self.bases[axis].N, tol) for axis in faxes]
+            opts = config['fftw']['ifft']
+            U = fftw.aligned(shape, dtype=complex)
+            ifftn = fftw.ifftn(U, axes=faxes, threads=opts['threads'],
+                               flags=(fftw.flag_dict[opts['planner_effort']],
+                                      fftw.flag_dict['FFTW_DESTROY_INPUT']))
+            self._nufft[key] = (kernels, U, ifftn)
+        return self._nufft[key]
+
+    def _eval_nufft(self, points, coefficients, output_array):
+        """Evaluate the local part of Function at points, using NUFFT
+
+        The Fourier axes that are not distributed in spectral space are
+        handled with a nonuniform FFT of type 2, see :mod:`.nufft`, on a
+        local oversampled mesh. The remaining axes use the basis functions
+        evaluated at the points. The returned partial sums must be reduced
+        over all processors, see :class:`.PointRouter`.
 
         Parameters
         ----------
@@ -819,32 +1121,87 @@ class TensorProductSpace(PFFT):
         output_array : array
             Return array, function values at points
         """
-        P = []
-        r2c = -1
-        last_conj_index = -1
-        sl = -1
-        for base in self:
-            axis = base.axis
-            x = base.map_reference_domain(points[axis])
-            D = base.evaluate_basis_all(x=x, argument=1)
-            P.append(D[..., self.local_slice()[axis]])
+        faxes = self._get_nufft_axes()
+        oaxes = [axis for axis in range(self.dimensions) if axis not in faxes]
+        ls = self.local_slice(True)
+        c = coefficients.__array__()
+        for axis, base in enumerate(self.bases):
             if isinstance(base, R2C):
-                r2c = axis
-                M = base.N//2+1
-                if base.N % 2 == 0:
-                    last_conj_index = M-1
-                else:
-                    last_conj_index = M
-                sl = self.local_slice()[axis].start
-        if len(self) == 2:
-            output_array = evaluate.evaluate_2D(output_array, coefficients, P, r2c, last_conj_index, sl)
+                # Account for the Hermitian symmetric coefficients not stored.
+                # The real part of the sum is taken in the end
+                i = np.arange(base.N//2+1)[ls[axis]]
+                c = c*base.broadcast_to_ndims(np.where((i > 0) & (i < (base.N+1)//2), 2, 1))
+        shape = list(c.shape)
+        tol = config['transforms']['nufft']['tol']
+        for axis in faxes:
+            shape[axis] = NUFFTKernel(self.bases[axis].N, tol).Mr
+        kernels, U, ifftn = self._get_nufft(faxes, shape)
+        index = [np.arange(n) for n in c.shape]
+        for axis, kernel in zip(faxes, kernels):
+            base = self.bases[axis]
+            k = base.wavenumbers(bcast=False)[ls[axis]]
+            c = c*base.broadcast_to_ndims(kernel.deconvolve(k))
+            index[axis] = np.mod(k, kernel.Mr)
+
+        U.fill(0)
+        U[np.ix_(*index)] = c
+        V = ifftn()
+        # Uniform mesh values along rows, remaining coefficients along columns
+        V = np.moveaxis(V, faxes, range(len(oaxes), self.dimensions))
+        Ko = int(np.prod(V.shape[:len(oaxes)]))
+        V = np.ascontiguousarray(V.reshape(Ko, -1).T)
+
+        stencils = [kernel.weights(self.bases[axis].map_reference_domain(points[axis]))
+                    for axis, kernel in zip(faxes, kernels)]
+        idx = np.ascontiguousarray([s[0] for s in stencils], dtype=np.intp)
+        W = np.ascontiguousarray([s[1] for s in stencils], dtype=float)
+        strides = np.cumprod([1]+[kernel.Mr for kernel in kernels[:0:-1]])[::-1].astype(np.intp)
+        v = nufft_interp(V, idx, W, np.ascontiguousarray(strides),
+                         np.zeros((points.shape[1], Ko), dtype=V.dtype))
+
+        if len(oaxes) > 0:
+            P = [self.bases[axis].evaluate_basis_all(x=self.bases[axis].map_reference_domain(points[axis]),
+                                                     argument=1)[:, ls[axis]] for axis in oaxes]
+            Pj = P[0]
+            for Pb in P[1:]:
+                Pj = (Pj[:, :, None]*Pb[:, None, :]).reshape(Pj.shape[0], -1)
+            v = np.einsum('jk,jk->j', Pj, v)
+        else:
+            v = v[:, 0]
+        output_array[:] = v.real if output_array.dtype.char in 'fdg' else v
+        return output_array
 
-        elif len(self) == 3:
-            output_array = evaluate.evaluate_3D(output_array, coefficients, P, r2c, last_conj_index, sl)
+    def _eval_cython(self, points, coefficients, output_array,
+                     distribution='replicated'):
+        """Evaluate Function at points, given expansion coefficients
 
-        output_array = np.atleast_1d(output_array)
-        output_array = comm.allreduce(output_array)
-        return output_array
+        Parameters
+        ----------
+        points : float or array of floats
+        coefficients : array
+            Expansion coefficients
+        output_array : array
+            Return array, function values at points
+        distribution : str, optional
+            'replicated', 'scattered' or 'gathered'. See :class:`.PointRouter`
+
+        Note
+        ----
+        The :class:`.EvalPlan` of the last points is stored on the space
+        and reused as long as the points do not change.
+        """
+        points = np.atleast_2d(points)
+        plan = self.__dict__.get('_eval_plan', None)
+        new = (plan is None or plan.router.distribution != distribution or
+               plan.points.shape != points.shape or not np.array_equal(plan.points, points))
+        if distribution != 'replicated':
+            # Creating a plan is collective when the points differ between processors
+            new = self.comm.allreduce(new, op=MPI.LOR)
+        if new:
+            plan = self._eval_plan = EvalPlan(self, points.copy(), distribution)
+        if output_array is None:
+            return plan(coefficients).copy()
+        return plan(coefficients, output_array)
 
     def wavenumbers(self, scaled=False, eliminate_highest_freq=False):
         """Return list of wavenumbers
@@ -1089,12 +1446,7 @@ class TensorProductSpace(PFFT):
             u *= dx
             return u
 
-        sym0 = dx.free_symbols
-        m = []
-        for sym in sym0:
-            j = 'xyzrs'.index(str(sym))
-            m.append(mesh[j])
-        xj = sp.lambdify(tuple(sym0), dx)(*m)
+        xj = lambdify_cache.evaluate(dx, mesh)
         u *= xj
         return u
 
@@ -1363,6 +1715,13 @@ class CompositeSpace:
     ----------
     spaces : list
         List of spaces
+
+    Note
+    ----
+    The transforms `forward`, `backward` and `scalar_product` take an optional
+    keyword `batched`. If True (default is ``config['transforms']['batched']``),
+    then all components are transformed together using a
+    :class:`.BatchedTransform`, if possible.
     """
 
     def __init__(self, spaces):
@@ -1375,7 +1734,17 @@ class CompositeSpace:
     def is_composite_space(self):
         return 1
 
-    def eval(self, points, coefficients, output_array=None, method=1):
+    def destroy(self):
+        """Free the batched transforms
+
+        The spaces of the components are not destroyed, since they may be
+        shared with other spaces.
+        """
+        for transform in (self.forward, self.backward, self.scalar_product):
+            transform.destroy()
+
+    def eval(self, points, coefficients, output_array=None, method=1,
+             distribution='replicated'):
         """Evaluate Function at points, given expansion coefficients
 
         Parameters
@@ -1391,11 +1760,15 @@ class CompositeSpace:
             implementation that, on the downside, uses more memory.
             The final, method = 2, is a python implementation used mainly
             for verification.
+        distribution : str, optional
+            'replicated', 'scattered' or 'gathered'. See :class:`.PointRouter`
         """
-        if output_array is None:
-            output_array = np.zeros((len(self.flatten()), points.shape[-1]), dtype=self.forward.input_array.dtype)
         for i, space in enumerate(self.flatten()):
-            output_array.__array__()[i] = space.eval(points, coefficients.__array__()[i], output_array.__array__()[i], method)
+            out = None if output_array is None else output_array.__array__()[i]
+            out = space.eval(points, coefficients.__array__()[i], out, method, distribution)
+            if output_array is None:
+                output_array = np.zeros((len(self.flatten()), out.shape[0]), dtype=out.dtype)
+            output_array.__array__()[i] = out
         return output_array
 
     def convolve(self, a_hat, b_hat, ab_hat):
@@ -1733,12 +2106,165 @@ class TensorSpace(VectorSpace):
             return TensorSpace(self.spaces[0].get_orthogonal())
         return TensorSpace([s.get_orthogonal() for s in self.spaces])
 
+class BatchedTransform:
+    """Class for transforming all components of a :class:`.CompositeSpace`
+    together
+
+    All components are moved between pencils in one global redistribution
+    (one ``Alltoallw``) for each step, instead of one for each component.
+    Components that share a :class:`.TensorProductSpace` are furthermore
+    transformed together by serial transforms planned for an additional
+    leading axis (FFTW's ``howmany``).
+
+    Parameters
+    ----------
+    transforms : list of transforms
+        The forward, backward or scalar_product transforms of each component
+        of a :class:`.CompositeSpace`
+
+    Note
+    ----
+    Only implemented for Cartesian spaces without padding, nonhomogeneous
+    boundary conditions or collapsed axes. Use :meth:`.is_batchable` to check.
+    """
+    def __init__(self, transforms):
+        assert self.is_batchable(transforms)
+        self.groups = []
+        self.slices = []
+        for i, transform in enumerate(transforms):
+            ids = [id(g) for g in self.groups]
+            if id(transform) in ids:
+                self.slices[ids.index(id(transform))].append(i)
+            else:
+                self.groups.append(transform)
+                self.slices.append([i])
+        self.xfftn = []
+        self.arrays = []
+        for transform, sl in zip(self.groups, self.slices):
+            xfftn, arrays = [], []
+            for x in transform._xfftn:
+                xb = self._plan_batched(x, len(sl))
+                xfftn.append(xb)
+                arrays.append((xb.input_array.reshape((len(sl),)+x.input_array.shape),
+                               xb.output_array.reshape((len(sl),)+x.output_array.shape)))
+            self.xfftn.append(xfftn)
+            self.arrays.append(arrays)
+        M = len(transforms)
+        self.transfer = []
+        self.buffers = []
+        for i, transfer in enumerate(transforms[0]._transfer):
+            tr = transfer.__self__
+            self.transfer.append(getattr(Transfer(tr.comm, (M,)+tr.shape, tr.dtype,
+                                                  (M,)+tr.subshapeA, tr.axisA+1,
+                                                  (M,)+tr.subshapeB, tr.axisB+1),
+                                         transfer.__name__))
+            A = self.arrays[0][i][1]
+            B = self.arrays[0][i+1][0]
+            if len(self.groups) == 1:
+                self.buffers.append((A, B))
+            else:
+                self.buffers.append((np.zeros((M,)+A.shape[1:], dtype=A.dtype),
+                                     np.zeros((M,)+B.shape[1:], dtype=B.dtype)))
+
+    @staticmethod
+    def _get_base(xfftn):
+        func = xfftn.func
+        while isinstance(func, FuncWrap):
+            func = func.func
+        return func.__self__, func.__name__
+
+    @staticmethod
+    def is_batchable(transforms):
+        """Return whether transforms can be executed as one batch
+
+        Parameters
+        ----------
+        transforms : list of transforms
+            The forward, backward or scalar_product transforms of each
+            component of a :class:`.CompositeSpace`
+        """
+        t0 = transforms[0]
+        if len(set(len(t._transfer) for t in transforms)) > 1:
+            return False
+        for t in transforms:
+            for xfftn in t._xfftn:
+                base = BatchedTransform._get_base(xfftn)[0]
+                T = base.tensorproductspace
+                if not isinstance(T, TensorProductSpace):
+                    return False
+                if not T.coors.is_cartesian or base.has_nonhomogeneous_bcs:
+                    return False
+                if base.padding_factor > 1.+1e-8:
+                    return False
+                if max([len(axes) for axes in T.axes]) > 1:
+                    return False
+            for tr0, tr1 in zip(t0._transfer, t._transfer):
+                a, b = tr0.__self__, tr1.__self__
+                if not (tr0.__name__ == tr1.__name__ and
+                        MPI.Comm.Compare(a.comm, b.comm) in (MPI.IDENT, MPI.CONGRUENT) and
+                        a.shape == b.shape and a.dtype == b.dtype and
+                        a.subshapeA == b.subshapeA and a.axisA == b.axisA and
+                        a.subshapeB == b.subshapeB and a.axisB == b.axisB):
+                    return False
+        return True
+
+    def _plan_batched(self, xfftn, m):
+        # Plan for all m components, with the array collapsed to 3D
+        # (before, along and after the axis of the transform), since the
+        # compiled solvers only handle up to three dimensions.
+        base, name = self._get_base(xfftn)
+        b = base.get_unplanned()
+        U = base.forward.input_array
+        axis = base.axis
+        shape = (m*int(np.prod(U.shape[:axis])), U.shape[axis],
+                 int(np.prod(U.shape[axis+1:])))
+        b.plan(shape, 1, U.dtype, {})
+        return getattr(b, name)
+
+    def __call__(self, input_array, output_array, kind=None, **kw):
+        input_array = input_array.__array__()
+        output_array = output_array.__array__()
+        single = len(self.groups) == 1
+        for s, arrays in zip(self.slices, self.arrays):
+            arrays[0][0][...] = input_array[s]
+        for i, transfer in enumerate(self.transfer):
+            arrayA, arrayB = self.buffers[i]
+            for s, xfftn, arrays in zip(self.slices, self.xfftn, self.arrays):
+                xfftn[i](kind=self._get_kind(xfftn[i], kind), **kw)
+                if not single:
+                    arrayA[s] = arrays[i][1]
+            transfer(arrayA, arrayB)
+            if not single:
+                for s, arrays in zip(self.slices, self.arrays):
+                    arrays[i+1][0][...] = arrayB[s]
+        for s, xfftn, arrays in zip(self.slices, self.xfftn, self.arrays):
+            xfftn[-1](kind=self._get_kind(xfftn[-1], kind), **kw)
+            output_array[s] = arrays[-1][1]
+        return output_array
+
+    def _get_kind(self, xfftn, kind):
+        if kind is None:
+            return None
+        family = self._get_base(xfftn)[0].family()
+        return kind.get(family, config['transforms']['kind'][family])
+
+    def destroy(self):
+        # The serial plans free themselves when garbage collected
+        for transfer in self.transfer:
+            transfer.__self__.destroy()
+        self.transfer = []
+        self.xfftn = []
+        self.arrays = []
+        self.buffers = []
+
+
 class VectorTransform:
 
-    __slots__ = ('_transforms',)
+    __slots__ = ('_transforms', '_batched')
 
     def __init__(self, transforms):
         self._transforms = []
+        self._batched = None
         for transform in transforms:
             if isinstance(transform, VectorTransform):
                 self._transforms += transform._transforms
@@ -1751,8 +2277,25 @@ class VectorTransform:
             return obj
         return getattr(obj[0], name)
 
-    def __call__(self, input_array, output_array, kind=None, **kw):
+    def get_batched(self):
+        """Return :class:`.BatchedTransform` for all components, or None if
+        the components cannot be transformed together"""
+        if self._batched is None:
+            self._batched = False
+            if BatchedTransform.is_batchable(self._transforms):
+                self._batched = BatchedTransform(self._transforms)
+        return self._batched if self._batched else None
+
+    def destroy(self):
+        if self._batched:
+            self._batched.destroy()
+        self._batched = None
+
+    def __call__(self, input_array, output_array, kind=None, batched=None, **kw):
         mesh = kw.get('mesh', None) # only backward transform
+        batched = config['transforms']['batched'] if batched is None else batched
+        if batched and mesh is None and self.get_batched() is not None:
+            return self._batched(input_array, output_array, kind=kind, **kw)
         for i, transform in enumerate(self._transforms):
             if mesh is not None:
                 mi = mesh[i] if isinstance(mesh, CompositeSpace) else mesh
@@ -1763,6 +2306,241 @@ class VectorTransform:
         return output_array
 
 
+class PointRouter:
+    """Distribution of points for evaluating distributed Functions
+
+    The expansion coefficients of a :class:`.TensorProductSpace` are
+    distributed, and each processor can only compute a partial sum for the
+    value of a Function at a point. The partial sums need to be reduced
+    over all processors.
+
+    With distribution 'replicated' all processors hold the same points and
+    the partial sums are reduced with one global allreduce. Otherwise, each
+    processor holds its own points, the owner of these points. All points
+    are then gathered, and the partial sums are routed to the owners with
+    one reduce-scatter for each distributed axis of the coefficients, over
+    the subcommunicator of that axis. A processor thus only receives the
+    values of its own points, and only reduces with the processors that
+    share its slice of the coefficients along the remaining axes. The
+    values may subsequently be gathered on all processors.
+
+    Note
+    ----
+    The value at any point depends on all the expansion coefficients, and
+    each processor holds a different slice of these. Every processor must
+    hence compute partial sums for all points, no matter which processor
+    owns them. The cost of gathering the points, O(M) for M points in
+    total, and of the partial sums, O(MN/P) for N coefficients on P
+    processors, is thus the same as for 'replicated'. The routing only
+    reduces the communication of the results, from an allreduce of all M
+    values to reduce-scatters that deliver each processor its own values.
+
+    Parameters
+    ----------
+    T : :class:`.TensorProductSpace`
+    points : array
+        Array of shape (D, N), for N points in D dimensions
+    distribution : str, optional
+
+        - 'replicated' - all processors hold the same points and get
+          the same result
+        - 'scattered' - each processor holds its own points and gets
+          the result for its own points only
+        - 'gathered' - each processor holds its own points, and all
+          processors get the result for all points, ordered by rank
+
+    Attributes
+    ----------
+    points : array
+        All points evaluated by this processor, of shape (D, M)
+    output_size : int
+        Number of values returned by :meth:`reduce`
+    """
+    def __init__(self, T, points, distribution='replicated'):
+        assert distribution in ('replicated', 'scattered', 'gathered')
+        points = np.atleast_2d(points)
+        self.distribution = distribution
+        self.comm = comm = T.comm
+        if distribution == 'replicated':
+            self.points = points
+            self.output_size = points.shape[1]
+            return
+        subcomm = T.subcomm if isinstance(T.subcomm, (tuple, list)) else ()
+        self.subcomm = [c for c in subcomm if c.Get_size() > 1]
+        coords = tuple(c.Get_rank() for c in self.subcomm)
+        rank = comm.Get_rank()
+        n = points.shape[1]
+        info = comm.allgather((coords, n))
+        counts = np.array([i[1] for i in info])
+        # Owners sorted such that each subcommunicator reduces over
+        # contiguous blocks of points
+        order = sorted(range(comm.Get_size()), key=lambda r: (info[r][0], r))
+        displs = np.zeros(comm.Get_size(), dtype=int)
+        displs[order] = np.cumsum(counts[order]) - counts[order]
+        D = points.shape[0]
+        allpoints = np.zeros((counts.sum(), D), dtype=float)
+        comm.Allgatherv(np.ascontiguousarray(points.T, dtype=float),
+                        [allpoints, (counts*D, displs*D)])
+        self.points = allpoints.T
+        self.stages = []
+        for i, c in enumerate(self.subcomm):
+            group = [r for r in order if info[r][0][:i] == coords[:i]]
+            scounts = np.zeros(c.Get_size(), dtype=int)
+            for r in group:
+                scounts[info[r][0][i]] += counts[r]
+            self.stages.append(scounts)
+        # Owners not separated by the subcommunicators (e.g., for a
+        # non-distributed space) all compute the same values
+        group = [r for r in order if info[r][0] == coords]
+        start = sum(counts[r] for r in group[:group.index(rank)])
+        self.local = slice(start, start+n)
+        self.counts = counts
+        self.displs = np.zeros(comm.Get_size(), dtype=int)
+        self.displs[1:] = np.cumsum(counts)[:-1]
+        self.output_size = counts.sum() if distribution == 'gathered' else n
+
+    def reduce(self, partial, output_array):
+        """Return reduced values of the points
+
+        Parameters
+        ----------
+        partial : array
+            Partial sums for all points in :attr:`points`. Overwritten
+        output_array : array
+            Return array of size :attr:`output_size`
+        """
+        if self.distribution == 'replicated':
+            if partial is not output_array:
+                output_array[:] = partial
+            self.comm.Allreduce(MPI.IN_PLACE, output_array)
+            return output_array
+        for c, scounts in zip(self.subcomm, self.stages):
+            recv = np.empty(scounts[c.Get_rank()], dtype=partial.dtype)
+            c.Reduce_scatter(partial, recv, scounts, op=MPI.SUM)
+            partial = recv
+        local = partial[self.local]
+        if self.distribution == 'scattered':
+            output_array[:] = local
+            return output_array
+        self.comm.Allgatherv(np.ascontiguousarray(local),
+                             [output_array, (self.counts, self.displs)])
+        return output_array
+
+
+class EvalPlan:
+    """Plan for repeated evaluation of Functions at fixed points
+
+    The basis functions of all axes are evaluated at the points, for the
+    local slice of the expansion coefficients, once, when the plan is
+    created. Each evaluation is then only a contraction with the
+    coefficients.
+
+    Parameters
+    ----------
+    T : :class:`.TensorProductSpace` or :class:`.CompositeSpace`
+        The space of the Functions to evaluate
+    points : array
+        Array of shape (D, N), for N points in D dimensions
+    distribution : str, optional
+        'replicated', 'scattered' or 'gathered'. With 'replicated' (default)
+        all processors hold the same points. Otherwise each processor holds
+        its own points, and the result is routed to the owner of the points.
+        See :class:`.PointRouter`.
+
+    Example
+    -------
+    >>> import numpy as np
+    >>> from mpi4py import MPI
+    >>> from shenfun import FunctionSpace, TensorProductSpace, Function, EvalPlan
+    >>> K0 = FunctionSpace(8, 'C')
+    >>> K1 = FunctionSpace(8, 'F', dtype='d')
+    >>> T = TensorProductSpace(MPI.COMM_WORLD, (K0, K1))
+    >>> u_hat = Function(T)
+    >>> u_hat[1, 1] = 1
+    >>> plan = EvalPlan(T, np.array([[0.5, 0.8], [0.2, 0.3]]))
+    >>> u = plan(u_hat)
+    >>> assert np.allclose(u, u_hat.eval(plan.points))
+
+    Note
+    ----
+    The returned array is by default owned by the plan, and is overwritten
+    by the next evaluation.
+    """
+    def __init__(self, T, points, distribution='replicated'):
+        points = np.atleast_2d(points)
+        self.function_space = T
+        self.points = points
+        dtype = T.forward.input_array.dtype
+        if T.is_composite_space:
+            plans = {}
+            self.plans = []
+            for space in T.flatten():
+                if id(space) not in plans:
+                    plans[id(space)] = EvalPlan(space, points, distribution)
+                self.plans.append(plans[id(space)])
+            N = self.plans[0].output_array.shape[0]
+            self.output_array = np.zeros((len(self.plans), N), dtype=dtype)
+            return
+        assert T.dimensions in (2, 3), 'EvalPlan only implemented for 2D and 3D'
+        self.plans = None
+        self.router = PointRouter(T, points, distribution)
+        points = self.router.points
+        self.P = []
+        self.r2c = -1
+        self.last_conj_index = -1
+        self.start = -1
+        for base in T:
+            axis = base.axis
+            x = base.map_reference_domain(points[axis])
+            D = base.evaluate_basis_all(x=x, argument=1)
+            self.P.append(D[..., T.local_slice()[axis]])
+            if isinstance(base, R2C):
+                self.r2c = axis
+                M = base.N//2+1
+                if base.N % 2 == 0:
+                    self.last_conj_index = M-1
+                else:
+                    self.last_conj_index = M
+                self.start = T.local_slice()[axis].start
+        self.output_array = np.zeros(self.router.output_size, dtype=dtype)
+        self._partial = None
+        # Partial sums are computed in double precision
+        pdtype = np.result_type(dtype, np.float64)
+        if distribution != 'replicated' or pdtype != dtype:
+            self._partial = np.zeros(points.shape[-1], dtype=pdtype)
+
+    def __call__(self, coefficients, output_array=None):
+        """Return Function evaluated at the points of the plan
+
+        Parameters
+        ----------
+        coefficients : array
+            Expansion coefficients, or instance of :class:`.Function`
+        output_array : array, optional
+            Return array, function values at points. If not given, then
+            use array owned by the plan.
+        """
+        if output_array is None:
+            output_array = self.output_array
+        if self.plans is not None:
+            for i, plan in enumerate(self.plans):
+                plan(coefficients.__array__()[i], output_array.__array__()[i])
+            return output_array
+
+        output_array = np.atleast_1d(output_array)
+        partial = output_array if self._partial is None else self._partial
+        partial[:] = 0
+        args = (partial, coefficients, self.P, self.r2c,
+                self.last_conj_index, self.start)
+        if len(self.P) == 2:
+            b = evaluate.evaluate_2D(*args)
+        elif len(self.P) == 3:
+            b = evaluate.evaluate_3D(*args)
+        if b is not partial:
+            partial[:] = b
+        return self.router.reduce(partial, output_array)
+
+
 class Convolve:
     r"""Class for convolving without truncation.
 
@@ -1920,17 +2698,9 @@ class BoundaryValues:
             for j, bci in enumerate(self.bc.orderedvals()):
                 if isinstance(bci, sp.Expr):
                     X = T.local_mesh(True)
-                    for sym in bci.free_symbols:
-                        tt = sp.symbols('t', real=True)
-                        if sym == tt:
-                            bci = bci.subs(tt, self.bc_time)
-                    sym0 = bci.free_symbols
-                    lbci = sp.lambdify(tuple(sym0), bci, 'numpy')
-                    Yi = []
-                    for sym in sym0:
-                        k = 'xyzrs'.index(str(sym))
-                        Yi.append(X[k][this_base.si[j]])
-                    f_bci = lbci(*Yi)
+                    tt = sp.symbols('t', real=True)
+                    subs = {tt: self.bc_time} if tt in bci.free_symbols else None
+                    f_bci = lambdify_cache.evaluate(bci, [Xk[this_base.si[j]] for Xk in X], subs=subs)
                     # Put the value in the position of the bc dofs
                     if s.stop == int(this_base.N*this_base.padding_factor):
                         b[this_base.si[-num_bcs+j]] = f_bci
@@ -1966,7 +2736,6 @@ class BoundaryValues:
 
             if len(T.get_nonhomogeneous_axes()) == 1:
                 for j, bci in enumerate(self.bc.orderedvals()):
-                    from .spectralbase import FuncWrap
                     if number_of_bases_after_this == 0:
                         # Inhomogeneous base is the first to be transformed
                         b_hat = b
@@ -6,16 +6,19 @@ try:
     from collections.abc import MutableMapping
 except ImportError:
     from collections import MutableMapping
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import numpy as np
 import sympy as sp
 from scipy.fftpack import dct
+from scipy.special import sph_harm, erf, airy, jn, gammaln
 from shenfun.optimization import runtimeoptimizer
 from shenfun.optimization.cython import Lambda
 from shenfun.config import config
+from mpi4py_fft import fftw
 from .findbasis import get_bc_basis, get_stencil_matrix, n
 
-__all__ = ['dx', 'clenshaw_curtis1D', 'CachedArrayDict', 'surf3D',
+__all__ = ['dx', 'clenshaw_curtis1D', 'CachedArrayDict', 'ArrayPool',
+           'array_pool', 'LambdifyCache', 'lambdify_cache', 'surf3D',
            'wrap_periodic', 'outer', 'dot', 'apply_mask', 'integrate_sympy',
            'mayavi_show', 'quiver3D', 'get_bc_basis', 'get_stencil_matrix',
            'scalar_product', 'n', 'cross', 'reset_profile', 'Lambda']
@@ -131,6 +134,302 @@ class CachedArrayDict(MutableMapping):
     def values(self):
         raise TypeError('Cached work arrays not iterable')
 
+class ArrayPool(CachedArrayDict):
+    """Reference counted pool of aligned work arrays
+
+    Work arrays are shared by all users that acquire an array with the same
+    shape, dtype and tag. The tag distinguishes arrays that need to be live
+    at the same time, like the input and output arrays of a transform. An
+    array is freed when all its users have released it.
+
+    Arrays acquired with ``shared=False`` are never shared, but are still
+    counted by :meth:`report`.
+
+    Example
+    -------
+
+    >>> from shenfun.utilities import ArrayPool
+    >>> pool = ArrayPool()
+    >>> a = pool.acquire((3, 4), float, 'U')
+    >>> b = pool.acquire((3, 4), float, 'U')
+    >>> a is b
+    True
+    >>> c = pool.acquire((3, 4), float, 'U', shared=False)
+    >>> pool.report()['saved']
+    96
+    >>> pool.release(a); pool.release(b); pool.release(c)
+    >>> len(pool)
+    0
+    """
+    def __init__(self):
+        CachedArrayDict.__init__(self)
+        self._refs = {}
+        self._keys = {}
+        self._private = 0
+
+    def __getitem__(self, key):
+        newkey, fill = self.__keytransform__(key)
+        value = self._get(newkey)
+        if fill:
+            value.fill(0)
+        return value
+
+    def __setitem__(self, key, value):
+        newkey = self.__keytransform__(key)[0]
+        if newkey in self._data:
+            del self[key]
+        self._data[newkey] = value
+        self._refs[newkey] = 0
+        self._keys[id(value)] = newkey
+
+    def __delitem__(self, key):
+        newkey = self.__keytransform__(key)[0]
+        value = self._data.pop(newkey)
+        del self._refs[newkey]
+        del self._keys[id(value)]
+
+    def acquire(self, shape, dtype, tag=0, shared=True):
+        """Return aligned work array and increase its reference count
+
+        Parameters
+        ----------
+        shape : sequence of ints
+            Shape of array
+        dtype : Numpy dtype
+            Type of array
+        tag : hashable, optional
+            Arrays with different tags are never shared
+        shared : bool, optional
+            Whether the array may be shared with others
+
+        Note
+        ----
+        The content of a shared array is undefined when acquired.
+        """
+        if not shared:
+            self._private += 1
+            tag = ('private', self._private)
+        key = (tuple(np.atleast_1d(shape).tolist()), np.dtype(dtype), tag)
+        value = self._get(key)
+        self._refs[key] += 1
+        return value
+
+    def _get(self, key):
+        try:
+            return self._data[key]
+        except KeyError:
+            value = fftw.aligned(key[0], dtype=key[1])
+            self._data[key] = value
+            self._refs[key] = 0
+            self._keys[id(value)] = key
+            return value
+
+    def release(self, array):
+        """Decrease reference count of `array` and free it if unused
+
+        Parameters
+        ----------
+        array : array
+            Array previously returned by :meth:`acquire`
+        """
+        key = self._keys[id(array)]
+        self._refs[key] -= 1
+        if self._refs[key] == 0:
+            del self._data[key]
+            del self._refs[key]
+            del self._keys[id(array)]
+
+    def release_all(self, arrays):
+        """Release all arrays in list `arrays` and empty the list
+
+        Parameters
+        ----------
+        arrays : list
+            Arrays previously returned by :meth:`acquire`
+        """
+        while arrays:
+            self.release(arrays.pop())
+
+    def report(self):
+        """Return memory used by the pool
+
+        Returns
+        -------
+        dict
+            With keys
+
+            - 'arrays' - Number of allocated arrays
+            - 'allocated' - Bytes allocated
+            - 'requested' - Bytes that would be allocated without sharing
+            - 'saved' - Bytes saved by sharing
+        """
+        allocated = sum(a.nbytes for a in self._data.values())
+        requested = sum(a.nbytes*max(1, self._refs[key]) for key, a in self._data.items())
+        return {'arrays': len(self._data),
+                'allocated': allocated,
+                'requested': requested,
+                'saved': requested-allocated}
+
+array_pool = ArrayPool()
+
+# Special functions used by sympy expressions for initial and boundary data
+special_functions = {
+    'airyai': lambda x: airy(x)[0],
+    'cot': lambda x: 1/np.tan(x),
+    'Ynm': lambda n, m, x, y: sph_harm(m, n, y, x),
+    'erf': erf,
+    'besselj': jn,
+    'loggamma': gammaln
+}
+
+class LambdifyCache:
+    """Bounded cache of sympy expressions compiled to array functions
+
+    Expressions are compiled with :func:`sympy.lambdify` only the first
+    time they are evaluated. The compiled functions are called with the
+    broadcasted (sparse) local mesh of a function space, such that the
+    full mesh is never created.
+
+    Parameters
+    ----------
+    maxitems : int, optional
+        Maximum number of compiled expressions kept. The least recently
+        used are discarded first. Defaults to
+        config['optimization']['lambdify']['maxitems'].
+
+    Note
+    ----
+    The backend is chosen by config['optimization']['lambdify']['backend']
+
+        - 'numpy' - Regular numpy expressions
+        - 'numexpr' - Multithreaded, and without temporary arrays, using
+          numexpr
+        - 'numba' - Compiled to a broadcasting ufunc using
+          :func:`numba.vectorize`
+
+    If an expression cannot be evaluated with the chosen backend, e.g.,
+    because it contains special functions, then the numpy backend is used
+    for that expression. The backend actually used by the last call is
+    stored in the attribute `last_backend`.
+
+    Example
+    -------
+    >>> import numpy as np
+    >>> import sympy as sp
+    >>> from shenfun.utilities import LambdifyCache
+    >>> x, y = sp.symbols('x,y', real=True)
+    >>> cache = LambdifyCache()
+    >>> mesh = (np.linspace(0, 1, 3)[:, None], np.linspace(0, 1, 4)[None, :])
+    >>> cache.evaluate(x*y+1, mesh).shape
+    (3, 4)
+    >>> cache.evaluate(x*y+1, mesh).shape
+    (3, 4)
+    >>> cache.hits, cache.misses
+    (1, 1)
+    """
+    def __init__(self, maxitems=None):
+        self.maxitems = maxitems
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.last_backend = None
+
+    @staticmethod
+    def symbols(expr, subs=()):
+        """Return the free symbols of `expr`, sorted by name
+
+        Parameters
+        ----------
+        expr : sympy Expr
+        subs : sequence of symbols, optional
+            Symbols that are not coordinates, but given as arguments
+            in :meth:`evaluate`. These are placed last.
+        """
+        syms = [sym for sym in expr.free_symbols if sym not in subs]
+        syms = sorted(syms, key=str)
+        return tuple(syms) + tuple(subs)
+
+    def compile(self, expr, syms, backend):
+        if backend == 'numexpr':
+            return sp.lambdify(syms, expr, 'numexpr')
+        if backend == 'numba':
+            import numba
+            return numba.vectorize(sp.lambdify(syms, expr, 'math'))
+        return sp.lambdify(syms, expr, modules=['numpy', special_functions])
+
+    def __call__(self, expr, syms, backend=None):
+        """Return compiled function for `expr` with arguments `syms`
+
+        Parameters
+        ----------
+        expr : sympy Expr
+        syms : tuple of symbols
+        backend : str, optional
+            'numpy', 'numexpr' or 'numba'. Defaults to
+            config['optimization']['lambdify']['backend']
+        """
+        conf = config['optimization']['lambdify']
+        backend = conf['backend'] if backend is None else backend
+        maxitems = conf['maxitems'] if self.maxitems is None else self.maxitems
+        key = (expr, syms, backend)
+        if key in self._data:
+            self.hits += 1
+            self._data.move_to_end(key)
+            f, self.last_backend = self._data[key]
+            return f
+        self.misses += 1
+        try:
+            f = self.compile(expr, syms, backend)
+        except Exception:
+            backend = 'numpy'
+            f = self.compile(expr, syms, backend)
+        self.last_backend = backend
+        if maxitems > 0:
+            self._data[key] = (f, backend)
+            while len(self._data) > maxitems:
+                self._data.popitem(last=False)
+        return f
+
+    def evaluate(self, expr, mesh, subs=None, backend=None):
+        """Return `expr` evaluated on `mesh`
+
+        Parameters
+        ----------
+        expr : sympy Expr
+        mesh : array or sequence of arrays
+            The (broadcastable) mesh of each coordinate, in the order
+            of 'xyzrs'. A single array is the mesh of a 1D space, and then
+            `expr` may use any one symbol for the coordinate.
+        subs : dict, optional
+            Values of other symbols in `expr`, like time. These are
+            arguments of the compiled function, such that new values do
+            not lead to recompilation.
+        backend : str, optional
+            'numpy', 'numexpr' or 'numba'
+        """
+        subs = {} if subs is None else subs
+        syms = self.symbols(expr, tuple(subs.keys()))
+        if isinstance(mesh, np.ndarray):
+            args = [mesh for sym in syms[:len(syms)-len(subs)]]
+        else:
+            args = [mesh['xyzrs'.index(str(sym))] for sym in syms[:len(syms)-len(subs)]]
+        args += list(subs.values())
+        f = self(expr, syms, backend)
+        try:
+            return f(*args)
+        except Exception:
+            if self.last_backend == 'numpy':
+                raise
+            return self(expr, syms, 'numpy')(*args)
+
+    def clear(self):
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+        self.last_backend = None
+
+lambdify_cache = LambdifyCache()
+
 def reset_profile(prof):
     """Reset profiler for kernprof
 
@@ -339,12 +638,7 @@ def dot(u, v, output_array=None, forward_output=True):
         gij = Vu.coors.get_metric_tensor(config['basisvectors'])
         mesh = Vup.local_mesh(True)
         def measure(g):
-            sym0 = g.free_symbols
-            m = []
-            for sym in sym0:
-                j = 'xyzrs'.index(str(sym))
-                m.append(mesh[j])
-            return sp.lambdify(tuple(sym0), g)(*m)
+            return lambdify_cache.evaluate(g, mesh)
 
         if Vu.tensor_rank == 1 and Vv.tensor_rank == 1:
             if Vu.coors.is_orthogonal:
@@ -413,6 +707,29 @@ def apply_mask(u_hat, mask):
         u_hat *= mask
     return u_hat
 
+@runtimeoptimizer
+def diff_recursion(a, b, s):
+    r"""Backward recurrence :math:`b_n = b_{n+2} + s_{n+1} a_{n+1}`
+
+    Used for the coefficients of derivatives of orthogonal polynomials.
+
+    Parameters
+    ----------
+    a : array of shape (P, N, Q)
+        Input coefficients along the second axis
+    b : array of shape (P, N, Q)
+        Output array, not overlapping with `a`
+    s : array of shape (N,)
+        Weights
+    """
+    N = a.shape[1]
+    b[:, N-1] = 0
+    if N > 1:
+        b[:, N-2] = s[N-1]*a[:, N-1]
+    for i in range(N-3, -1, -1):
+        b[:, i] = b[:, i+2] + s[i+1]*a[:, i+1]
+    return b
+
 def integrate_sympy(f, d):
     """Exact definite integral using sympy
 
@@ -0,0 +1,150 @@
+"""
+Module for content-addressed on-disk caching of Numpy arrays
+"""
+import os
+import hashlib
+import tempfile
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+import numpy as np
+
+__all__ = ['DiskCache', 'get_cache_key']
+
+
+def get_cache_key(key):
+    """Return content address (hex digest) of `key`
+
+    Parameters
+    ----------
+    key : object
+        Any object with a deterministic `repr`, typically a tuple of
+        strings and numbers.
+    """
+    return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+
+
+class DiskCache(MutableMapping):
+    """Content-addressed cache of Numpy arrays stored on disk
+
+    Each item is a dictionary of named Numpy arrays, stored in one
+    compressed `.npz` file with the name given by the hash of the key.
+    The cache is bounded both in total size and in number of items. When
+    a bound is exceeded, the least recently used items are evicted.
+
+    Parameters
+    ----------
+    path : str
+        Directory used for storage. Created if it does not exist
+    maxbytes : int, optional
+        Maximum total size of the cache in bytes. No limit if None
+    maxitems : int, optional
+        Maximum number of items in the cache. No limit if None
+
+    Example
+    -------
+    >>> import numpy as np
+    >>> from tempfile import mkdtemp
+    >>> from shenfun.utilities.diskcache import DiskCache
+    >>> cache = DiskCache(mkdtemp())
+    >>> cache[('A', 2)] = {'a': np.arange(3)}
+    >>> cache[('A', 2)]['a']
+    array([0, 1, 2])
+    >>> ('A', 3) in cache
+    False
+
+    Note
+    ----
+    Items are written to a temporary file that is atomically moved in place,
+    such that several processes (e.g., MPI ranks) may share the same cache.
+    """
+    suffix = '.npz'
+
+    def __init__(self, path, maxbytes=None, maxitems=None):
+        self.path = os.path.expanduser(os.path.expandvars(path))
+        self.maxbytes = maxbytes
+        self.maxitems = maxitems
+        os.makedirs(self.path, exist_ok=True)
+
+    def filename(self, key):
+        return os.path.join(self.path, get_cache_key(key)+self.suffix)
+
+    def __getitem__(self, key):
+        fl = self.filename(key)
+        try:
+            with np.load(fl, allow_pickle=False) as f:
+                value = {name: f[name] for name in f.files}
+        except (FileNotFoundError, OSError, ValueError) as e:
+            raise KeyError(key) from e
+        try:
+            os.utime(fl) # Mark as recently used
+        except OSError:
+            pass
+        return value
+
+    def __setitem__(self, key, value):
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, **value)
+            os.replace(tmp, self.filename(key))
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        self.evict()
+
+    def __delitem__(self, key):
+        try:
+            os.remove(self.filename(key))
+        except FileNotFoundError as e:
+            raise KeyError(key) from e
+
+    def __contains__(self, key):
+        return os.path.isfile(self.filename(key))
+
+    def __iter__(self):
+        # Keys are not stored, only their hashes
+        return iter(self._files())
+
+    def __len__(self):
+        return len(self._files())
+
+    def _files(self):
+        return [os.path.join(self.path, f) for f in os.listdir(self.path)
+                if f.endswith(self.suffix)]
+
+    def nbytes(self):
+        """Return total size of cache in bytes"""
+        return sum(os.path.getsize(f) for f in self._files())
+
+    def evict(self):
+        """Remove least recently used items until cache is within bounds"""
+        if self.maxbytes is None and self.maxitems is None:
+            return
+        files = []
+        for f in self._files():
+            try:
+                st = os.stat(f)
+            except FileNotFoundError:
+                continue
+            files.append((st.st_mtime, st.st_size, f))
+        files.sort()
+        nbytes = sum(f[1] for f in files)
+        maxbytes = np.inf if self.maxbytes is None else self.maxbytes
+        maxitems = np.inf if self.maxitems is None else self.maxitems
+        while files and (nbytes > maxbytes or len(files) > maxitems):
+            _, size, f = files.pop(0)
+            try:
+                os.remove(f)
+            except FileNotFoundError:
+                pass
+            nbytes -= size
+
+    def clear(self):
+        for f in self._files():
+            try:
+                os.remove(f)
+            except FileNotFoundError:
+                pass
@@ -41,6 +41,7 @@ as they assume all matrices are diagonal.
 """
 import copy
 import types
+from collections import OrderedDict
 import numpy as np
 from shenfun import Function, TPMatrix, TrialFunction, TestFunction,\
     inner, la, Expr, CompositeSpace, BlockMatrix, SparseMatrix, \
@@ -600,6 +601,40 @@ class RK4(IntegratorBase):
         return u_hat
 
 
+def get_matrices(mats):
+    """Return `mats` as list of matrices"""
+    return mats if isinstance(mats, list) else [mats]
+
+
+class OperatorCache(OrderedDict):
+    """Least recently used cache of factorized implicit operators
+
+    The cache is keyed on (stage, dt), such that adaptive time stepping
+    alternating between a few time steps reuses the already factorized
+    solvers.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of items in the cache. The least recently used item
+        is evicted when exceeded.
+    """
+    def __init__(self, maxsize=8):
+        OrderedDict.__init__(self)
+        self.maxsize = maxsize
+
+    def __getitem__(self, key):
+        value = OrderedDict.__getitem__(self, key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        OrderedDict.__setitem__(self, key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
 class IMEXRK3:
     r"""Solve partial differential equations of the form
 
@@ -627,22 +662,33 @@ class IMEXRK3:
         Time step
     solver : Linear solver, optional
     name : str, optional
+    maxcache : int, optional
+        Maximum number of time steps to keep factorized solvers for
+
+    Note
+    ----
+    Use :meth:`set_dt` to change the time step. The solvers of each time
+    step are cached, see :class:`.OperatorCache`.
     """
-    def __init__(self, v, u, L, N, dt, solver=None, name='U-equation', latex=None):
+    def __init__(self, v, u, L, N, dt, solver=None, name='U-equation', latex=None,
+                 maxcache=4):
         self.v = v
         self.u = u if isinstance(u, Expr) else Expr(u)
         self.u_ = self.u.basis()
         self.L = L
         self.N = N
         self.dt = dt
+        self.cache = OperatorCache(maxcache*self.steps())
+        self._mass = None
+        self._linear = None
         T = self.T = v.function_space()
         self._solver = solver
         if solver is None:
             if v.dimensions == 1:
                 self._solver = la.Solver
-            elif len(T.get_nondiagonal_axes().ndim) == 1:
+            elif len(T.get_nondiagonal_axes()) == 1:
                 self._solver = la.SolverGeneric1ND
-            elif len(T.get_nondiagonal_axes().ndim) == 2:
+            elif len(T.get_nondiagonal_axes()) == 2:
                self._solver = la.SolverGeneric2ND
             else:
                 raise NotImplementedError
@@ -669,16 +715,12 @@ class IMEXRK3:
         return a, b, c
 
     def assemble(self):
-        a, b, _ = self.stages()
-        dt = self.dt
         ul = copy.copy(self.u)
         ul._basis = TrialFunction(self.u.function_space())
-        L1 = self.L(ul)
-        L2 = self.L(self.u)
-        for rk in range(len(a)):
-            mats = inner(self.v, ul - (a[rk]+b[rk])*dt/2*L1)
-            self.solvers.append(self._solver(mats))
-            self.linear_rhs.append(Inner(self.v, self.u + (a[rk]+b[rk])*dt/2*L2))
+        self._mass = get_matrices(inner(self.v, ul))
+        self._linear = get_matrices(inner(self.v, self.L(ul)))
+        self.cache.clear()
+        self.set_dt(self.dt)
         if isinstance(self.N, (Expr, Function)):
             self.nonlinear_rhs = Inner(self.v, self.N)
         elif isinstance(self.N, list):
@@ -686,6 +728,34 @@ class IMEXRK3:
         else:
             raise RuntimeError('Wrong type of nonlinear expression')
 
+    def set_dt(self, dt):
+        """Set time step
+
+        Parameters
+        ----------
+        dt : number
+            The new time step
+
+        Note
+        ----
+        The solvers are rescaled from the already assembled mass and linear
+        matrices, and only factorized for time steps not in the cache.
+        """
+        a, b, _ = self.stages()
+        self.dt = dt
+        self.solvers = []
+        self.linear_rhs = []
+        for rk in range(len(a)):
+            key = (rk, dt)
+            if key not in self.cache:
+                c = (a[rk]+b[rk])*dt/2
+                mats = self._mass + [-c*mat for mat in self._linear]
+                self.cache[key] = (self._solver(mats),
+                                   Inner(self.v, self.u + c*self.L(self.u)))
+            solver, linear_rhs = self.cache[key]
+            self.solvers.append(solver)
+            self.linear_rhs.append(linear_rhs)
+
     def compute_rhs(self, rk=0):
         a, b, _ = self.stages()
         w0 = self.nonlinear_rhs()
@@ -735,14 +805,25 @@ class PDEIMEXRK:
     name : str, optional
     latex : str, optional
         optional representation of the equation to solve
+    maxcache : int, optional
+        Maximum number of time steps to keep factorized solvers for
+
+    Note
+    ----
+    Use :meth:`set_dt` to change the time step. The solvers of each time
+    step are cached, see :class:`.OperatorCache`.
     """
-    def __init__(self, v, u, L, N, dt, solver=None, name='U-equation', latex=None):
+    def __init__(self, v, u, L, N, dt, solver=None, name='U-equation', latex=None,
+                 maxcache=4):
         self.v = v
         self.u = u if isinstance(u, Expr) else Expr(u)
         self.u_ = self.u.basis()
         self.L = L
         self.N = N
         self.dt = dt
+        self.cache = OperatorCache(maxcache)
+        self._mass = None
+        self._linear = None
         self._solver = solver
         if solver is None:
             if v.dimensions > 1:
@@ -780,12 +861,12 @@ class PDEIMEXRK:
         raise NotImplementedError
 
     def assemble(self):
-        a = self.stages()[0]
-        dt = self.dt
         ul = copy.copy(self.u)
         ul._basis = TrialFunction(self.u.function_space())
-        mats = inner(self.v, ul - dt*a[1, 1]*self.L(ul))
-        self.solvers.append(self._solver(mats))
+        self._mass = get_matrices(inner(self.v, ul))
+        self._linear = get_matrices(inner(self.v, self.L(ul)))
+        self.cache.clear()
+        self.set_dt(self.dt)
         self.linear_rhs = Inner(self.v, self.L(self.u))
         self.u0_rhs = Inner(self.v, self.u)
         if isinstance(self.N, (Expr, Function)):
@@ -795,6 +876,28 @@ class PDEIMEXRK:
         else:
             raise RuntimeError('Wrong type of nonlinear expression')
 
+    def set_dt(self, dt):
+        """Set time step
+
+        Parameters
+        ----------
+        dt : number
+            The new time step
+
+        Note
+        ----
+        The solver is rescaled from the already assembled mass and linear
+        matrices, and only factorized for time steps not in the cache.
+        """
+        a = self.stages()[0]
+        self.dt = dt
+        # only one stage since the diagonal of a is constant
+        key = (0, dt)
+        if key not in self.cache:
+            mats = self._mass + [(-dt*a[1, 1])*mat for mat in self._linear]
+            self.cache[key] = self._solver(mats)
+        self.solvers = [self.cache[key]]
+
     def compute_rhs(self, rk=0):
         a, b = self.stages()[:2]
         self.Krhs[rk] = self.nonlinear_rhs()
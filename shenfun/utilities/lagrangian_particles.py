@@ -1,5 +1,7 @@
 import numpy as np
 from mpi4py import MPI
+from shenfun.tensorproductspace import EvalPlan
+from shenfun.fourier.bases import FourierBase
 
 comm = MPI.COMM_WORLD
 
@@ -8,6 +10,11 @@ __all__ = ['LagrangianParticles']
 class LagrangianParticles:
     """Class for tracking Lagrangian particles
 
+    Particles are stored as a struct of arrays, with positions ``x`` of
+    shape (D, N), velocities ``up`` of shape (D, N) and global particle
+    ids ``ids`` of shape (N,), for N particles on this processor in D
+    dimensions.
+
     Parameters
     ----------
     points : array
@@ -16,21 +23,210 @@ class LagrangianParticles:
         Time step
     u_hat : :class:`.Function`
         Spectral Galerkin :class:`.Function` for the Eulerian velocity
+    integrator : str, optional
+        Explicit time integrator
+
+        - 'euler' - forward Euler (default)
+        - 'rk2' - second order Runge-Kutta (Heun's method)
+        - 'rk4' - classical fourth order Runge-Kutta
+    distributed : bool, optional
+        If False (default), then all processors hold and advance all the
+        particles. If True, then each particle is owned by the processor
+        whose physical domain contains it, and particles are migrated
+        between processors after each time step. The `points` given on
+        each processor are then distinct particles, e.g., all points may
+        be given on rank 0 and an empty (D, 0) array on the others.
+    ids : array of ints, optional
+        Global ids of the particles in `points`. Default is to number the
+        particles consecutively over the processors, by rank.
 
+    Note
+    ----
+    The velocity is evaluated with an :class:`.EvalPlan`, such that the
+    basis functions are evaluated only once for all components of the
+    velocity. For distributed particles the evaluated velocities are routed
+    to the owners of the particles (distribution 'scattered'), see
+    :class:`.PointRouter`.
+
+    Distributing the particles reduces the memory used for the particles
+    and the communication of the velocities, but not the cost of the
+    evaluation. The value at a particle depends on all the distributed
+    expansion coefficients, so every processor gathers all M particles and
+    computes partial sums for them with its local coefficients. Each stage
+    of the integrator creates a new plan for the new positions, which
+    evaluates the basis functions of each axis for all M particles. The
+    cost per stage and processor is thus O(M) in communication and
+    O(MN/P) in flops, for N coefficients on P processors, as for
+    replicated particles. This limits the number of particles to what
+    fits all processors.
     """
 
-    def __init__(self, points, dt, u_hat):
+    def __init__(self, points, dt, u_hat, integrator='euler', distributed=False, ids=None):
+        assert integrator in ('euler', 'rk2', 'rk4')
         self.x = points
         self.u_hat = u_hat
         self.dt = dt
+        self.integrator = integrator
+        self.distributed = distributed
         self.up = np.zeros(self.x.shape)
+        self.a, self.b = {'euler': (np.array([1.]), np.array([])),
+                          'rk2': (np.array([0.5, 0.5]), np.array([1.])),
+                          'rk4': (np.array([1./6., 1./3., 1./3., 1./6.]),
+                                  np.array([0.5, 0.5, 1.]))}[integrator]
+        if ids is None:
+            n = points.shape[1]
+            start = comm.exscan(n) if distributed else 0
+            ids = np.arange(n) + (start or 0)
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self._partition = []
+        if distributed:
+            self._setup_partition()
+            self.migrate()
+
+    def _setup_partition(self):
+        """Set up the partition of the physical domain into owners"""
+        T = self.u_hat.function_space()
+        if T.is_composite_space:
+            T = T.flatten()[0]
+        mesh = T.mesh()
+        coords = []
+        sizes = []
+        for axis, subcomm in enumerate(T.pencil[0].subcomm):
+            if subcomm.Get_size() == 1:
+                continue
+            base = T.bases[axis]
+            x = np.squeeze(mesh[axis])
+            s = T.local_slice(False)[axis]
+            blocks = subcomm.allgather((x[s].min(), x[s].max()))
+            order = np.argsort([b[0] for b in blocks])
+            lo = np.array([blocks[i][0] for i in order])
+            hi = np.array([blocks[i][1] for i in order])
+            period = None
+            if isinstance(base, FourierBase):
+                period = (float(base.domain[0]), float(base.domain[1]-base.domain[0]))
+            # Cut the domain halfway between the mesh blocks of the owners
+            self._partition.append((axis, (hi[:-1]+lo[1:])/2, order, period))
+            coords.append(subcomm.Get_rank())
+            sizes.append(subcomm.Get_size())
+        self._ranks = np.zeros(sizes, dtype=int)
+        for rank, c in enumerate(comm.allgather(tuple(coords))):
+            self._ranks[c] = rank
+
+    def owner(self, x=None):
+        """Return rank of the processors owning the particles at `x`
+
+        Parameters
+        ----------
+        x : array, optional
+            Positions of shape (D, N). Default is the current positions
+        """
+        x = self.x if x is None else x
+        if len(self._partition) == 0:
+            return np.full(x.shape[1], comm.Get_rank(), dtype=int)
+        coords = []
+        for axis, cuts, order, period in self._partition:
+            xa = x[axis]
+            if period is not None:
+                xa = period[0] + np.mod(xa-period[0], period[1])
+            coords.append(order[np.searchsorted(cuts, xa, side='right')])
+        return self._ranks[tuple(coords)]
+
+    def migrate(self):
+        """Send particles to the processors owning them
+
+        Particles normally only move to neighbouring processors in one
+        time step. Only the number of particles is exchanged with all
+        processors, whereas the particles themselves are only sent to the
+        processors that receive any.
+        """
+        owner = self.owner()
+        order = np.argsort(owner, kind='stable')
+        sendcounts = np.bincount(owner, minlength=comm.Get_size())
+        recvcounts = np.zeros_like(sendcounts)
+        comm.Alltoall(sendcounts, recvcounts)
+        sdispls = np.cumsum(sendcounts) - sendcounts
+        rdispls = np.cumsum(recvcounts) - recvcounts
+        D = 2*self.x.shape[0]
+        N = recvcounts.sum()
+        # Positions and velocities are sent together, one particle per row
+        xu = np.zeros((N, D))
+        send = np.concatenate((self.x[:, order], self.up[:, order])).T
+        comm.Alltoallv([np.ascontiguousarray(send), (sendcounts*D, sdispls*D)],
+                       [xu, (recvcounts*D, rdispls*D)])
+        ids = np.zeros(N, dtype=np.int64)
+        comm.Alltoallv([self.ids[order], (sendcounts, sdispls)],
+                       [ids, (recvcounts, rdispls)])
+        self.x = np.ascontiguousarray(xu[:, :D//2].T)
+        self.up = np.ascontiguousarray(xu[:, D//2:].T)
+        self.ids = ids
+
+    @property
+    def num_particles(self):
+        """Return the global number of particles"""
+        return comm.allreduce(self.x.shape[1]) if self.distributed else self.x.shape[1]
 
     def step(self):
-        up = self.rhs()
-        self.x[:] = self.x + self.dt*up
+        """Advance particles one time step"""
+        x0 = self.x
+        x1 = x0
+        x2 = x0.copy()
+        up = self.up
+        for rk, a in enumerate(self.a):
+            up = self.rhs(x1, up)
+            if rk < len(self.b):
+                x1 = x0 + self.b[rk]*self.dt*up
+            x2 += a*self.dt*up
+            if rk == 0 and len(self.a) > 1:
+                # Keep velocity at the start of the step in self.up
+                up = np.zeros_like(x0)
+        self.x[:] = x2
+        if self.distributed:
+            self.migrate()
+
+    def rhs(self, x=None, output_array=None):
+        """Return velocity of particles at `x`
+
+        Parameters
+        ----------
+        x : array, optional
+            Positions of shape (D, N). Default is the current positions
+        output_array : array, optional
+            Return array of shape (D, N). Default is :attr:`up`
+        """
+        x = self.x if x is None else x
+        output_array = self.up if output_array is None else output_array
+        distribution = 'scattered' if self.distributed else 'replicated'
+        # The positions differ between stages, so the plan cannot be reused
+        plan = EvalPlan(self.u_hat.function_space(), x, distribution)
+        return plan(self.u_hat, output_array)
 
-    def rhs(self):
-        return self.u_hat.eval(self.x, output_array=self.up)
+    def write(self, filename, step, mode='a'):
+        """Store particle positions and ids in HDF5 file
+
+        All particles are stored in one collective write, in datasets
+        ``x/step`` of shape (D, N) and ``id/step`` of shape (N,), for N
+        particles in total.
+
+        Parameters
+        ----------
+        filename : str
+            Name of HDF5 file
+        step : int
+            Index of stored step
+        mode : str, optional
+            Mode used to open file
+        """
+        import h5py
+        n = self.x.shape[1] if self.distributed or comm.Get_rank() == 0 else 0
+        start = comm.exscan(n) or 0
+        N = comm.allreduce(n)
+        D = self.x.shape[0]
+        with h5py.File(filename, mode, driver='mpio', comm=comm) as f:
+            x = f.require_group('x').require_dataset(str(step), shape=(D, N), dtype=float)
+            ids = f.require_group('id').require_dataset(str(step), shape=(N,), dtype=np.int64)
+            if n > 0:
+                x[:, start:start+n] = self.x
+                ids[start:start+n] = self.ids
 
 if __name__ == '__main__':
     from shenfun import *
@@ -70,14 +266,11 @@ if __name__ == '__main__':
 
     # Create LagrangianParticles instance with given points
     dt = 0.001
-    lp = LagrangianParticles(points, dt, uv)
+    lp = LagrangianParticles(points, dt, uv, integrator='rk4')
 
     # Store velocity vectors for later plotting on rank 0
     u.write('velocity.h5', name='u', domain=T.mesh())
     v.write('velocity.h5', name='v', domain=T.mesh())
-    if comm.Get_rank() == 0:
-        f = h5py.File('velocity.h5', 'r+')
-        f.create_group('points')
 
     # Run simulation from time = 0 to 1 forwards, and then integrate back to 0
     end_time = 2.0
@@ -88,9 +281,7 @@ if __name__ == '__main__':
     count = 0
     for i in range(nsteps):
         if np.any(np.round(t, 4) in (0, 0.5, 1.0)):
-            if comm.Get_rank() == 0:
-                f['points'].create_dataset(str(count), shape=points.shape, dtype=float)
-                f['points/'+str(count)][:] = lp.x
+            lp.write('velocity.h5', count)
             print('Storing points at time %2.1f'%t)
             lg.append('%s at %2.1f' %(b, t))
             count += 1
@@ -102,10 +293,11 @@ if __name__ == '__main__':
         lp.step()
 
     if comm.Get_rank() == 0:
+        f = h5py.File('velocity.h5', 'r')
         plt.quiver(f['u/mesh/x0'], f['u/mesh/x1'], f['u/2D/0'].__array__().T, f['v/2D/0'].__array__().T)
-        steps = list(f['points'].keys())
+        steps = list(f['x'].keys())
         for step in steps:
-            plt.scatter(f['points/'+str(step)][0], f['points/'+str(step)][1])
+            plt.scatter(f['x/'+str(step)][0], f['x/'+str(step)][1])
         plt.title('Particles integrated forwards and backwards')
         plt.legend(lg)
         plt.show()
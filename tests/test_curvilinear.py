@@ -63,6 +63,32 @@ def test_vector_laplace(space):
     b1 = a1.matvec(u_hat, b1)
     assert np.linalg.norm(b0-b1) < 1e-8
 
+
+def test_coordinates_cache(tmp_path):
+    from shenfun import Coordinates, config
+    conf = config['coordinates']['cache']
+    enabled, path = conf['enabled'], conf['path']
+    conf['enabled'] = True
+    conf['path'] = str(tmp_path)
+    try:
+        r, theta = psi = sp.symbols('x,y', real=True, positive=True)
+        rv = (r*sp.cos(theta), r*sp.sin(theta))
+        C0 = Coordinates(psi, rv)
+        g0 = C0.get_contravariant_metric_tensor()
+        sg0 = C0.sg
+        ct0 = C0.get_christoffel_second()
+        nfiles = len(list(tmp_path.iterdir()))
+        assert nfiles > 0
+        C1 = Coordinates(psi, rv)
+        assert np.all(C1.get_contravariant_metric_tensor() == g0)
+        assert C1.sg == sg0
+        assert np.all(C1.get_christoffel_second() == ct0)
+        assert C1.get_covariant_basis() is C1.b
+        assert len(list(tmp_path.iterdir())) == nfiles
+    finally:
+        conf['enabled'] = enabled
+        conf['path'] = path
+
 if __name__ == '__main__':
     #test_cylinder()
     test_vector_laplace('sphere')
@@ -179,6 +179,148 @@ def test_tensor2():
     #assert np.allclose(g.v[2], 0)
     #assert np.allclose(g.v[3], 2)
 
+@pytest.mark.parametrize('family', 'FC')
+@pytest.mark.parametrize('padding_factor', (1, 1.5))
+def test_nonlinear(family, padding_factor):
+    from shenfun import FunctionSpace, TensorProductSpace, VectorSpace, \
+        Function, Array, Dx, project, NonlinearTerm, convection, rotational
+    N = (10, 11, 12)
+    if family == 'F':
+        B0 = FunctionSpace(N[0], 'F', dtype='D')
+    else:
+        B0 = FunctionSpace(N[0], family, bc=(0, 0))
+    B1 = FunctionSpace(N[1], 'F', dtype='D')
+    B2 = FunctionSpace(N[2], 'F', dtype='d')
+    T = TensorProductSpace(comm, (B0, B1, B2))
+    TV = VectorSpace(T)
+    ua = Array(TV)
+    ua[:] = np.random.random(ua.shape)
+    u = ua.forward()
+    To = T.get_orthogonal()
+    Tp = T.get_dealiased(padding_factor)
+    up = u.backward(padding_factor=padding_factor).copy()
+
+    # Convection, 3 velocity components and 9 derivatives
+    H = NonlinearTerm(convection(u), TV, padding_factor=padding_factor)
+    assert len(H.factors) == 12
+    h = H()
+    g = Function(TV)
+    for i in range(3):
+        ui = 0
+        for j in range(3):
+            ui += up[j]*project(Dx(u[i], j, 1), To).backward(padding_factor=padding_factor)
+        g[i] = Tp.forward(ui, g[i])
+    assert np.allclose(h, g)
+
+    # Rotational form, 3 velocity and 3 vorticity components
+    H = NonlinearTerm(rotational(u), TV, padding_factor=padding_factor)
+    assert len(H.factors) == 6
+    h = H(h)
+    w = project(curl(u), VectorSpace(To)).backward(padding_factor=padding_factor)
+    uw = np.cross(up, w, axis=0)
+    for i in range(3):
+        g[i] = Tp.forward(uw[i], g[i])
+    assert np.allclose(h, g)
+
+    # Scalar term with scale
+    H = NonlinearTerm([(0.5, u[0], u[0]), (u[1], Dx(u[0], 0, 1))], T, padding_factor=padding_factor)
+    assert len(H.factors) == 3
+    ui = 0.5*up[0]*up[0] + up[1]*project(Dx(u[0], 0, 1), To).backward(padding_factor=padding_factor)
+    assert np.allclose(H(), Tp.forward(ui))
+
+def test_inner_memoize():
+    from shenfun import FunctionSpace, TensorProductSpace, TrialFunction, \
+        TestFunction, form_cache
+    from shenfun.config import config
+    def forms():
+        T = TensorProductSpace(comm, (FunctionSpace(12, 'C', bc=(0, 0)),
+                                      FunctionSpace(10, 'F', dtype='d')))
+        u = TrialFunction(T)
+        v = TestFunction(T)
+        return T, inner(v, div(grad(u)))
+    form_cache.clear()
+    T0, A0 = forms()
+    T1, A1 = forms()
+    assert form_cache.hits == 1
+    assert form_cache.misses == 1
+    for a0, a1 in zip(A0, A1):
+        assert a0.space is T0
+        assert a1.space is T1
+        assert a1.mats[0].testfunction[0] is T1.bases[0]
+        assert a0.mats[0].__class__ is a1.mats[0].__class__
+        assert np.allclose(a0.mats[0].diags().toarray(), a1.mats[0].diags().toarray())
+    # Returned forms are copies
+    A1[0].mats[0][0] *= 2
+    T2, A2 = forms()
+    assert np.allclose(A0[0].mats[0][0], A2[0].mats[0][0])
+    maxitems = config['matrix']['forms']['maxitems']
+    config['matrix']['forms']['maxitems'] = 0
+    T3, A3 = forms()
+    assert form_cache.hits == 2
+    config['matrix']['forms']['maxitems'] = maxitems
+    for T in (T0, T1, T2, T3):
+        T.destroy()
+
+
+def test_inner_memoize_matvec():
+    from shenfun import FunctionSpace, TrialFunction, TestFunction, form_cache
+    def form():
+        SD = FunctionSpace(12, 'C', bc=(0, 0))
+        SN = FunctionSpace(12, 'C', bc={'left': {'N': 0}, 'right': {'N': 0}})
+        return inner(TestFunction(SD), TrialFunction(SN))
+    form_cache.clear()
+    B0 = form()
+    B1 = form()
+    assert form_cache.hits == 1
+    assert B1._matvec_methods == B0._matvec_methods
+    u = np.random.random(12)
+    c0 = B0.matvec(u, np.zeros(12))
+    c1 = B1.matvec(u, np.zeros(12))
+    assert np.allclose(c0, c1)
+    # The cache is bypassed for return_matrices and output_array
+    SD = FunctionSpace(12, 'C', bc=(0, 0))
+    B2 = inner(TestFunction(SD), TrialFunction(SD), return_matrices=True)
+    assert form_cache.hits == 1
+    assert form_cache.misses == 1
+
+
+def test_lambdify_cache():
+    from shenfun import FunctionSpace, TensorProductSpace, Array, lambdify_cache
+    x, y, t = sp.symbols('x,y,t', real=True)
+    T = TensorProductSpace(comm, (FunctionSpace(12, 'C'), FunctionSpace(10, 'F', dtype='d')))
+    ue = sp.sin(x)*sp.cos(y)
+    lambdify_cache.clear()
+    u0 = Array(T, buffer=ue)
+    u1 = Array(T, buffer=ue)
+    assert lambdify_cache.hits == 1 and lambdify_cache.misses == 1
+    X = T.local_mesh(True)
+    assert np.allclose(u0, np.sin(X[0])*np.cos(X[1]))
+    assert np.allclose(u0, u1)
+    for ti in (0.5, 1):
+        ut = lambdify_cache.evaluate(ue*t, X, subs={t: ti})
+        assert np.allclose(ut, ti*u0)
+    assert lambdify_cache.misses == 2
+    assert lambdify_cache.last_backend == 'numpy'
+    T.destroy()
+
+
+@pytest.mark.parametrize('backend', ('numexpr', 'numba'))
+def test_lambdify_backend(backend):
+    from shenfun import FunctionSpace, TensorProductSpace, lambdify_cache
+    pytest.importorskip(backend)
+    x, y = sp.symbols('x,y', real=True)
+    T = TensorProductSpace(comm, (FunctionSpace(12, 'C'), FunctionSpace(10, 'F', dtype='d')))
+    X = T.local_mesh(True)
+    u0 = np.sin(X[0])*np.cos(X[1])
+    assert np.allclose(lambdify_cache.evaluate(sp.sin(x)*sp.cos(y), X, backend=backend), u0)
+    assert lambdify_cache.last_backend == backend
+    # Special functions fall back to numpy
+    ue = sp.besselj(0, x)*y
+    u1 = lambdify_cache.evaluate(ue, X, backend=backend)
+    assert lambdify_cache.last_backend == 'numpy'
+    assert np.allclose(u1, lambdify_cache.evaluate(ue, X, backend='numpy'))
+    T.destroy()
+
 if __name__ == '__main__':
     # test_mul(u2)
     #test_imul(u2)
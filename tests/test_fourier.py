@@ -1,5 +1,5 @@
 import pytest
-from shenfun import FunctionSpace, TensorProductSpace, Function, np, comm, fourier
+from shenfun import FunctionSpace, TensorProductSpace, Function, Array, np, comm, fourier
 
 
 @pytest.mark.parametrize('N', ((12,)*3, (13,)*3))
@@ -20,5 +20,33 @@ def test_energy_fourier(N):
         assert abs(e0-e1) < 1e-10
         T.destroy()
 
+@pytest.mark.parametrize('N', (12, 13))
+@pytest.mark.parametrize('dtype', ('d', 'D'))
+def test_padding(N, dtype):
+    F = FunctionSpace(N, 'F', dtype=dtype)
+    Fp = F.get_dealiased(1.5)
+    u = Array(F)
+    u[:] = np.random.random(u.shape)
+    if dtype == 'D':
+        u += 1j*np.random.random(u.shape)
+    u_hat = u.forward()
+    up = Fp.backward(u_hat, Array(Fp))
+    assert np.allclose(Fp.forward(up, Function(F)), u_hat)
+    if dtype == 'D' and N % 2 == 0:
+        # eval uses only -N/2 for the Nyquist mode
+        u_hat[N//2] = 0
+        up = Fp.backward(u_hat, up)
+    assert np.allclose(up, u_hat.eval(Fp.mesh()))
+    T = TensorProductSpace(comm, (FunctionSpace(N, 'F', dtype='D'), F))
+    Tp = T.get_dealiased(1.5)
+    v = Array(T)
+    v[:] = np.random.random(v.shape)
+    v_hat = v.forward()
+    vp = Tp.backward(v_hat, Array(Tp))
+    assert np.allclose(Tp.forward(vp, Function(T)), v_hat)
+    assert np.allclose(Tp.backward(v_hat), vp)
+    T.destroy()
+    Tp.destroy()
+
 if __name__ == '__main__':
     test_energy_fourier((12, 12, 12))
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from mpi4py import MPI
+from shenfun import *
+
+comm = MPI.COMM_WORLD
+
+def steps(pde, u_hat, H_hat, nsteps):
+    for tstep in range(nsteps):
+        for rk in range(pde.steps()):
+            H_hat[:] = -u_hat
+            pde.compute_rhs(rk)
+            pde.solve_step(rk)
+    return u_hat
+
+@pytest.mark.parametrize('PDE', (IMEXRK3, IMEXRK111, IMEXRK222, IMEXRK443))
+def test_set_dt(PDE):
+    L0 = FunctionSpace(12, 'L', bc=(0, 0))
+    F1 = FunctionSpace(12, 'F', dtype='d')
+    T = TensorProductSpace(comm, (L0, F1))
+    X = T.local_mesh(True)
+    u = []
+    for dt in (0.01, 0.02, 0.01):
+        u_hat = Array(T, buffer=(1-X[0]**2)*np.cos(X[1])).forward()
+        H_hat = Function(T)
+        pde = PDE(TestFunction(T), u_hat, lambda f: 0.1*div(grad(f)), Expr(H_hat), dt)
+        pde.assemble()
+        u.append(steps(pde, u_hat, H_hat, 2))
+
+    u_hat = Array(T, buffer=(1-X[0]**2)*np.cos(X[1])).forward()
+    H_hat = Function(T)
+    pde = PDE(TestFunction(T), u_hat, lambda f: 0.1*div(grad(f)), Expr(H_hat), 0.01)
+    pde.assemble()
+    solvers = pde.solvers
+    for i, dt in enumerate((0.01, 0.02, 0.01)):
+        u_hat[:] = Array(T, buffer=(1-X[0]**2)*np.cos(X[1])).forward()
+        pde.set_dt(dt)
+        assert np.allclose(steps(pde, u_hat, H_hat, 2), u[i])
+    assert all(s0 is s1 for s0, s1 in zip(solvers, pde.solvers))
+    assert len(pde.cache) == 2*len(solvers)
+    T.destroy()
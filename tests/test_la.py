@@ -1,6 +1,8 @@
 import numpy as np
 import pytest
-from shenfun import SparseMatrix, la
+from shenfun import SparseMatrix, la, config, FunctionSpace, \
+    TensorProductSpace, TrialFunction, TestFunction, Array, Function, \
+    inner, div, grad, comm
 import warnings
 
 warnings.filterwarnings('ignore')
@@ -47,6 +49,109 @@ def test_XDMA(di):
     assert np.allclose(uh2, uh)
     assert np.allclose(uh[:, 0], u_hat)
 
+@pytest.mark.parametrize('di', d[2:])
+def test_threads(di):
+    M = SparseMatrix(di, (N, N))
+    sol = la.Solver(M)
+    bh = np.random.random((N, N, N))
+    threads = config['optimization']['threads']
+    try:
+        for axis in range(3):
+            config['optimization']['threads'] = 1
+            uh = sol(bh, np.zeros_like(bh), axis=axis)
+            config['optimization']['threads'] = 2
+            uh2 = sol(bh, np.zeros_like(bh), axis=axis)
+            assert np.allclose(uh, uh2)
+    finally:
+        config['optimization']['threads'] = threads
+
+
+@pytest.mark.parametrize('family,bc', (('L', (0, 0)), ('L', (0, 0, 0, 0)),
+                                       ('L', {'left': {'N': 0}, 'right': {'N': 0}}),
+                                       ('C', (0, 0))))
+@pytest.mark.parametrize('dim', (2, 3))
+def test_SolverGeneric1ND_packed(family, bc, dim):
+    N = 12
+    for axis in range(dim):
+        F = [FunctionSpace(N, 'F', dtype='D') for i in range(dim-1)]
+        T = TensorProductSpace(comm, tuple(F[:axis]+[FunctionSpace(N, family, bc=bc, dtype='D')]+F[axis:]), dtype='D')
+        u = TrialFunction(T)
+        v = TestFunction(T)
+        if len(bc) == 4:
+            mats = inner(v, div(grad(div(grad(u)))) + 2*u)
+        else:
+            mats = inner(v, div(grad(u)) - 2*u)
+        f_hat = Function(T)
+        f_hat[:] = np.random.random(f_hat.shape)
+        u0 = la.SolverGeneric1ND(mats, packed=False)(f_hat.copy(), Function(T))
+        sol = la.SolverGeneric1ND(mats)
+        assert sol.packed == (family == 'L')
+        u1 = sol(f_hat.copy(), Function(T))
+        assert np.allclose(u0, u1)
+        u2 = sol(f_hat.copy(), Function(T), fast=False)
+        assert np.allclose(u0, u2)
+        T.destroy()
+
+@pytest.mark.parametrize('family', ('C', 'L', 'J'))
+@pytest.mark.parametrize('dim,axes', ((2, (0, 1)), (3, (0, 1)), (3, (0, 2)), (3, (0, 1, 2))))
+def test_SolverFastDiagonalization(family, dim, axes):
+    from sympy import symbols, sin
+    x, y, z = symbols("x,y,z", real=True)
+    bases = [FunctionSpace(12, family, bc=(0, 0)) if axis in axes else
+             FunctionSpace(10, 'F', dtype='D' if axis < dim-1 else 'd') for axis in range(dim)]
+    T = TensorProductSpace(comm, tuple(bases), dtype='D' if 1 not in axes else None)
+    u = TrialFunction(T)
+    v = TestFunction(T)
+    ue = 1
+    for axis, s in enumerate((x, y, z)[:dim]):
+        ue *= (1-s**2)*s**axis if axis in axes else sin(2*s)
+    fe = ue.diff(x, 2) + ue.diff(y, 2) + ue.diff(z, 2) - 2*ue
+    sol = la.SolverFastDiagonalization(inner(v, div(grad(u)) - 2*u))
+    u_hat = sol(inner(v, Array(T, buffer=fe)), Function(T))
+    assert np.allclose(u_hat.backward(), Array(T, buffer=ue))
+    T.destroy()
+
+
+# The Chebyshev operator is not symmetric, so cg is only used with Legendre
+@pytest.mark.parametrize('family,method', (('L', 'cg'), ('L', 'gmres'), ('L', 'bicgstab'),
+                                           ('C', 'gmres'), ('C', 'bicgstab')))
+def test_SolverKrylov(family, method):
+    from sympy import symbols
+    x, y = symbols("x,y", real=True)
+    D = FunctionSpace(12, family, bc=(0, 0))
+    T = TensorProductSpace(comm, (D, D))
+    u = TrialFunction(T)
+    v = TestFunction(T)
+    A = inner(v, div(grad(u)) - (2+x*y)*u)
+    M = inner(v, div(grad(u)) - 2*u)
+    f_hat = inner(v, Array(T, buffer=(1-x**2)*(1-y**2)*x))
+    u0 = la.SolverGeneric2ND(A)(f_hat.copy(), Function(T))
+    sol = la.SolverKrylov(A, method=method, M=M, rtol=1e-12)
+    u1 = sol(f_hat.copy(), Function(T))
+    assert np.allclose(u0, u1)
+    assert sol.iterations < 20
+    T.destroy()
+
+
+# Variable coefficient along the nonperiodic axis, distributed Fourier axis
+@pytest.mark.parametrize('family,method', (('L', 'cg'), ('L', 'gmres'), ('C', 'bicgstab')))
+def test_SolverKrylov_Fourier(family, method):
+    from sympy import symbols, sin
+    x, y = symbols("x,y", real=True)
+    D = FunctionSpace(12, family, bc=(0, 0))
+    F = FunctionSpace(8, 'F', dtype='d')
+    T = TensorProductSpace(comm, (D, F))
+    u = TrialFunction(T)
+    v = TestFunction(T)
+    A = inner(v, div(grad(u)) - (2+x)*u)
+    M = inner(v, div(grad(u)) - 2*u)
+    f_hat = inner(v, Array(T, buffer=(1-x**2)*sin(2*y)))
+    u0 = la.SolverGeneric1ND(A)(f_hat.copy(), Function(T))
+    sol = la.SolverKrylov(A, method=method, M=M, rtol=1e-12)
+    u1 = sol(f_hat.copy(), Function(T))
+    assert np.allclose(u0, u1)
+    assert sol.iterations < 20
+    T.destroy()
 
 if __name__ == "__main__":
     #test_solve('GC')
@@ -38,5 +38,54 @@ def test_lagrangian_particles():
     assert np.allclose(lp.up, np.array([[0.99115526], [-0.09409196]]), 1e-6)
     T.destroy()
 
+def get_velocity(family):
+    N = (20, 20)
+    if family == 'F':
+        F0 = FunctionSpace(N[0], 'F', dtype='D', domain=(0., 1.))
+        F1 = FunctionSpace(N[1], 'F', dtype='d', domain=(0., 1.))
+    else:
+        F0 = FunctionSpace(N[0], family, bc=(0, 0), domain=(0., 1.))
+        F1 = FunctionSpace(N[1], family, bc=(0, 0), domain=(0., 1.))
+    T = TensorProductSpace(comm, (F0, F1))
+    TV = VectorSpace(T)
+    x, y = sp.symbols("x,y")
+    psi = 1./np.pi*sp.sin(np.pi*x)**2*sp.sin(np.pi*y)**2 # Streamfunction
+    uv = Function(TV, buffer=(-psi.diff(y, 1), psi.diff(x, 1)))
+    return uv
+
+@pytest.mark.parametrize('integrator', ('rk2', 'rk4'))
+def test_lagrangian_particles_rk(integrator):
+    uv = get_velocity('F')
+    t0 = np.linspace(0, 2*np.pi, 10)[:-1]
+    points = np.array([0.5+0.15*np.cos(t0), 0.75+0.15*np.sin(t0)])
+    lp = LagrangianParticles(points.copy(), 0.01, uv, integrator=integrator)
+    for i in range(20):
+        lp.step()
+    assert np.linalg.norm(lp.x-points) > 0.1
+    lp.dt *= -1
+    for i in range(20):
+        lp.step()
+    assert np.allclose(lp.x, points, 0, {'rk2': 1e-4, 'rk4': 1e-8}[integrator])
+    uv.function_space().destroy()
+
+@pytest.mark.parametrize('family', ('F', 'C'))
+def test_lagrangian_particles_distributed(family):
+    uv = get_velocity(family)
+    t0 = np.linspace(0, 2*np.pi, 40)[:-1]
+    points = np.array([0.5+0.3*np.cos(t0), 0.5+0.3*np.sin(t0)])
+    lp = LagrangianParticles(points.copy(), 0.02, uv, integrator='rk4')
+    p = points if comm.Get_rank() == 0 else np.zeros((2, 0))
+    lpd = LagrangianParticles(p.copy(), 0.02, uv, integrator='rk4', distributed=True)
+    assert lpd.num_particles == points.shape[1]
+    for i in range(10):
+        lp.step()
+        lpd.step()
+        assert np.all(lpd.owner() == comm.Get_rank())
+        assert np.allclose(lpd.x, lp.x[:, lpd.ids])
+        assert np.allclose(lpd.up, lp.up[:, lpd.ids])
+    assert lpd.num_particles == points.shape[1]
+    assert comm.allreduce(len(np.unique(lpd.ids))) == points.shape[1]
+    uv.function_space().destroy()
+
 if __name__ == '__main__':
     test_lagrangian_particles()
@@ -155,7 +155,7 @@ def test_cmatvec(b0, b1, quad, k):
     b0 = b0(N, quad=quad)
     b1 = b1(N, quad=quad)
     mat = inner_product((b0, 0), (b1, k))
-    formats = mat._matvec_methods + ['python', 'csr']
+    formats = mat._matvec_methods + ['python', 'csr', 'packed']
     c = mat.matvec(a, c, format='csr')
     for format in formats:
         c1 = mat.matvec(a, c1, format=format)
@@ -177,7 +177,7 @@ def test_cumatvec(b0, b1, quad, k):
     b0 = b0(N, quad=quad)
     b1 = b1(N, quad=quad)
     mat = inner_product((b0, 0), (b1, k))
-    formats = mat._matvec_methods + ['python', 'csr']
+    formats = mat._matvec_methods + ['python', 'csr', 'packed']
     c = mat.matvec(a, c, format='csr')
     for format in formats:
         c1 = mat.matvec(a, c1, format=format)
@@ -200,7 +200,7 @@ def test_lmatvec(b0, b1, quad, k0, k1):
     b1 = b1(N, quad=quad)
     mat = inner_product((b0, k0), (b1, k1))
     c = mat.matvec(a, c, format='dia')
-    formats = mat._matvec_methods + ['python', 'csr']
+    formats = mat._matvec_methods + ['python', 'csr', 'packed']
     for format in formats:
         c1 = mat.matvec(a, c1, format=format)
         assert np.allclose(c, c1)
@@ -225,7 +225,7 @@ def test_lagmatvec(b0, b1, quad, format, k0, k1):
     b1 = b1(N, quad=quad)
     mat = inner_product((b0, k0), (b1, k1))
     c = mat.matvec(a, c, format='csr')
-    formats = mat._matvec_methods + ['python', 'csr']
+    formats = mat._matvec_methods + ['python', 'csr', 'packed']
     for format in formats:
         c1 = mat.matvec(a, c1, format=format)
         assert np.allclose(c, c1)
@@ -247,7 +247,7 @@ def test_hmatvec(b0, b1, quad, format, k0, k1):
     b0 = b0(N, quad=quad)
     b1 = b1(N, quad=quad)
     mat = inner_product((b0, k0), (b1, k1))
-    formats = mat._matvec_methods + ['python', 'csr']
+    formats = mat._matvec_methods + ['python', 'csr', 'packed']
     c = mat.matvec(a, c, format='csr')
     for format in formats:
         c1 = mat.matvec(a, c1, format=format)
@@ -272,7 +272,7 @@ def test_jmatvec(b0, b1, quad, format, k0, k1):
 
     mat = inner_product((b0, k0), (b1, k1))
     c = mat.matvec(a, c, format='csr')
-    formats = mat._matvec_methods + ['python', 'csr']
+    formats = mat._matvec_methods + ['python', 'csr', 'packed']
     for format in formats:
         c1 = mat.matvec(a, c1, format=format)
         assert np.allclose(c, c1)
@@ -772,6 +772,62 @@ def test_exact(b0, b1):
     C.incorporate_scale()
     assert np.linalg.norm(C.diags('csr').data) < 1e-8
 
+def test_packed():
+    M = SparseMatrix({-2: np.arange(4)+1., 0: 2, 1: np.arange(6)+1j, 3: 1}, (6, 7))
+    A = M.diags('csr').toarray()
+    offsets, data = M.packed()
+    assert np.all(offsets == (-2, 0, 1, 3))
+    assert data.dtype == complex
+    for i, k in enumerate(offsets):
+        assert np.allclose(data[i, max(0, -k):min(6, 7-k)], np.diag(A, k))
+    for dim in (1, 2, 3):
+        v = np.random.random((7,)+(4,)*(dim-1))
+        for axis in range(dim):
+            vi = np.moveaxis(v, 0, axis)
+            c = np.zeros(vi.shape[:axis]+(6,)+vi.shape[axis+1:], dtype=complex)
+            c = M.matvec(vi, c, format='packed', axis=axis)
+            assert np.allclose(np.moveaxis(c, axis, 0), np.tensordot(A, v, (1, 0)))
+    M[0] = 3
+    assert np.allclose(M.packed()[1][1], 3)
+    # Diagonals modified in place
+    d = M[-2]
+    d *= 2
+    assert np.allclose(M.packed()[1][0, 2:], 2*(np.arange(4)+1))
+    # Diagonals longer than in the matrix are truncated, like in diags
+    D = SparseMatrix({-2: np.arange(6.), 0: np.arange(6.)}, (6, 6))
+    v = np.random.random(6)
+    assert np.allclose(D.matvec(v, np.zeros(6), format='packed'), D.diags('csr') @ v)
+    B = SparseMatrix({-1: 1, 2: np.arange(2.)}, (7, 4), 2)
+    C = M.matmul(B)
+    assert isinstance(C, SparseMatrix)
+    assert np.allclose(C.diags('csr').toarray(), M.diags('csr').toarray() @ B.diags('csr').toarray())
+    assert np.allclose((M*B).toarray(), C.diags('csr').toarray())
+
+def test_matrix_cache(tmp_path):
+    enabled, path = config['matrix']['cache']['enabled'], config['matrix']['cache']['path']
+    config['matrix']['cache']['enabled'] = True
+    config['matrix']['cache']['path'] = str(tmp_path)
+    try:
+        N = 12
+        b0 = lbases.ShenDirichlet(N)
+        b1 = lbases.ShenBiharmonic(N)
+        u = shenfun.TrialFunction(b1)
+        v = shenfun.TestFunction(b0)
+        B0 = inner(v*x, u, kind='stencil')
+        cache = shenfun.get_matrix_cache()
+        assert len(cache) == 1
+        B1 = inner(v*x, u, kind='stencil')
+        assert len(cache) == 1
+        C = B0-B1
+        C.incorporate_scale()
+        assert np.linalg.norm(C.diags('csr').data) < 1e-12
+        cache.maxitems = 0
+        cache.evict()
+        assert len(cache) == 0
+    finally:
+        config['matrix']['cache']['enabled'] = enabled
+        config['matrix']['cache']['path'] = path
+
 if __name__ == '__main__':
     import sympy as sp
     x = sp.symbols('x', real=True)
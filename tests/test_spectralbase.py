@@ -119,3 +119,19 @@ def test_constant_inner(family):
     for quad in quads[D.family()]:
         q = inner(1, Array(D, buffer=x**2))
         assert abs(q-2/3) < 1e-8
+
+@pytest.mark.parametrize('family', 'CLU')
+def test_differentiate(family):
+    from shenfun import Dx, Project
+    D = FunctionSpace(12, family, bc=(0, 0), domain=(0, 3))
+    T = D.get_orthogonal()
+    ue = x**4*(3-x)
+    u_hat = Function(D, buffer=ue)
+    for k in (1, 2, 3):
+        du = u_hat.differentiate(0, k)
+        assert du.function_space().compatible_base(T)
+        assert np.allclose(du.backward(), Array(T, buffer=sp.diff(ue, x, k)))
+    # Project uses the recurrence
+    P = Project(2*Dx(u_hat, 0, 1), T)
+    assert P.diff is not None
+    assert np.allclose(P(), 2*u_hat.differentiate(0, 1))
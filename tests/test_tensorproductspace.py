@@ -16,7 +16,7 @@ from shenfun.laguerre import bases as lagbases
 from shenfun.hermite import bases as hbases
 from shenfun.jacobi import bases as jbases
 from shenfun import Function, project, Dx, Array, FunctionSpace, TensorProductSpace, \
-   VectorSpace, CompositeSpace, inner
+   VectorSpace, CompositeSpace, EvalPlan, inner
 
 comm = MPI.COMM_WORLD
 
@@ -622,6 +622,316 @@ def test_eval_expression2(fam):
     assert np.allclose(f1, f2, 1e-7)
     T.destroy()
 
+def test_wisdom(tmp_path, monkeypatch):
+    import os
+    from shenfun import tensorproductspace
+    # All ranks must use the same directory
+    tmp_path = comm.bcast(tmp_path)
+    enabled, path = config['fftw']['wisdom']['enabled'], config['fftw']['wisdom']['path']
+    config['fftw']['wisdom']['enabled'] = True
+    config['fftw']['wisdom']['path'] = str(tmp_path)
+    imported = []
+    import_wisdom = tensorproductspace.import_wisdom
+    monkeypatch.setattr(tensorproductspace, 'import_wisdom',
+                        lambda shape, dtype: imported.extend(import_wisdom(shape, dtype)))
+    try:
+        T = TensorProductSpace(comm, (FunctionSpace(12, 'C'), FunctionSpace(14, 'F', dtype='d')))
+        assert len(imported) == 0
+        comm.barrier()
+        files = [f for f in os.listdir(tmp_path) if f.startswith('D_wisdom_12x14_d')]
+        assert len(files) == comm.Get_size()
+        T.destroy()
+        T = TensorProductSpace(comm, (FunctionSpace(12, 'C'), FunctionSpace(14, 'F', dtype='d')))
+        assert os.path.join(str(tmp_path), 'D_wisdom_12x14_d_{}_{}'.format(comm.Get_size(), comm.Get_rank())) in imported
+        u = Array(T)
+        u[:] = 1
+        assert allclose(u.forward().backward(), 1)
+        T.destroy()
+    finally:
+        config['fftw']['wisdom']['enabled'] = enabled
+        config['fftw']['wisdom']['path'] = path
+
+
+@pytest.mark.parametrize('fam', ('C', 'L', 'F'))
+def test_batched(fam):
+    dtype = 'D' if fam == 'F' else 'd'
+    B0 = FunctionSpace(12, fam, dtype=dtype)
+    T = TensorProductSpace(comm, (B0, FunctionSpace(13, 'F', dtype='D'), FunctionSpace(14, 'F', dtype='d')))
+    if fam != 'F':
+        B1 = FunctionSpace(12, fam, bc=(0, 0))
+        T1 = TensorProductSpace(comm, (B1, FunctionSpace(13, 'F', dtype='D'), FunctionSpace(14, 'F', dtype='d')))
+    else:
+        T1 = T
+    for W in (VectorSpace(T1), CompositeSpace([VectorSpace(T1), T])):
+        assert W.forward.get_batched() is not None
+        u = Function(W)
+        u[:] = random_like(u)
+        u = u.backward().forward()
+        a0 = W.backward(u, Array(W))
+        a1 = W.backward(u, Array(W), batched=True)
+        assert allclose(a0, a1)
+        f0 = W.forward(a0, Function(W))
+        f1 = W.forward(a0, Function(W), batched=True)
+        assert allclose(f0, f1)
+        s0 = W.scalar_product(a0, Function(W))
+        s1 = W.scalar_product(a0, Function(W), batched=True)
+        assert allclose(s0, s1)
+        W.destroy()
+        assert W.forward._batched is None
+    Tp = T.get_dealiased()
+    Wp = VectorSpace(Tp)
+    assert Wp.forward.get_batched() is None
+    u = Function(Wp)
+    u[:] = random_like(u)
+    assert allclose(Wp.backward(u, Array(Wp)), Wp.backward(u, Array(Wp), batched=True))
+    for S in (T, T1, Tp):
+        S.destroy()
+
+@pytest.mark.parametrize('fam', ('C', 'L', 'F'))
+def test_pipelined(fam):
+    dtype = 'D' if fam == 'F' else 'd'
+    bases = (FunctionSpace(12, fam, dtype=dtype), FunctionSpace(13, 'F', dtype='D'), FunctionSpace(14, 'F', dtype='d'))
+    for slab in (True, False):
+        T0 = TensorProductSpace(comm, bases, slab=slab)
+        T1 = TensorProductSpace(comm, bases, slab=slab, chunks=3)
+        u = Array(T0)
+        u[:] = random_like(u)
+        u_hat = T0.forward(u, Function(T0))
+        assert allclose(u_hat, T1.forward(u, Function(T1)))
+        assert allclose(T0.backward(u_hat), T1.backward(u_hat))
+        assert allclose(T0.scalar_product(u), T1.scalar_product(u))
+        T0p = T0.get_dealiased()
+        T1p = T1.get_dealiased()
+        assert allclose(T0p.backward(u_hat), T1p.backward(u_hat))
+        for T in (T0, T1, T0p, T1p):
+            T.destroy()
+
+@pytest.mark.parametrize('fam', ('C', 'F'))
+def test_pipelined_local(fam):
+    # Pipeline also local redistributions, such that PipelinedStage is
+    # tested on a single processor
+    from shenfun.tensorproductspace import PipelinedStage
+    dtype = 'D' if fam == 'F' else 'd'
+    bases = (FunctionSpace(12, fam, dtype=dtype), FunctionSpace(13, 'F', dtype='D'), FunctionSpace(14, 'F', dtype='d'))
+    for slab in (True, False):
+        T0 = TensorProductSpace(comm, bases, slab=slab)
+        T1 = TensorProductSpace(comm, bases, slab=slab, chunks=5)
+        for transform in (T1.forward, T1.backward, T1.scalar_product):
+            for stage in transform._pipeline:
+                if stage is not None:
+                    stage.destroy()
+            transform._pipeline = [PipelinedStage(x, t, T1.chunks) if PipelinedStage.is_pipelinable(x, t, local=True) else None
+                                   for x, t in zip(transform._xfftn[:-1], transform._transfer)]
+            assert all(stage is not None for stage in transform._pipeline)
+        u = Array(T0)
+        u[:] = random_like(u)
+        u_hat = T0.forward(u, Function(T0))
+        assert allclose(u_hat, T1.forward(u, Function(T1)))
+        assert allclose(T0.backward(u_hat), T1.backward(u_hat))
+        assert allclose(T0.scalar_product(u), T1.scalar_product(u))
+        T0.destroy()
+        T1.destroy()
+
+@pytest.mark.parametrize('fam', ('C', 'L'))
+def test_array_pool(fam):
+    from shenfun.utilities import array_pool
+    share = config['fftw']['pool']['share']
+    u_hat = {}
+    for s in ('none', 'all'):
+        config['fftw']['pool']['share'] = s
+        spaces = []
+        for B1 in (FunctionSpace(12, fam), FunctionSpace(12, 'F', dtype='D')):
+            bases = (FunctionSpace(12, fam, bc=(0, 0)), B1, FunctionSpace(14, 'F', dtype='d'))
+            T = TensorProductSpace(comm, bases)
+            spaces += [T, T.get_dealiased(1.5)]
+        before = array_pool.report()
+        uh = []
+        for T in spaces:
+            u = Array(T)
+            u[:] = np.random.RandomState(1).random_sample(u.shape)
+            uh.append(T.forward(T.backward(T.forward(u, Function(T)), Array(T)), Function(T)))
+        u_hat[s] = uh
+        if s == 'all':
+            assert before['saved'] > 0
+        for T in spaces:
+            T.destroy()
+        del spaces, T
+    config['fftw']['pool']['share'] = share
+    for u0, u1 in zip(u_hat['none'], u_hat['all']):
+        assert allclose(u0, u1)
+
+@pytest.mark.parametrize('fam', ('F', 'C', 'L'))
+@pytest.mark.parametrize('dim', (2, 3))
+def test_eval_plan(fam, dim):
+    points = None
+    if comm.Get_rank() == 0:
+        points = np.random.random((dim, 5))
+    points = comm.bcast(points)
+    bases = [FunctionSpace(9, 'F', dtype='D') for i in range(dim-2)]
+    bases += [FunctionSpace(9, fam, dtype='D'), FunctionSpace(11, 'F', dtype='d')]
+    T = TensorProductSpace(comm, bases)
+    V = VectorSpace(T)
+    plan = EvalPlan(T, points)
+    vplan = EvalPlan(V, points)
+    for i in range(2):
+        u_hat = Function(V)
+        u_hat[:] = random_like(u_hat)
+        u = u_hat.backward()
+        u_hat = u.forward(u_hat)
+        assert allclose(plan(u_hat[0]), T.eval(points, u_hat[0], method=2))
+        assert allclose(vplan(u_hat), V.eval(points, u_hat, method=2))
+    assert plan(u_hat[1]) is plan.output_array
+    # T.eval caches the plan of the last points, and returns new arrays
+    u0 = T.eval(points, u_hat[0])
+    eval_plan = T._eval_plan
+    u1 = T.eval(points.copy(), u_hat[1])
+    assert T._eval_plan is eval_plan
+    assert allclose(u0, plan(u_hat[0]))
+    assert allclose(u1, plan(u_hat[1]))
+    points[:, 0] /= 2
+    assert allclose(T.eval(points, u_hat[0]), T.eval(points, u_hat[0], method=2))
+    assert T._eval_plan is not eval_plan
+    T.destroy()
+
+@pytest.mark.parametrize('N', (10, 11))
+@pytest.mark.parametrize('fam', ('F', 'C', 'L'))
+@pytest.mark.parametrize('dim', (2, 3))
+def test_eval_nufft(fam, dim, N):
+    bases = [FunctionSpace(8, 'F', dtype='D') for i in range(dim-2)]
+    bases += [FunctionSpace(9, fam, dtype='D'), FunctionSpace(N, 'F', dtype='d')]
+    T = TensorProductSpace(comm, bases)
+    points = None
+    if comm.Get_rank() == 0:
+        points = np.array([np.random.uniform(*[float(d) for d in base.domain], 20)
+                           for base in T.bases])
+    points = comm.bcast(points)
+    u_hat = Function(T)
+    u_hat[:] = random_like(u_hat)
+    u = u_hat.backward()
+    u_hat = u.forward(u_hat)
+    ue = T.eval(points, u_hat, method=2)
+    enabled = config['transforms']['nufft']['enabled']
+    config['transforms']['nufft']['enabled'] = True
+    try:
+        for method in (1, 3):
+            assert allclose(T.eval(points, u_hat, method=method), ue)
+        # Second call reuses the cached kernels and plan
+        u_hat *= 2
+        assert allclose(T.eval(points, u_hat, method=3), 2*ue)
+    finally:
+        config['transforms']['nufft']['enabled'] = enabled
+    T.destroy()
+
+@pytest.mark.parametrize('D', (1, 2, 3))
+def test_nufft_interp(D):
+    from shenfun.fourier.nufft import nufft_interp
+    M, L, K, n = 7, 4, 3, 6
+    V = np.random.random((n**D, K)) + 1j*np.random.random((n**D, K))
+    idx = np.random.randint(0, n, (D, M, L)).astype(np.intp)
+    W = np.random.random((D, M, L))
+    strides = np.array([n**(D-1-a) for a in range(D)], dtype=np.intp)
+    v0 = nufft_interp.func(V, idx, W, strides, np.zeros((M, K), dtype=complex))
+    v1 = nufft_interp(V, idx, W, strides, np.zeros((M, K), dtype=complex))
+    assert np.allclose(v0, v1)
+    j = 2
+    ve = 0
+    for stencil in product(range(L), repeat=D):
+        flat = sum(idx[a, j, l]*strides[a] for a, l in enumerate(stencil))
+        ve = ve + np.prod([W[a, j, l] for a, l in enumerate(stencil)])*V[flat]
+    assert np.allclose(v1[j], ve)
+
+@pytest.mark.parametrize('dim', (2, 3))
+def test_eval_distributed(dim):
+    rank = comm.Get_rank()
+    bases = [FunctionSpace(9, 'F', dtype='D') for i in range(dim-2)]
+    bases += [FunctionSpace(9, 'C', dtype='D'), FunctionSpace(11, 'F', dtype='d')]
+    T = TensorProductSpace(comm, bases)
+    V = VectorSpace(T)
+    u_hat = Function(V)
+    u_hat[:] = random_like(u_hat)
+    u = u_hat.backward()
+    u_hat = u.forward(u_hat)
+    # Different number of points on each rank
+    points = np.random.random((dim, 3+rank))
+    allpoints = np.hstack(comm.allgather(points))
+    start = sum(comm.allgather(points.shape[1])[:rank])
+    local = slice(start, start+points.shape[1])
+    ue = V.eval(allpoints, u_hat, method=2)
+    for method in (0, 1, 2):
+        if dim == 3 and method == 0:
+            continue
+        us = T.eval(points, u_hat[0], method=method, distribution='scattered')
+        assert allclose(us, ue[0, local])
+        ug = T.eval(points, u_hat[0], method=method, distribution='gathered')
+        assert allclose(ug, ue[0])
+        vs = V.eval(points, u_hat, method=method, distribution='scattered')
+        assert allclose(vs, ue[:, local])
+    plan = EvalPlan(V, points, 'gathered')
+    assert allclose(plan(u_hat), ue)
+    T.destroy()
+
+def test_eval_subcomm():
+    # Points are routed within the communicator of the space
+    subcomm = comm.Split(comm.Get_rank() % 2)
+    rank = subcomm.Get_rank()
+    T = TensorProductSpace(subcomm, (FunctionSpace(9, 'C', dtype='D'), FunctionSpace(11, 'F', dtype='d')))
+    u_hat = Function(T)
+    u_hat[:] = random_like(u_hat)
+    u_hat = u_hat.backward().forward(u_hat)
+    points = np.random.random((2, 2+rank))
+    allpoints = np.hstack(subcomm.allgather(points))
+    start = sum(subcomm.allgather(points.shape[1])[:rank])
+    ue = T.eval(allpoints, u_hat, method=2)
+    for method in (1, 2):
+        us = T.eval(points, u_hat, method=method, distribution='scattered')
+        assert allclose(us, ue[start:start+points.shape[1]])
+        assert allclose(T.eval(points, u_hat, method=method, distribution='gathered'), ue)
+    T.destroy()
+    subcomm.Free()
+
+@pytest.mark.parametrize('fam', ('C', 'L', 'U'))
+def test_differentiate(fam):
+    x, y, z = symbols("x,y,z", real=True)
+    bases = [FunctionSpace(8, 'F', dtype='D'), FunctionSpace(10, fam, bc=(0, 0)),
+             FunctionSpace(6, 'F', dtype='d')]
+    T = TensorProductSpace(comm, bases, axes=(1, 0, 2))
+    To = T.get_orthogonal()
+    ue = cos(x)*(1-y**2)*y**3*sin(z)
+    u_hat = Function(T, buffer=ue)
+    for k in (1, 2):
+        du = u_hat.differentiate(1, k)
+        due = Function(To, buffer=ue.diff(y, k))
+        assert allclose(du.backward(), Array(To, buffer=ue.diff(y, k)))
+        assert allclose(du, due)
+        dp = project(Dx(u_hat, 1, k), To)
+        assert dp.function_space() is To
+        assert allclose(dp, due)
+    T.destroy()
+    To.destroy()
+
+@pytest.mark.parametrize('fam', ('C', 'L'))
+@pytest.mark.parametrize('dim', (2, 3))
+def test_single_precision(fam, dim):
+    from shenfun import la, TestFunction, TrialFunction, div, grad
+    x, y, z = symbols("x,y,z", real=True)
+    bases = [FunctionSpace(20, fam, bc=(0, 0), dtype='f')]
+    bases += [FunctionSpace(12, 'F', dtype='F') for i in range(dim-2)]
+    bases += [FunctionSpace(12, 'F', dtype='f')]
+    T = TensorProductSpace(comm, bases)
+    ue = (1-x**2)*sin(2*y)*(cos(z) if dim == 3 else 1)
+    fe = -ue.diff(x, 2)-ue.diff(y, 2)-ue.diff(z, 2)
+    v = TestFunction(T)
+    u = TrialFunction(T)
+    sol = la.SolverGeneric1ND(inner(v, -div(grad(u))))
+    u_hat = sol(inner(v, Array(T, buffer=fe)))
+    uj = u_hat.backward()
+    assert uj.dtype == np.float32
+    assert u_hat.dtype == np.complex64
+    assert np.abs(uj-Array(T, buffer=ue)).max() < 1e-5
+    points = np.array([[0.1, 0.2], [0.3, 0.4], [0.5, 0.6]])[:dim]
+    xyz = list(points) + [0]*(3-dim)
+    assert np.abs(u_hat.eval(points)-lambdify((x, y, z), ue)(*xyz)).max() < 1e-5
+    T.destroy()
 
 if __name__ == '__main__':
     test_transform('F', 2)
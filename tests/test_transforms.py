@@ -612,6 +612,58 @@ def test_leg2cheb():
         assert np.linalg.norm(C2(u, transpose=True)-1) < 1e-8
         assert np.linalg.norm(C2(u)-C(u)) < 1e-8
 
+def test_fmm_cache(tmp_path):
+    dlt = shenfun.legendre.dlt
+    u = np.random.random(1200)
+    c0 = dlt.Leg2Cheb(u, use_direct=2000)(u)
+    dlt._fmm_cache.clear()
+    c1 = dlt.Leg2Cheb(u, use_direct=100)(u)
+    assert len(dlt._fmm_cache) > 0
+    nc = len(dlt._fmm_cache)
+    c2 = dlt.FMMLeg2Cheb(u, use_direct=100)(u)
+    c3 = dlt.Leg2Cheb(u, use_direct=100)(u)
+    assert np.linalg.norm(c1-c0) < 1e-8
+    assert np.linalg.norm(c2-c0) < 1e-8
+    assert np.linalg.norm(c3-c0) < 1e-8
+    conf = config['bases']['legendre']['fmm_cache']
+    enabled, path, maxitems = conf['enabled'], conf['path'], conf['maxitems']
+    try:
+        conf['enabled'] = True
+        conf['path'] = str(tmp_path)
+        dlt._fmm_cache.clear()
+        c4 = dlt.Leg2Cheb(u, use_direct=100)(u)
+        assert len(dlt.get_fmm_cache()) == nc
+        dlt._fmm_cache.clear()
+        c5 = dlt.Leg2Cheb(u, use_direct=100)(u)
+        assert np.linalg.norm(c4-c0) < 1e-8
+        assert np.linalg.norm(c5-c0) < 1e-8
+        conf['enabled'] = False
+        conf['maxitems'] = 1
+        c6 = dlt.Leg2Cheb(u, use_direct=100)(u)
+        assert len(dlt._fmm_cache) == 1
+        assert np.linalg.norm(c6-c0) < 1e-8
+    finally:
+        conf['enabled'] = enabled
+        conf['path'] = path
+        conf['maxitems'] = maxitems
+
+def test_plan_leg2cheb():
+    from mpi4py_fft.fftw.utilities import FFTW_ESTIMATE
+    u = np.random.random((1200, 3))
+    C = shenfun.legendre.dlt.Leg2Cheb(u, use_direct=2000)
+    c0 = C(u)
+    for flags in ((FFTW_ESTIMATE,), (shenfun.legendre.dlt.FFTW_MEASURE,)):
+        for methods in (None, ('direct',), ('fmm',), ('hale-townsend',)):
+            C1 = shenfun.legendre.dlt.plan_leg2cheb(u, axis=0, flags=flags, methods=methods)
+            assert np.linalg.norm(C1(u)-c0) < 1e-8
+    assert ((1200, 3), 0, ('direct', 'fmm', 'hale-townsend')) in shenfun.legendre.dlt.leg2cheb_wisdom
+    L = shenfun.FunctionSpace(600, 'L')
+    c = shenfun.Function(L, val=1)
+    assert np.linalg.norm(c.backward(kind='auto')-c.backward(kind='fast')) < 1e-12
+    L = shenfun.FunctionSpace(20, 'L')
+    c = shenfun.Function(L, val=1)
+    assert np.linalg.norm(c.backward(kind='auto')-c.backward(kind='recursive')) < 1e-12
+
 if __name__ == '__main__':
     from time import time
     config['optimization']['mode'] = 'cython'